@@ -0,0 +1,60 @@
+"""
+Merging of messages
+===================
+
+Benchmark of the merging of many single messages into one DataArray, like
+within SpatialDataset.data_merge for GRIB files. The messages are merged once
+with the stacking update routine and once with the preallocating assemble
+routine of the spatial accessor.
+
+Run with ``python benchmarks/data_merge.py`` from the repository root.
+"""
+import itertools
+import time
+
+import numpy as np
+import xarray as xr
+
+from pymepps.grid import GridBuilder
+
+
+def create_messages(grid, n_ens=20, n_valid=50, n_height=10):
+    runtime = np.datetime64('2016-12-19T06:00')
+    messages = []
+    for ens, valid, height in itertools.product(
+            range(n_ens), range(n_valid), range(n_height)):
+        message = xr.DataArray(
+            np.random.normal(size=tuple(grid.shape)).astype(np.float32),
+            dims=('y', 'x'))
+        message.pp.grid = grid
+        message = message.pp.normalize_coords(
+            runtime=runtime, ensemble=ens,
+            validtime=runtime+np.timedelta64(3*valid, 'h'),
+            height='level_{0:d}'.format(height))
+        message.pp.grid = grid
+        messages.append(message)
+    return messages
+
+
+def time_merge(method, messages):
+    start = time.perf_counter()
+    merged = getattr(messages[0].pp, method)(*messages[1:])
+    return time.perf_counter()-start, merged
+
+
+def main():
+    grid = GridBuilder('gridtype=lonlat\nxsize=64\nysize=32\nxfirst=0\n'
+                       'xinc=5.625\nyfirst=-87.1875\nyinc=5.625').build_grid()
+    messages = create_messages(grid)
+    print('Merging {0:d} messages on a {1} grid'.format(
+        len(messages), tuple(grid.shape)))
+    assemble_time, assembled = time_merge('assemble', messages)
+    update_time, updated = time_merge('update', messages)
+    xr.testing.assert_identical(assembled, updated)
+    print('update:   {0:8.3f} s'.format(update_time))
+    print('assemble: {0:8.3f} s, speed-up {1:6.1f}x'.format(
+        assemble_time, update_time/assemble_time))
+
+
+if __name__ == '__main__':
+    main()
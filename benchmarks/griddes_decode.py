@@ -0,0 +1,77 @@
+"""
+Decoding of grid descriptions
+=============================
+
+Benchmark of the grid description decoding for an unstructured grid with one
+million grid points. The former line by line decoding, where every value is
+converted with ``float()``, is compared to the bulk conversion of number
+blocks and to the binary .npz cache.
+
+Run with ``python benchmarks/griddes_decode.py`` from the repository root.
+"""
+import re
+import tempfile
+import time
+
+import numpy as np
+
+from pymepps.grid import GridBuilder
+
+
+def linewise_decode(grid_str):
+    lines = [re.sub('[^0-9a-zA-Z=#"\\_\\.\\-\\+ ]+', '', gs)
+             for gs in grid_str.split('\n')]
+    cleaned_lines = []
+    for line in [l.split('=', 1) for l in lines if l and '#' not in l]:
+        line[-1] = list(filter(None, line[-1].split(' ')))
+        if len(line) == 1 and cleaned_lines:
+            cleaned_lines[-1][-1].extend(line[0])
+        elif len(line) == 2:
+            cleaned_lines.append([line[0].strip(), line[1]])
+    grid_dict = {l[0]: l[1] for l in cleaned_lines}
+    for k in grid_dict:
+        try:
+            grid_dict[k] = [float(val) for val in grid_dict[k]]
+        except ValueError:
+            pass
+        if len(grid_dict[k]) == 1:
+            grid_dict[k] = grid_dict[k][0]
+    return grid_dict
+
+
+def unstructured_griddes(size):
+    rnd = np.random.RandomState(42)
+    lines = ['gridtype = unstructured', 'gridsize = {0:d}'.format(size)]
+    for name, bound in (('xvals', 180), ('yvals', 90)):
+        values = rnd.uniform(-bound, bound, size)
+        value_lines = ['  '.join('{0:.6f}'.format(val) for val in
+                                 values[k:k+10])
+                       for k in range(0, size, 10)]
+        lines.append('{0:s} = {1:s}'.format(name, value_lines[0]))
+        lines.extend(value_lines[1:])
+    return '\n'.join(lines)
+
+
+def time_func(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter()-start
+
+
+def main():
+    grid_str = unstructured_griddes(1000000)
+    linewise = time_func(lambda: linewise_decode(grid_str))
+    print('line by line : {0:8.3f} s'.format(linewise))
+    bulk = time_func(lambda: GridBuilder.decode_str(grid_str))
+    print('bulk         : {0:8.3f} s, speed-up {1:6.1f}x'.format(
+        bulk, linewise/bulk))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = time_func(lambda: GridBuilder(grid_str, cache_dir=cache_dir))
+        warm = time_func(lambda: GridBuilder(grid_str, cache_dir=cache_dir))
+    print('cache (cold) : {0:8.3f} s'.format(cold))
+    print('cache (warm) : {0:8.3f} s, speed-up {1:6.1f}x'.format(
+        warm, linewise/warm))
+
+
+if __name__ == '__main__':
+    main()
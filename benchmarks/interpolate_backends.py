@@ -0,0 +1,55 @@
+"""
+Interpolation backends
+======================
+
+Benchmark of the interpolation backends of `Grid.interpolate` for data with
+many leading dimensions, like an ensemble with several lead times. The
+remapping weights are calculated before the timing, such that only the
+application of the weights is measured.
+
+Run with ``python benchmarks/interpolate_backends.py`` from the repository
+root.
+"""
+import os
+import time
+
+import numpy as np
+
+from pymepps.grid import GridBuilder
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    'data', 'grids')
+
+
+def time_backend(src_grid, trg_grid, data, order, backend, out=None):
+    start = time.perf_counter()
+    src_grid.interpolate(data, trg_grid, order=order, backend=backend, out=out)
+    return time.perf_counter()-start
+
+
+def main():
+    src_grid = GridBuilder(os.path.join(BASE_PATH, 'lon_lat')).build_grid()
+    trg_grid = GridBuilder(os.path.join(BASE_PATH, 'gaussian_y')).build_grid()
+    src_shape = tuple(src_grid.shape)
+    trg_shape = tuple(trg_grid.shape)
+    print('Source grid: {0}, target grid: {1}'.format(src_shape, trg_shape))
+    for lead_shape in ((10, ), (20, 12), (5, 12, 4)):
+        data = np.random.normal(size=lead_shape+src_shape).astype(np.float32)
+        out = np.empty(lead_shape+trg_shape)
+        for order in (0, 1):
+            src_grid.remap_weights(trg_grid, order=order)
+            timings = [
+                time_backend(src_grid, trg_grid, data, order, 'slicewise'),
+                time_backend(src_grid, trg_grid, data, order, 'sparse'),
+                time_backend(src_grid, trg_grid, data, order, 'numpy',
+                             out=out),
+            ]
+            print('leading dims {0!s:>12}, order {1:d}: slicewise {2:8.3f} s, '
+                  'sparse {3:8.3f} s, numpy {4:8.3f} s'.format(
+                      lead_shape, order, *timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Nearest grid points for many stations
+=====================================
+
+Benchmark of the nearest neighbour search for a station network. The brute
+force haversine search over all grid points is compared to the cached KD-tree
+of the grid. The brute force timing is extrapolated from at most 100
+stations.
+
+Run with ``python benchmarks/nearest_points.py`` from the repository root.
+"""
+import os
+import time
+
+import numpy as np
+
+from pymepps.grid import GridBuilder
+from pymepps.grid.grid import distance_haversine
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    'data', 'grids')
+
+
+def brute_force(grid, coords):
+    src_lat, src_lon = grid._calc_lat_lon()
+    src_lat = src_lat.flatten()
+    src_lon = src_lon.flatten()
+    return [distance_haversine(coord, (src_lat, src_lon)).argmin()
+            for coord in coords]
+
+
+def main():
+    grid = GridBuilder(os.path.join(BASE_PATH, 'lon_lat')).build_grid()
+    print('Grid: {0}'.format(tuple(grid.shape)))
+    for n_stations in (10, 100, 2000):
+        coords = np.stack((np.random.uniform(-90, 90, n_stations),
+                           np.random.uniform(0, 360, n_stations)), axis=-1)
+        start = time.perf_counter()
+        brute_force(grid, coords[:100])
+        brute = (time.perf_counter()-start)*n_stations/min(n_stations, 100)
+        grid._kdtree = None
+        start = time.perf_counter()
+        grid.nearest_points(coords)
+        cold = time.perf_counter()-start
+        start = time.perf_counter()
+        grid.nearest_points(coords)
+        warm = time.perf_counter()-start
+        print('{0:5d} stations: haversine {1:8.3f} s, KD-tree cold {2:8.3f} s, '
+              'warm {3:8.4f} s'.format(n_stations, brute, cold, warm))
+
+
+if __name__ == '__main__':
+    main()
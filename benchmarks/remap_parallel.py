@@ -0,0 +1,54 @@
+"""
+Parallel remapping
+==================
+
+Benchmark of the thread-parallel remapping over the leading dimensions. An
+ensemble of fields is remapped from the gaussian grid to the regular 0.25
+degree grid with 1 up to 16 threads, while the remapping weights are cached
+beforehand.
+
+Run with ``python benchmarks/remap_parallel.py`` from the repository root.
+"""
+import os
+import time
+
+import numpy as np
+
+from pymepps.grid import GridBuilder
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    'data', 'grids')
+
+
+def time_remap(src_grid, trg_grid, data, out, order, processes, repeats=3):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        src_grid.interpolate(data, trg_grid, order=order, out=out,
+                             processes=processes)
+    return (time.perf_counter()-start)/repeats
+
+
+def main():
+    src_grid = GridBuilder(os.path.join(BASE_PATH, 'gaussian_y')).build_grid()
+    trg_grid = GridBuilder(os.path.join(BASE_PATH, 'lon_lat')).build_grid()
+    data = np.random.normal(
+        size=(32, )+tuple(src_grid.shape)).astype(np.float32)
+    out = np.empty((32, )+tuple(trg_grid.shape), dtype=np.float32)
+    print('Ensemble of {0:d} fields, source grid: {1}, target grid: {2}, '
+          'cpus: {3:d}'.format(len(data), tuple(src_grid.shape),
+                               tuple(trg_grid.shape), os.cpu_count()))
+    for order in (0, 1):
+        src_grid.remap_weights(trg_grid, order=order)
+        serial = time_remap(src_grid, trg_grid, data, out, order, 1)
+        for processes in (1, 2, 4, 8, 16):
+            elapsed = time_remap(src_grid, trg_grid, data, out, order,
+                                 processes)
+            print('order {0:d}, {1:2d} threads: {2:8.3f} s, '
+                  'speed-up {3:5.2f}x'.format(order, processes, elapsed,
+                                              serial/elapsed))
+
+
+if __name__ == '__main__':
+    main()
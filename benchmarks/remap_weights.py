@@ -0,0 +1,53 @@
+"""
+Remapping with cached weights
+=============================
+
+Benchmark of cold against warm remapping. The first remapping from a source to
+a target grid calculates the remapping weights, while all following remappings
+reuse the cached weights.
+
+Run with ``python benchmarks/remap_weights.py`` from the repository root.
+"""
+import os
+import time
+
+import numpy as np
+
+from pymepps.grid import GridBuilder
+from pymepps.grid.remap import remap_cache
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    'data', 'grids')
+
+
+def time_remap(src_grid, trg_grid, data, order, repeats=5):
+    remap_cache.clear()
+    start = time.perf_counter()
+    src_grid.interpolate(data, trg_grid, order=order)
+    cold = time.perf_counter()-start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        src_grid.interpolate(data, trg_grid, order=order)
+    warm = (time.perf_counter()-start)/repeats
+    return cold, warm
+
+
+def main():
+    src_grid = GridBuilder(os.path.join(BASE_PATH, 'lon_lat')).build_grid()
+    trg_grid = GridBuilder(os.path.join(BASE_PATH, 'gaussian_y')).build_grid()
+    src_shape = tuple(src_grid.shape)
+    print('Source grid: {0}, target grid: {1}'.format(
+        src_shape, tuple(trg_grid.shape)))
+    for lead_shape in ((1, ), (10, ), (4, 10)):
+        data = np.random.normal(size=lead_shape+src_shape).astype(np.float32)
+        for order in (0, 1):
+            cold, warm = time_remap(src_grid, trg_grid, data, order)
+            print('leading dims {0!s:>8}, order {1:d}: cold {2:8.3f} s, '
+                  'warm {3:8.3f} s, speed-up {4:6.1f}x'.format(
+                      lead_shape, order, cold, warm, cold/warm))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Rotated pole transformation
+===========================
+
+Benchmark of the matrix-based rotated pole transformation for a 1000x1000
+rotated grid. The elementwise formulation, where every component of the
+rotation is evaluated with its own trigonometric expression, is compared to
+the precomputed rotation matrix in double and single precision and with a
+preallocated output buffer.
+
+Run with ``python benchmarks/rotpole_transform.py`` from the repository root.
+"""
+import time
+
+import numpy as np
+
+from pymepps.grid.projection import RotPoleProj
+
+
+def elementwise_to_lonlat(x, y, npole_lat, npole_lon):
+    lat = np.deg2rad(y)
+    lon = np.deg2rad(x)
+    cart_x = np.cos(lon)*np.cos(lat)
+    cart_y = np.sin(lon)*np.cos(lat)
+    cart_z = np.sin(lat)
+    theta = -(np.pi/2-np.deg2rad(npole_lat))
+    phi = -(np.pi+np.deg2rad(npole_lon))
+    x_new = np.cos(theta)*np.cos(phi)*cart_x + np.sin(phi)*cart_y \
+        + np.sin(theta)*np.cos(phi)*cart_z
+    y_new = -np.cos(theta)*np.sin(phi)*cart_x + np.cos(phi)*cart_y \
+        - np.sin(theta)*np.sin(phi)*cart_z
+    z_new = -np.sin(theta)*cart_x + np.cos(theta)*cart_z
+    return np.rad2deg(np.arctan2(y_new, x_new)), np.rad2deg(np.arcsin(z_new))
+
+
+def time_func(func, repeats=3):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    return (time.perf_counter()-start)/repeats, result
+
+
+def main():
+    npole_lat, npole_lon = 40., -170.
+    rot_lon, rot_lat = np.meshgrid(np.linspace(-25, 25, 1000),
+                                   np.linspace(-25, 25, 1000))
+    proj = RotPoleProj(npole_lat, npole_lon)
+    proj_32 = RotPoleProj(npole_lat, npole_lon, dtype=np.float32)
+    out = np.empty((2, )+rot_lon.shape)
+    out_32 = np.empty((2, )+rot_lon.shape, dtype=np.float32)
+    elementwise, reference = time_func(
+        lambda: elementwise_to_lonlat(rot_lon, rot_lat, npole_lat, npole_lon))
+    print('elementwise        : {0:8.3f} s'.format(elementwise))
+    cases = (
+        ('matrix float64', lambda: proj(rot_lon, rot_lat, inverse=True)),
+        ('matrix float64 out',
+         lambda: proj(rot_lon, rot_lat, inverse=True, out=out)),
+        ('matrix float32', lambda: proj_32(rot_lon, rot_lat, inverse=True)),
+        ('matrix float32 out',
+         lambda: proj_32(rot_lon, rot_lat, inverse=True, out=out_32)),
+    )
+    for name, func in cases:
+        duration, result = time_func(func)
+        error = np.max(np.abs(np.array(result)-np.array(reference)))
+        print('{0:19s}: {1:8.3f} s, speed-up {2:5.2f}x, max. error '
+              '{3:.2e} deg'.format(name, duration, elementwise/duration,
+                                   error))
+
+
+if __name__ == '__main__':
+    main()
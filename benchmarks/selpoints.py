@@ -0,0 +1,52 @@
+"""
+Station extraction
+==================
+
+Benchmark of the extraction of a station network from gridded data. A loop
+over `selpoint` is compared to a single call of `selpoints`. The loop timing is
+extrapolated from at most 50 stations.
+
+Run with ``python benchmarks/selpoints.py`` from the repository root.
+"""
+import os
+import time
+
+import numpy as np
+import xarray as xr
+
+import pymepps.accessor
+from pymepps.grid import GridBuilder
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    'data', 'grids')
+
+
+def main():
+    grid = GridBuilder(os.path.join(BASE_PATH, 'lon_lat')).build_grid()
+    data = xr.DataArray(
+        np.random.normal(size=[4, ]+list(grid.shape)).astype(np.float32),
+        dims=['validtime', ]+list(grid.get_coord_names()))
+    data = data.pp.set_grid(grid)
+    print('Data: {0}'.format(data.shape))
+    for n_stations in (10, 100, 1500):
+        lonlats = np.stack((np.random.uniform(0, 360, n_stations),
+                            np.random.uniform(-90, 90, n_stations)), axis=-1)
+        n_loop = min(n_stations, 50)
+        start = time.perf_counter()
+        for lonlat in lonlats[:n_loop]:
+            data.pp.selpoint(lonlat)
+        loop = (time.perf_counter()-start)*n_stations/n_loop
+        timings = []
+        for method in ('nearest', 'bilinear'):
+            start = time.perf_counter()
+            data.pp.selpoints(lonlats, method=method)
+            timings.append(time.perf_counter()-start)
+        print('{0:5d} stations: selpoint loop {1:8.3f} s, selpoints nearest '
+              '{2:8.3f} s, bilinear {3:8.3f} s'.format(n_stations, loop,
+                                                        *timings))
+
+
+if __name__ == '__main__':
+    main()
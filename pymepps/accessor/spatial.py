@@ -31,11 +31,14 @@
 # External modules
 import xarray as xr
 import numpy as np
+import pandas as pd
 
 # Internal modules
 import pymepps
 from .base import MetData
 from pymepps.grid.builder import GridBuilder
+from pymepps.grid.serialize import grid_to_dataset, dataset_to_grid
+from .vertical import VerticalWeights
 from pymepps.loader.datasets.tsdataset import TSDataset
 from pymepps.loader.filehandler.netcdfhandler import cube_to_series
 
@@ -297,7 +300,7 @@ def _transform_datetime(data):
         transformed_data : xr.DataArray
             The DataArray with the transformed time coordinates.
         """
-        transformed_data = data.copy()
+        transformed_data = data.copy(deep=False)
         dims_to_transform = [
             dim for dim in data.dims
             if isinstance(data[dim].values[0],
@@ -382,7 +385,7 @@ def _validtime_to_timedelta(data, validtime='validtime', runtime='runtime'):
         transformed_array : xr.DataArray
             The DataArray with the transformed validtime coordinate.
         """
-        transformed_array = data.copy()
+        transformed_array = data.copy(deep=False)
         runtime_values = data[runtime].values
         validtime_values = data[validtime].values
         if np.issubdtype(runtime_values.dtype, np.datetime64) and \
@@ -458,6 +461,96 @@ def update(self, *items):
         updated_array.pp.grid = self.grid
         return updated_array
 
+    @staticmethod
+    def _get_slot(positions):
+        """
+        Convert the given coordinate positions into a slice, if they are
+        consecutive, such that the block is written with basic indexing.
+        """
+        if len(positions) and np.all(np.diff(positions) == 1):
+            return slice(positions[0], positions[-1]+1)
+        return positions
+
+    def assemble(self, *items):
+        """
+        Assemble this DataArray and the given DataArrays into a single
+        DataArray. This is an alternative to `update` with the same
+        assumptions, but without stacking and unstacking of the data. The
+        union of the non-grid coordinates is determined beforehand and the
+        output array is allocated once. Every DataArray is then written into
+        its slot of the output array. Intersections are resolved in favor of
+        the newest data. Missing combinations are filled with NaN.
+
+        Parameters
+        ----------
+        items : xarray.DataArray
+            The items are assembled with this xarray.DataArray instance. The
+            grid dimensions have to be the same as the grid and the items need
+            the same dimensions as this DataArray. The values of all items are
+            loaded into memory.
+
+        Returns
+        -------
+        assembled_array : xarray.DataArray
+            The DataArray instance with the assembled data.
+
+        Raises
+        ------
+        ValueError
+            A ValueError is raised if the dimensions of the items differ or
+            if a coordinate of an item has duplicated or missing values.
+        TypeError
+            A TypeError is raised if the coordinate values of a dimension
+            cannot be sorted.
+        """
+        assemble_data = [self.check_data_coordinates(self.data), ]
+        assemble_data += [self.check_data_coordinates(item) for item in items]
+        dims = self.data.dims
+        if any(set(item.dims) != set(dims) for item in assemble_data):
+            raise ValueError('All items need the same dimensions to be '
+                             'assembled!')
+        assemble_data = [item if item.dims == dims else item.transpose(*dims)
+                         for item in assemble_data]
+        grid_dims = self.grid.get_coord_names()
+        stack_dims = [dim for dim in dims if dim not in grid_dims]
+        union_coords = OrderedDict()
+        item_slots = [[] for _ in assemble_data]
+        for dim in stack_dims:
+            dim_indexes = [item.indexes[dim] for item in assemble_data]
+            if not all(index.is_unique for index in dim_indexes):
+                raise ValueError('The coordinates of the items need to be '
+                                 'unique to be assembled!')
+            dim_values = pd.Index(np.concatenate(
+                [index.values for index in dim_indexes]))
+            if dim_values.hasnans:
+                raise ValueError('Missing values within the coordinates '
+                                 'cannot be assembled!')
+            union_coords[dim] = dim_values.unique().sort_values()
+            positions = union_coords[dim].get_indexer(dim_values)
+            bounds = np.cumsum([0]+[len(index) for index in dim_indexes])
+            for slots, start, end in zip(item_slots, bounds[:-1], bounds[1:]):
+                slots.append(self._get_slot(positions[start:end]))
+        dtype = np.result_type(*[item.dtype for item in assemble_data])
+        if not np.issubdtype(dtype, np.inexact):
+            dtype = np.float64
+        out_shape = tuple(len(union_coords[dim]) for dim in stack_dims) + \
+            self.data.shape[len(stack_dims):]
+        assembled_values = np.full(out_shape, np.nan, dtype=dtype)
+        for item, slots in zip(assemble_data, item_slots):
+            if not all(isinstance(slot, slice) for slot in slots):
+                slots = np.ix_(*[np.arange(len(union_coords[dim]))[slot]
+                                 for dim, slot in zip(stack_dims, slots)])
+            assembled_values[tuple(slots)+(Ellipsis, )] = item.values
+        assembled_coords = OrderedDict(union_coords)
+        assembled_coords.update(
+            (name, coord) for name, coord in self.data.coords.items()
+            if name not in union_coords and set(coord.dims) <= set(grid_dims))
+        assembled_array = xr.DataArray(
+            assembled_values, coords=assembled_coords, dims=dims,
+            name=self.data.name, attrs=self.data.attrs)
+        assembled_array.pp.grid = self.grid
+        return assembled_array
+
     def merge_analysis_timedelta(self, analysis_axis='runtime',
                                  timedelta_axis='validtime'):
         """
@@ -500,10 +593,12 @@ def to_pandas(self, lonlat=None):
 
         Parameters
         ----------
-        lonlat : tuple(float, float) or None
+        lonlat : tuple(float, float), list(tuple(float, float)) or None
             The nearest grid point to this coordinates (longitude, latitude) is
-            used to generate the pandas data. If lonlat is None no
-            coordinates will be selected and the data is flatten. If the
+            used to generate the pandas data. If a list of coordinates is given,
+            the points are selected with `selpoints` and the station is a
+            further column level of the returned DataFrame. If lonlat is None
+            no coordinates will be selected and the data is flatten. If the
             horizontal grid coordinates are not a single point it is recommended
             to set lonlat.
 
@@ -514,7 +609,10 @@ def to_pandas(self, lonlat=None):
             Series (1 Column) or Dataframe (multiple column) depending on the
             dimensions.
         """
-        if isinstance(lonlat, (list, tuple)) and len(lonlat) == 2:
+        if lonlat is not None and np.ndim(lonlat) == 2:
+            cube = self.selpoints(lonlat)
+            cube = cube.drop(['lon', 'lat'])
+        elif isinstance(lonlat, (list, tuple)) and len(lonlat) == 2:
             extracted_data = self.grid.get_nearest_point(data=self.data,
                                                          coord=reversed(lonlat))
             dims_wo_grid = [dim for dim in self.data.dims
@@ -532,7 +630,7 @@ def to_pandas(self, lonlat=None):
         extracted_data = ts_ds.data_merge(series_data, self.data.name)
         return extracted_data
 
-    def remapnn(self, new_grid):
+    def remapnn(self, new_grid, processes=1):
         """
         Remap the horizontal grid with a nearest neighbour approach to a given
         new grid.
@@ -541,17 +639,21 @@ def remapnn(self, new_grid):
         ----------
         new_grid : Child instance of Grid
             The data is remapped to this grid.
+        processes : int, optional
+            The number of threads, which are used to remap the leading
+            dimensions in parallel. Default is 1.
 
         Returns
         -------
         remapped_array : xarray.DataArray
             The xarray.DataArray with the replaced grid.
         """
-        remapped_array = self.grid.interpolate(self.data, new_grid, order=0)
+        remapped_array = self.grid.interpolate(self.data, new_grid, order=0,
+                                               processes=processes)
         remapped_array.pp.grid = new_grid
         return remapped_array
 
-    def remapbil(self, new_grid):
+    def remapbil(self, new_grid, processes=1):
         """
         Remap the horizontal grid with a bilinear approach to a given
         new grid.
@@ -560,13 +662,17 @@ def remapbil(self, new_grid):
         ----------
         new_grid : Child instance of Grid
             The data is remapped to this grid.
+        processes : int, optional
+            The number of threads, which are used to remap the leading
+            dimensions in parallel. Default is 1.
 
         Returns
         -------
         remapped_array : xarray.DataArray
             The xarray.DataArray with the replaced grid.
         """
-        remapped_array = self.grid.interpolate(self.data, new_grid, order=1)
+        remapped_array = self.grid.interpolate(self.data, new_grid, order=1,
+                                               processes=processes)
         remapped_array.pp.grid = new_grid
         return remapped_array
 
@@ -598,8 +704,8 @@ def selpoint(self, lonlat):
             'yunits': 'degrees',
             'xsize': 1,
             'ysize': 1,
-            'xvals': [lonlat[0], ],
-            'yvals': [lonlat[1], ]
+            'xvals': np.array([lonlat[0], ]),
+            'yvals': np.array([lonlat[1], ])
         }
         sliced_grid = GridBuilder(grid_dict).build_grid()
         grid_coords = sliced_grid.get_coord_names()
@@ -609,6 +715,194 @@ def selpoint(self, lonlat):
         sliced_array = sliced_array.pp.set_grid(sliced_grid)
         return sliced_array
 
+    def selpoints(self, lonlats, method='nearest', names=None):
+        """
+        Select many longitude, latitude points within this DataArray at once.
+        The grid points for all stations are resolved in a single pass, such
+        that there is no loop over the stations.
+
+        Parameters
+        ----------
+        lonlats : iterable(tuple(float, float))
+            The longitude and latitude points as degree with shape
+            (number of stations, 2).
+        method : str, optional
+            The method which is used to select the points. Default is nearest.
+            nearest: The nearest neighbour grid point is selected, which is
+                searched with the KD-tree of the grid.
+            bilinear: The data is interpolated bilinear to the points. The
+                remapping weights are cached for the station network.
+        names : iterable or None, optional
+            The names of the stations, which are used as values of the station
+            coordinate. If this is None, the stations are numbered. Default is
+            None.
+
+        Returns
+        -------
+        sliced_array : xarray.DataArray
+            The data for the given points. The grid dimensions are replaced by
+            a station dimension with the longitude and latitude of the stations
+            as coordinates.
+        """
+        lonlats = np.atleast_2d(np.asarray(lonlats, dtype=float))
+        if lonlats.ndim != 2 or lonlats.shape[-1] != 2:
+            raise ValueError('The longitude and latitude points need the shape '
+                             '(number of stations, 2)!')
+        if names is None:
+            names = np.arange(lonlats.shape[0])
+        elif len(names) != lonlats.shape[0]:
+            raise ValueError('The number of station names is not the same as '
+                             'the number of points!')
+        if method == 'nearest':
+            nearest_ind, _ = self.grid.nearest_points(lonlats[:, ::-1])
+            grid_dims = self.data.dims[-self.grid.len_coords:]
+            indexers = {dim: xr.DataArray(ind, dims=['station', ])
+                        for dim, ind in zip(grid_dims, nearest_ind)}
+            sliced_array = self.data.isel(**indexers)
+            drop_names = set(grid_dims) | set(self.grid.get_coord_names())
+            drop_names = [name for name in drop_names
+                          if name in sliced_array.coords]
+            # drop_vars is not available for xarray versions before 0.14
+            drop_vars = getattr(sliced_array, 'drop_vars', sliced_array.drop)
+            sliced_array = drop_vars(drop_names)
+        elif method == 'bilinear':
+            grid_dict = {
+                'gridtype': 'unstructured',
+                'gridsize': lonlats.shape[0],
+                'xvals': lonlats[:, 0],
+                'yvals': lonlats[:, 1],
+            }
+            station_grid = GridBuilder(grid_dict).build_grid()
+            sliced_array = self.grid.interpolate(self.data, station_grid,
+                                                 order=1)
+            sliced_array = sliced_array.rename({'ncells': 'station'})
+        else:
+            raise ValueError('The given method {0} is not available, choose '
+                             'nearest or bilinear!'.format(method))
+        sliced_array = sliced_array.assign_coords(
+            station=np.asarray(names),
+            lon=(('station', ), lonlats[:, 0]),
+            lat=(('station', ), lonlats[:, 1]),
+        )
+        sliced_array.name = self.data.name
+        return sliced_array
+
+    def _vertical_order(self, dim='height'):
+        if dim not in self.data.dims:
+            raise ValueError('The DataArray has no {0:s} dimension, please '
+                             'normalize the coordinates first!'.format(dim))
+        return [d for d in self.data.dims if d != dim] + [dim, ]
+
+    def vertical_weights(self, levels, src_levels=None, method='linear'):
+        """
+        Precompute the bracket indices and weights for a vertical
+        interpolation of this DataArray along the height dimension. The
+        weights can be reused for every DataArray on the same source levels.
+
+        Parameters
+        ----------
+        levels : array_like
+            The target levels.
+        src_levels : xarray.DataArray, array_like or None, optional
+            The source levels. If this is None, the values of the height
+            coordinate are used. If this is a xarray.DataArray with a height
+            dimension, e.g. the pressure of every grid point, the levels are
+            used per column. Missing dimensions are broadcasted. Default is
+            None.
+        method : str, optional
+            The interpolation method, either linear or log. Log interpolates
+            linear in the logarithm of the levels, which should be used for
+            pressure levels. Default is linear.
+
+        Returns
+        -------
+        weights : VerticalWeights
+            The precomputed weights.
+        """
+        order = self._vertical_order()
+        if src_levels is None:
+            src_levels = self.data['height'].values
+        elif isinstance(src_levels, xr.DataArray):
+            missing_dims = [d for d in order if d not in src_levels.dims]
+            if missing_dims:
+                src_levels = src_levels.expand_dims(missing_dims)
+            src_levels = src_levels.transpose(*order).values
+        return VerticalWeights(src_levels, levels, method=method)
+
+    def interp_vertical(self, levels=None, src_levels=None, method='linear',
+                        weights=None):
+        """
+        Interpolate this DataArray vertically to given levels. The
+        interpolation is vectorised over all columns, runtimes, ensemble
+        members and validtimes.
+
+        Parameters
+        ----------
+        levels : array_like or None, optional
+            The target levels. This is only used if no weights are given.
+            Default is None.
+        src_levels : xarray.DataArray, array_like or None, optional
+            The source levels. See also `vertical_weights`. This is only used
+            if no weights are given. Default is None.
+        method : str, optional
+            The interpolation method, either linear or log. This is only used
+            if no weights are given. Default is linear.
+        weights : VerticalWeights or None, optional
+            Precomputed weights, e.g. from `vertical_weights` of another
+            DataArray on the same levels. If this is None, the weights are
+            calculated. Default is None.
+
+        Returns
+        -------
+        interpolated_array : xarray.DataArray
+            The interpolated DataArray with the target levels as height
+            coordinate. Target levels outside of the source levels are NaN.
+        """
+        if weights is None:
+            if levels is None:
+                raise ValueError('Either levels or weights have to be given!')
+            weights = self.vertical_weights(levels, src_levels, method)
+        order = self._vertical_order()
+        vertical_array = self.data.transpose(*order)
+        coords = {name: coord for name, coord in vertical_array.coords.items()
+                  if 'height' not in coord.dims}
+        coords['height'] = weights.trg_levels
+        interpolated_array = xr.DataArray(
+            weights.apply(vertical_array.values), coords=coords, dims=order,
+            name=self.data.name, attrs=self.data.attrs)
+        interpolated_array = interpolated_array.transpose(*self.data.dims)
+        interpolated_array.pp.grid = self._grid
+        return interpolated_array
+
+    def coarsen(self, factor=None, target_grid=None, how='mean'):
+        """
+        Coarse grain this DataArray. Regular grids are coarsened by integer
+        factors, where blocks of grid points are aggregated. Other grids are
+        coarsened to a given target grid, where all grid points within a
+        target cell are aggregated.
+
+        Parameters
+        ----------
+        factor : int or tuple(int, int) or None, optional
+            The coarsening factor for the (y, x) dimensions of a regular grid.
+            Incomplete blocks at the end of the grid are trimmed. This is only
+            used if no target grid is given. Default is None.
+        target_grid : Grid instance or None, optional
+            The coarse target grid. Default is None.
+        how : str, optional
+            The aggregation function, either mean, sum, max or min. NaN values
+            are ignored. Default is mean.
+
+        Returns
+        -------
+        coarse_array : xarray.DataArray
+            The coarsened data array with the coarse grid.
+        """
+        coarse_array, coarse_grid = self.grid.coarsen(
+            self.data, factor=factor, other_grid=target_grid, how=how)
+        coarse_array.pp.grid = coarse_grid
+        return coarse_array
+
     def sellonlatbox(self, lonlatbox):
         """
         This DataArray instance is sliced by given lonlatbox. A new grid is
@@ -643,22 +937,28 @@ def grid_to_attrs(self):
         grid_array.attrs.update(grid_attr)
         return grid_array
 
-    def save(self, save_path):
+    def save(self, save_path, compress=True):
         """
-        Save the DataArray and the grid as attributes together. The grid
-        attributes are used by the load method to recreate the grid, but it is
-        also possible to load the data with the normal xarray load functions.
+        Save the DataArray and the grid together. Scalar grid entries are
+        saved as attributes of the DataArray, while coordinate values of the
+        grid, e.g. of curvilinear or unstructured grids, are saved as own
+        variables. The grid is used by the load method to recreate the grid,
+        but it is also possible to load the data with the normal xarray load
+        functions.
 
         Parameters
         ----------
         save_path : str
             The path where the netcdf file should be saved.
+        compress : bool, optional
+            If the coordinate values of the grid should be compressed with
+            zlib. Default is True.
         """
         try:
-            save_array = self.grid_to_attrs()
+            save_ds = grid_to_dataset(self.data, self.grid, compress=compress)
         except TypeError:
-            save_array = self.data.copy()
-        save_array.to_netcdf(save_path)
+            save_ds = self.data.copy()
+        save_ds.to_netcdf(save_path)
 
     @staticmethod
     def load(load_path):
@@ -677,15 +977,8 @@ def load(load_path):
             The loaded DataArray instance. If a grid could be created it will be
             set to the DataArray instance.
         """
-        loaded_array = xr.open_dataarray(load_path)
-        grid_attrs = [attr for attr in loaded_array.attrs
-                      if attr[:7] == 'ppgrid_']
-        grid_dict = {attr[7:]: loaded_array.attrs[attr] for attr in grid_attrs}
-        try:
-            loaded_grid = GridBuilder(grid_dict).build_grid()
+        loaded_ds = xr.open_dataset(load_path)
+        loaded_array, loaded_grid = dataset_to_grid(loaded_ds)
+        if loaded_grid is not None:
             loaded_array.pp.grid = loaded_grid
-            for key in grid_attrs:
-                loaded_array.attrs.pop(key, None)
-        except (KeyError, ValueError):
-            pass
         return loaded_array
@@ -0,0 +1,137 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+# """
+# Created on 17.10.26
+#
+# Created for pymepps
+#
+# @author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#     Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# """
+
+# System modules
+import logging
+
+# External modules
+import numpy as np
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+
+class VerticalWeights(object):
+    """
+    Precomputed bracket indices and weights for a vertical interpolation from
+    source levels to target levels. The weights are calculated for all
+    columns at once and can be reused for every variable on the same source
+    levels.
+
+    Parameters
+    ----------
+    src_levels : array_like
+        The source levels. The last axis is the vertical axis. If the array is
+        one-dimensional, the same levels are used for all columns. Otherwise
+        the levels are given per column and their leading axes have to be
+        broadcastable to the leading axes of the interpolated data. The levels
+        have to be monotonic along the vertical axis, but could be increasing
+        or decreasing.
+    trg_levels : array_like
+        The target levels, which are the same for all columns.
+    method : str, optional
+        The interpolation method. Linear interpolates linear in the levels,
+        while log interpolates linear in the logarithm of the levels, which
+        is the right choice for pressure levels. Default is linear.
+
+    Attributes
+    ----------
+    lower : numpy.ndarray
+        The index of the lower bracket level for every column and target
+        level.
+    weights : numpy.ndarray
+        The weight of the upper bracket level for every column and target
+        level. Target levels outside of the source levels have NaN as
+        weight.
+    """
+    def __init__(self, src_levels, trg_levels, method='linear'):
+        self.method = method
+        self.trg_levels = np.atleast_1d(np.asarray(trg_levels, dtype=float))
+        src_levels = np.asarray(src_levels, dtype=float)
+        if src_levels.ndim == 0 or src_levels.shape[-1] < 2:
+            raise ValueError('The vertical interpolation needs at least two '
+                             'source levels!')
+        self.len_src = src_levels.shape[-1]
+        self.lower, self.weights = self._calc_brackets(src_levels)
+
+    def _transform(self, levels):
+        if self.method == 'linear':
+            return levels
+        elif self.method == 'log':
+            if np.any(levels <= 0):
+                raise ValueError('The log interpolation needs positive '
+                                 'levels!')
+            return np.log(levels)
+        else:
+            raise ValueError('The given method {0} is not available, choose '
+                             'linear or log!'.format(self.method))
+
+    def _calc_brackets(self, src_levels):
+        src = self._transform(src_levels)
+        trg = self._transform(self.trg_levels)
+        direction = np.sign(src[..., -1:]-src[..., :1])
+        lower = np.empty(src.shape[:-1]+trg.shape, dtype=np.intp)
+        for k, level in enumerate(trg):
+            below = np.sum((src-level)*direction <= 0, axis=-1)
+            lower[..., k] = np.clip(below-1, 0, self.len_src-2)
+        src_lower = np.take_along_axis(src, lower, axis=-1)
+        src_upper = np.take_along_axis(src, lower+1, axis=-1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = (trg-src_lower) / (src_upper-src_lower)
+            weights[~((weights >= 0) & (weights <= 1))] = np.nan
+        return lower, weights
+
+    def apply(self, data):
+        """
+        Interpolate the given data to the target levels.
+
+        Parameters
+        ----------
+        data : array_like
+            The data which should be interpolated. The last axis is the
+            vertical axis and needs the same length as the source levels.
+
+        Returns
+        -------
+        interpolated : numpy.ndarray
+            The interpolated data, where the last axis has the length of the
+            target levels. Target levels outside of the source levels are
+            set to NaN.
+        """
+        data = np.asarray(data)
+        if data.shape[-1] != self.len_src:
+            raise ValueError('The last axis of the data needs the length of '
+                             'the source levels ({0:d})!'.format(self.len_src))
+        if self.lower.ndim == 1:
+            data_lower = data[..., self.lower]
+            data_upper = data[..., self.lower+1]
+        else:
+            lower = np.broadcast_to(
+                self.lower, data.shape[:-1]+self.lower.shape[-1:])
+            data_lower = np.take_along_axis(data, lower, axis=-1)
+            data_upper = np.take_along_axis(data, lower+1, axis=-1)
+        return data_lower + self.weights*(data_upper-data_lower)
@@ -26,8 +26,14 @@
 # System modules
 import logging
 import re
+import os
+import hashlib
+import tempfile
+import threading
+import weakref
 
 # External modules
+import numpy as np
 
 # Internal modules
 from .lonlat import LonLatGrid
@@ -49,8 +55,63 @@
 }
 
 
+# Process-wide registry of interned grids, keyed by the grid fingerprint
+_grid_registry = weakref.WeakValueDictionary()
+_registry_lock = threading.Lock()
+
+# Characters which are allowed within a grid description
+_unallowed_chars = re.compile('[^0-9a-zA-Z=#"\\_\\.\\-\\+ ]+')
+# Characters which can be found within a block of numbers
+_non_numeric_chars = re.compile('[^0-9eE\\.\\-\\+ ]')
+
+
+def _count_tokens(text):
+    """
+    Count the number of space separated tokens within given ascii text.
+    """
+    is_space = np.frombuffer(text.encode('ascii'), dtype=np.uint8) == 32
+    if not is_space.size:
+        return 0
+    return int(np.count_nonzero(is_space[:-1] & ~is_space[1:]) +
+               (not is_space[0]))
+
+
+def _decode_value(value_parts):
+    """
+    Decode the value of a grid description entry. Pure number blocks are
+    converted in bulk into a numpy array, while all other values are
+    converted into floats or strings value by value. Several numbers are
+    always returned as numpy array.
+    """
+    value_str = ' '.join(value_parts)
+    if not _non_numeric_chars.search(value_str):
+        values = np.fromstring(value_str, sep=' ')
+        if values.size == _count_tokens(value_str):
+            if values.size == 1:
+                return float(values[0])
+            elif values.size > 1:
+                return values
+    first_part = _unallowed_chars.sub('', value_parts[0])
+    if '"' in first_part:
+        values = [first_part.replace('"', '').strip(), ]
+    else:
+        values = first_part.split()
+    values.extend(_unallowed_chars.sub('', ' '.join(value_parts[1:])).split())
+    try:
+        values = [float(val) if val[-1] != 'f' else float(val[:-1])
+                  for val in values]
+    except ValueError:
+        pass
+    else:
+        if len(values) > 1:
+            return np.array(values)
+    if len(values) == 1:
+        values = values[0]
+    return values
+
+
 class GridBuilder(object):
-    def __init__(self, griddes):
+    def __init__(self, griddes, cache_dir=None):
         """
         Class representing horizontal grids of grid based files. This class is
         based on the grid description files of cdo [cdo]_. With this grid
@@ -67,6 +128,11 @@ def __init__(self, griddes):
             description file. Another possibility is to use a cdo conform grid
             description within a str or a dict. The latitude and longitude
             values are calculated based on this parameter.
+        cache_dir : str or None, optional
+            If this is given, decoded grid descriptions are cached as binary
+            .npz files within this directory. The cache files are keyed by
+            the hash of the grid description, such that the same grid
+            description is only decoded once. Default is None.
         
         Attributes
         ----------
@@ -76,6 +142,7 @@ def __init__(self, griddes):
         self._grid_handler = None
         self._latlon = None
         self._grid_dict = {}
+        self.cache_dir = cache_dir
         self.griddes = griddes
 
     @property
@@ -86,7 +153,7 @@ def griddes(self):
     def griddes(self, description):
         if isinstance(description, str):
             grid_str = self.open_string(description)
-            grid_dict = self.decode_str(grid_str)
+            grid_dict = self._decode_cached(grid_str)
         elif isinstance(description, list):
             grid_dict = self.decode_str(description)
         elif isinstance(description, dict):
@@ -110,6 +177,76 @@ def _set_grid_handler(self, grid_dict):
                                  'gridtypes!'.format(grid_dict['gridtype']))
             self._grid_handler = available_grids[grid_dict['gridtype']]
 
+    def _decode_cached(self, grid_str):
+        """
+        Decode the given grid string. If a cache directory is set, the decoded
+        grid dict is loaded from or stored into the cache.
+        """
+        if self.cache_dir is None:
+            return self.decode_str(grid_str)
+        cache_path = os.path.join(
+            self.cache_dir, 'griddes_{0:s}.npz'.format(
+                hashlib.sha1(grid_str.encode('utf-8')).hexdigest()))
+        try:
+            grid_dict = self.load_cache(cache_path)
+        except (OSError, ValueError) as e:
+            logger.debug('Couldn\'t load the cached grid description {0:s}, '
+                         'due to {1}'.format(cache_path, e))
+            grid_dict = self.decode_str(grid_str)
+            self.save_cache(grid_dict, cache_path)
+        return grid_dict
+
+    @staticmethod
+    def load_cache(cache_path):
+        """
+        Load a decoded grid description from a binary .npz cache file.
+
+        Parameters
+        ----------
+        cache_path : str
+            The path to the cache file.
+
+        Returns
+        -------
+        grid_dict : dict(str, str or float or numpy.ndarray)
+            The decoded grid dict.
+        """
+        grid_dict = {}
+        with np.load(cache_path, allow_pickle=False) as cache_file:
+            for key in cache_file.files:
+                value = cache_file[key]
+                if value.ndim == 0:
+                    value = value.item()
+                elif value.dtype.kind == 'U':
+                    value = value.tolist()
+                grid_dict[key] = value
+        return grid_dict
+
+    @staticmethod
+    def save_cache(grid_dict, cache_path):
+        """
+        Save a decoded grid description as binary .npz cache file. The file is
+        written to a temporary file first, such that a concurrent reader never
+        sees a partially written cache file.
+
+        Parameters
+        ----------
+        grid_dict : dict(str, str or float or numpy.ndarray)
+            The decoded grid dict.
+        cache_path : str
+            The path to the cache file.
+        """
+        cache_dir = os.path.dirname(cache_path) or '.'
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                np.savez(tmp_file, **grid_dict)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
     @staticmethod
     def open_string(path_str):
         """
@@ -131,6 +268,8 @@ def open_string(path_str):
         TypeError
             If path_str is not a str type.
         """
+        if '\n' in path_str:
+            return path_str
         try:
             with open(path_str, 'r') as gf:
                 grid_str = gf.read()
@@ -149,12 +288,12 @@ def decode_str(grid_str):
         
         Steps to decode the grid string:
             1) String splitting by new line delimiter
-            2) Clean the lines from unallowed characters
-            3) Split the non-comment lines to key, value pairs
-            4) Append elements where no key, value pair is available to the
-               previous value
-            5) Clean and split the key, value elements from spaces
-            6) Convert the values to float numbers
+            2) Split the non-comment lines to key, value pairs
+            3) Append lines where no key, value pair is available to the
+               value block of the previous key
+            4) Convert pure number blocks in bulk into numpy arrays
+            5) Clean the other values from unallowed characters, split them
+               by spaces and convert them to float numbers if possible
 
         Parameters
         ----------
@@ -165,51 +304,45 @@ def decode_str(grid_str):
 
         Returns
         -------
-        grid_dict : dict(str, str or float)
-            The decoded grid dict from the str.
+        grid_dict : dict(str, str or float or numpy.ndarray)
+            The decoded grid dict from the str. Values with more than one
+            number are stored as numpy.ndarray.
         """
         if isinstance(grid_str, str):
-            grid_str_lines = list(grid_str.split('\n'))
+            grid_str_lines = grid_str.split('\n')
         elif isinstance(grid_str, list):
             grid_str_lines = grid_str
         else:
             raise TypeError('The given grid_str has to be a str or a list of '
                             'str!')
-        preprocessed_lines = [re.sub('[^0-9a-zA-Z=#"\_\.\-\+ ]+', '', gs)
-                              for gs in grid_str_lines]
-        splitted_lines = [line.split('=', 1) for line in preprocessed_lines
-                          if len(line) > 0 and '#' not in line]
-
-        def clean_value(val):
-            if '"' in val:
-                val = [val.replace('"', '').strip(), ]
-            else:
-                val = list(filter(None, val.split(' ')))
-            return val
-        cleaned_lines = []
-        for line in splitted_lines:
-            line[-1] = clean_value(line[-1])
-            if len(line) == 1 and cleaned_lines:
-                cleaned_lines[-1][-1].extend(line[0])
-            elif len(line) == 2:
-                line[0] = line[0].strip()
-                cleaned_lines.append(line)
-        grid_dict = {l[0]: l[1] for l in cleaned_lines}
-        for k in grid_dict:
-            try:
-                grid_dict[k] = [float(val) if val[-1] != 'f'
-                                else float(val[:-1])
-                                for val in grid_dict[k]]
-            except ValueError:
-                pass
-            if len(grid_dict[k]) == 1:
-                grid_dict[k] = grid_dict[k][0]
+        value_blocks = []
+        for line in grid_str_lines:
+            if '#' in line:
+                continue
+            elif '=' in line:
+                key, value = line.split('=', 1)
+                key = _unallowed_chars.sub('', key).strip()
+                value_blocks.append((key, [value, ]))
+            elif value_blocks:
+                value_blocks[-1][1].append(line)
+        grid_dict = {key: _decode_value(value_parts)
+                     for key, value_parts in value_blocks}
         return grid_dict
 
-    def build_grid(self):
+    def build_grid(self, intern=False):
         """
         This method build up the grid with the griddes attribute.
 
+        Parameters
+        ----------
+        intern : bool, optional
+            If the grid should be interned. Interned grids are stored in a
+            process-wide registry, such that the same grid instance is
+            returned for the same grid description, as long as the grid
+            instance is used somewhere. The cached coordinates and remapping
+            helpers of the grid are then shared across datasets. Interned grids
+            should not be changed. Default is False.
+
         Returns
         -------
         grid : child instance of Grid
@@ -217,4 +350,7 @@ def build_grid(self):
             The values of the grid are calculated with griddes.
         """
         grid = self._grid_handler(self._grid_dict)
+        if intern:
+            with _registry_lock:
+                grid = _grid_registry.setdefault(grid.fingerprint, grid)
         return grid
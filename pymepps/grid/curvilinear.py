@@ -30,6 +30,7 @@
 import numpy as np
 
 # Internal modules
+from .grid import cached_coords, grid_dict_to_arrays
 from .lonlat import LonLatGrid
 from .unstructured import UnstructuredGrid
 
@@ -44,6 +45,8 @@ class CurvilinearGrid(LonLatGrid):
     on the given grid rules. At the moment the lon lat values had to be
     precomputed.
     """
+    rectilinear = False
+
     def __init__(self, grid_dict):
         super().__init__(grid_dict)
         self._grid_dict = {
@@ -56,14 +59,19 @@ def __init__(self, grid_dict):
             'yunits': 'degrees',
             'nvertex': 4,
         }
-        self._grid_dict.update(grid_dict)
+        self._grid_dict.update(grid_dict_to_arrays(grid_dict))
 
+    @cached_coords
     def _calc_lat_lon(self):
         y, x = self._construct_dim()
-        lat = np.array(self._grid_dict['yvals']).reshape(y.size, x.size)
-        lon = np.array(self._grid_dict['xvals']).reshape(y.size, x.size)
+        lat = np.asarray(self._grid_dict['yvals']).reshape(y.size, x.size)
+        lon = np.asarray(self._grid_dict['xvals']).reshape(y.size, x.size)
         return lat, lon
 
+    def _coarse_grid_dict(self, factors):
+        raise ValueError('A curvilinear grid cannot be coarsened by factors, '
+                         'please use a target grid instead!')
+
     def lonlatbox(self, data, ll_box):
         """
         The data is sliced as unstructured grid with given lonlat box.
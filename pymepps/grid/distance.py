@@ -0,0 +1,267 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 17.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# System modules
+import logging
+
+# External modules
+import numpy as np
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+
+EARTH_RADIUS = 6371E3
+
+# Default maximum number of elements of a distance chunk
+MAX_ELEMENTS = 2**22
+
+
+def distance_haversine(p1, p2):
+    """
+    Calculate the great circle distance between two points 
+    on the earth. The formula is based on the haversine formula [1]_.
+
+    Parameters
+    ----------
+    p1 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the first point in degrees.
+    p2 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the second point in degrees.
+        
+    Returns
+    -------
+    d : float
+        The calculated haversine distance in meters.
+    
+    Notes
+    -----
+    Script based on: http://stackoverflow.com/a/29546836
+    
+    References
+    ----------
+    .. [1] de Mendoza y Ríos, Memoria sobre algunos métodos nuevos de calcular
+       la longitud por las distancias lunares: y aplication de su teórica á la
+       solucion de otros problemas de navegacion, 1795.
+    """
+    lat1, lon1 = p1
+    lat2, lon2 = p2
+    R = EARTH_RADIUS
+    lat1, lon1, lat2, lon2 = map(np.deg2rad, [lat1, lon1, lat2, lon2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = np.sin(dlat/2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2.0)**2
+    c = 2 * np.arcsin(np.sqrt(a))
+    d = R * c
+    return d
+
+
+def _prepare_points(points, dtype):
+    lat, lon = points
+    lat = np.deg2rad(np.asarray(lat, dtype=dtype).ravel())
+    lon = np.deg2rad(np.asarray(lon, dtype=dtype).ravel())
+    return lat, lon, np.cos(lat)
+
+
+def iter_haversine(p1, p2, dtype=np.float64, max_elements=MAX_ELEMENTS):
+    """
+    Iterate over the many-to-many haversine distances in chunks of the first
+    points. Every chunk has at most `max_elements` elements, such that the
+    working memory is bounded independent of the number of points.
+
+    Parameters
+    ----------
+    p1 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the first points in degrees.
+        The arrays are flattened.
+    p2 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the second points in
+        degrees. The arrays are flattened.
+    dtype : numpy.dtype, optional
+        The floating point type of the calculation. With numpy.float32 the
+        working memory is halved for the price of precision. Default is
+        numpy.float64.
+    max_elements : int, optional
+        The maximum number of elements of a chunk. Default is 2**22.
+
+    Yields
+    ------
+    chunk_slice : slice
+        The slice of the first points for this chunk.
+    distance : numpy.ndarray
+        The distances in meters between the first points of this chunk and
+        all second points, with shape (chunk size, number of second points).
+        The array is reused for the next chunk and needs to be copied if it
+        should be stored.
+    """
+    lat1, lon1, cos_lat1 = _prepare_points(p1, dtype)
+    lat2, lon2, cos_lat2 = _prepare_points(p2, dtype)
+    len_p2 = max(1, lat2.size)
+    chunk_size = int(max(1, max_elements // len_p2))
+    distance_buffer = np.empty((min(chunk_size, lat1.size), lat2.size),
+                               dtype=dtype)
+    tmp_buffer = np.empty_like(distance_buffer)
+    for start in range(0, lat1.size, chunk_size):
+        end = min(start+chunk_size, lat1.size)
+        chunk_slice = slice(start, end)
+        distance = distance_buffer[:end-start]
+        tmp = tmp_buffer[:end-start]
+        # sin^2(dlon/2) * cos(lat1) * cos(lat2)
+        np.subtract(lon2[None, :], lon1[chunk_slice, None], out=tmp)
+        tmp *= 0.5
+        np.sin(tmp, out=tmp)
+        np.square(tmp, out=tmp)
+        tmp *= cos_lat1[chunk_slice, None]
+        tmp *= cos_lat2[None, :]
+        # sin^2(dlat/2)
+        np.subtract(lat2[None, :], lat1[chunk_slice, None], out=distance)
+        distance *= 0.5
+        np.sin(distance, out=distance)
+        np.square(distance, out=distance)
+        distance += tmp
+        np.clip(distance, 0, 1, out=distance)
+        np.sqrt(distance, out=distance)
+        np.arcsin(distance, out=distance)
+        distance *= 2*EARTH_RADIUS
+        yield chunk_slice, distance
+
+
+def pairwise_haversine(p1, p2, dtype=np.float64, max_elements=MAX_ELEMENTS):
+    """
+    Calculate the many-to-many great circle distances between two sets of
+    points with the haversine formula. The distances are calculated in
+    chunks, such that the working memory besides the returned matrix is
+    bounded.
+
+    Parameters
+    ----------
+    p1 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the first points in degrees.
+    p2 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the second points in degrees.
+    dtype : numpy.dtype, optional
+        The floating point type of the calculation. Default is numpy.float64.
+    max_elements : int, optional
+        The maximum number of elements of a chunk. Default is 2**22.
+
+    Returns
+    -------
+    distance : numpy.ndarray
+        The distances in meters with shape (number of first points, number of
+        second points).
+    """
+    len_p1 = np.size(p1[0])
+    len_p2 = np.size(p2[0])
+    distance = np.empty((len_p1, len_p2), dtype=dtype)
+    for chunk_slice, chunk_distance in iter_haversine(
+            p1, p2, dtype=dtype, max_elements=max_elements):
+        distance[chunk_slice] = chunk_distance
+    return distance
+
+
+def k_nearest(p1, p2, k=4, dtype=np.float64, max_elements=MAX_ELEMENTS):
+    """
+    Select the k nearest second points for every first point based on the
+    haversine distance. Per chunk only the k smallest distances are
+    selected, such that the full distance matrix is never stored.
+
+    Parameters
+    ----------
+    p1 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the query points in degrees.
+    p2 : tuple (array_like, array_like)
+        The coordinates (latitude, longitude) of the candidate points in
+        degrees.
+    k : int, optional
+        The number of nearest neighbours. Default is 4.
+    dtype : numpy.dtype, optional
+        The floating point type of the calculation. Default is numpy.float64.
+    max_elements : int, optional
+        The maximum number of elements of a distance chunk. Default is 2**22.
+
+    Returns
+    -------
+    nearest_ind : numpy.ndarray
+        The flat indices of the k nearest candidate points with shape (number
+        of query points, k). The neighbours are sorted by their distance.
+    nearest_distance : numpy.ndarray
+        The distances in meters to the k nearest candidate points with shape
+        (number of query points, k).
+
+    Raises
+    ------
+    ValueError
+        If k is not between 1 and the number of candidate points.
+    """
+    len_p1 = np.size(p1[0])
+    len_p2 = np.size(p2[0])
+    if not 0 < k <= len_p2:
+        raise ValueError('The number of neighbours k={0} has to be between 1 '
+                         'and the number of points {1:d}'.format(k, len_p2))
+    nearest_ind = np.empty((len_p1, k), dtype=np.intp)
+    nearest_distance = np.empty((len_p1, k), dtype=dtype)
+    for chunk_slice, distance in iter_haversine(
+            p1, p2, dtype=dtype, max_elements=max_elements):
+        if k < len_p2:
+            chunk_ind = np.argpartition(distance, k-1, axis=1)[:, :k]
+        else:
+            chunk_ind = np.broadcast_to(np.arange(len_p2), distance.shape)
+        chunk_distance = np.take_along_axis(distance, chunk_ind, axis=1)
+        sort_ind = np.argsort(chunk_distance, axis=1)
+        nearest_ind[chunk_slice] = np.take_along_axis(chunk_ind, sort_ind,
+                                                      axis=1)
+        nearest_distance[chunk_slice] = np.take_along_axis(
+            chunk_distance, sort_ind, axis=1)
+    return nearest_ind, nearest_distance
+
+
+def idw_weights(distance, power=2):
+    """
+    Calculate normalized inverse distance weights. If a point has a distance
+    of zero to one of its neighbours, this neighbour gets the full weight.
+
+    Parameters
+    ----------
+    distance : array_like
+        The distances to the neighbours. The last axis is the neighbour axis.
+    power : float, optional
+        The power parameter of the inverse distance weighting. Default is 2.
+
+    Returns
+    -------
+    weights : numpy.ndarray
+        The weights with the same shape as the distance. The weights along
+        the last axis sum up to one.
+    """
+    distance = np.asarray(distance)
+    exact = distance == 0
+    with np.errstate(divide='ignore'):
+        weights = 1 / distance**power
+    has_exact = np.any(exact, axis=-1)
+    weights[has_exact] = exact[has_exact]
+    weights /= np.sum(weights, axis=-1, keepdims=True)
+    return weights
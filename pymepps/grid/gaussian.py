@@ -27,8 +27,10 @@
 import logging
 
 # External modules
+import numpy as np
 
 # Internal modules
+from .grid import cached_coords
 from .lonlat import LonLatGrid
 
 
@@ -41,6 +43,7 @@ class GaussianGrid(LonLatGrid):
     longitude and/or latitude could be described with a non-evenly distributed
     list of values. 
     """
+    @cached_coords
     def _construct_dim(self):
         lonlat = []
         for dim in ('y', 'x'):
@@ -52,5 +55,5 @@ def _construct_dim(self):
                     raise KeyError(
                         'It is necessary to deliver either {0:s}vals or'
                         '({0:s}first, {0:s}size and {0:s}inc)'.format(dim))
-            lonlat.append(vals)
+            lonlat.append(np.array(vals))
         return lonlat[0], lonlat[1]
@@ -26,16 +26,30 @@
 # System modules
 import logging
 import abc
+import functools
+import hashlib
+import warnings
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 
 # External modules
 import numpy as np
 import xarray as xr
 from mpl_toolkits.basemap import interp
 from scipy.interpolate import griddata
+from scipy.spatial import cKDTree, Delaunay
+from scipy import sparse
+try:
+    import dask.array as da
+except ImportError:
+    da = None
 
 # Internal modules
 import pymepps
+from .remap import remap_cache, structured_weights, delaunay_weights, \
+    RemapWeights
+from .distance import EARTH_RADIUS, MAX_ELEMENTS, distance_haversine, \
+    k_nearest, idw_weights
 
 
 logger = logging.getLogger(__name__)
@@ -47,14 +61,84 @@
 }
 
 
+# Aggregation functions for the coarse graining, which ignore NaN values
+coarsen_funcs = {
+    'mean': np.nanmean,
+    'sum': np.nansum,
+    'max': np.nanmax,
+    'min': np.nanmin,
+}
+
+
+def _set_readonly(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for sub_value in value:
+            _set_readonly(sub_value)
+    return value
+
+
+def grid_dict_to_arrays(grid_dict):
+    """
+    Convert the list-like values of a grid description into contiguous float
+    numpy arrays. Other values and list-like values which cannot be converted
+    into floats are not changed. The returned arrays are always copies, such
+    that the grid does not share its coordinates with the given dict.
+
+    Parameters
+    ----------
+    grid_dict : dict
+        The grid description.
+
+    Returns
+    -------
+    converted_dict : dict
+        The grid description with numpy arrays instead of list-like values.
+    """
+    converted_dict = {}
+    for key, value in grid_dict.items():
+        if isinstance(value, (list, tuple, np.ndarray)):
+            try:
+                value = np.array(value, dtype=np.float64)
+            except (TypeError, ValueError):
+                pass
+        converted_dict[key] = value
+    return converted_dict
+
+
+def cached_coords(func):
+    """
+    Decorator to memoise a coordinate calculation of a grid per grid instance.
+    The returned arrays are set to read-only, such that the cached values
+    cannot be changed by accident.
+    """
+    @functools.wraps(func)
+    def wrapper(self):
+        try:
+            return self._coord_cache[func.__qualname__]
+        except KeyError:
+            value = _set_readonly(func(self))
+            self._coord_cache[func.__qualname__] = value
+            return value
+    return wrapper
+
+
 class Grid(object):
     """
     The base class for every grid type.
     """
+    # If the grid has independent latitude and longitude axes.
+    rectilinear = False
+
     # TODO: Normalize lon lat values.
     def __init__(self, grid_dict):
         self._lat_lon = None
         self._grid_dict = None
+        self._kdtree = None
+        self._triangulation = None
+        self._fingerprint = None
+        self._coord_cache = {}
         self.__nr_coords = 2
 
     def __str__(self):
@@ -68,16 +152,60 @@ def __str__(self):
         return return_str
 
     def __eq__(self, other):
-        try:
-            left = np.array(self.raw_lat_lon())
-            right = np.array(other.raw_lat_lon())
-        except AttributeError:
+        # The fingerprint is only a shortcut, grids of the same type with
+        # different descriptions are equal if they have the same coordinates.
+        if type(self) is not type(other):
+            return False
+        if self.fingerprint == other.fingerprint:
+            return True
+        if list(self.shape) != list(other.shape):
             return False
-        return np.array_equal(left, right)
+        return all(np.array_equal(left, right) for left, right in
+                   zip(self.raw_lat_lon(), other.raw_lat_lon()))
+
+    def __hash__(self):
+        # Equal grids could have different descriptions, such that only the
+        # grid type, the shape and the corner coordinates are hashed.
+        corners = []
+        for coord in self.raw_lat_lon():
+            corners.extend((float(coord[(0, )*coord.ndim]),
+                            float(coord[(-1, )*coord.ndim])))
+        return hash((self.__class__.__name__, tuple(self.shape),
+                     tuple(corners)))
 
     def copy(self):
         return deepcopy(self)
 
+    @property
+    def fingerprint(self):
+        """
+        Get a content fingerprint of this grid. The fingerprint is based on
+        the grid type and the grid description, such that grids with the same
+        description have the same fingerprint. The fingerprint is calculated
+        at the first access and cached afterwards, such that the grid
+        description should not be changed after the first access.
+
+        Returns
+        -------
+        fingerprint : str
+            The fingerprint as hexadecimal sha1 digest.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = self._calc_fingerprint()
+        return self._fingerprint
+
+    def _calc_fingerprint(self):
+        hash_obj = hashlib.sha1(self.__class__.__name__.encode('utf-8'))
+        for key in sorted(self._grid_dict):
+            value = self._grid_dict[key]
+            hash_obj.update(str(key).encode('utf-8'))
+            array_value = np.asarray(value)
+            if array_value.dtype.kind in 'biuf':
+                hash_obj.update(array_value.astype(np.float64).tobytes())
+            else:
+                hash_obj.update(repr(value).encode('utf-8'))
+        return hash_obj.hexdigest()
+
     @property
     def len_coords(self):
         """
@@ -102,6 +230,10 @@ def get_coords(self):
             their own name, indicating that the they are self-describing, and
             the coordinate values as numpy array.
         """
+        return dict(self._calc_coords())
+
+    @cached_coords
+    def _calc_coords(self):
         dim_vals = self._construct_dim()
         dim_names = self.get_coord_names()
         if isinstance(dim_vals, tuple):
@@ -111,8 +243,8 @@ def get_coords(self):
             coords = {name: ((name,), dim_vals)
                       for k, name in enumerate(dim_names)}
         else:
-            TypeError('The return value of construct dim has to be a tuple or '
-                      'numpy array!')
+            raise TypeError('The return value of construct dim has to be a '
+                            'tuple or numpy array!')
         return coords
 
     @abc.abstractmethod
@@ -135,7 +267,10 @@ def raw_dim(self):
 
     @property
     def shape(self):
-        return [len(dim) for dim in self._construct_dim()]
+        dim_vals = self._construct_dim()
+        if isinstance(dim_vals, np.ndarray):
+            return [len(dim_vals), ]
+        return [len(dim) for dim in dim_vals]
 
     @property
     def lat_lon(self):
@@ -203,18 +338,135 @@ def normalize_lat_lon(lat, lon, data=None):
             The orderd data based on given latitudes and longitudes. This is
             None if no other data was given as parameter.
         """
-        while np.any(lon > 180):
-            lon[lon > 180] -= 360
-        sort_order_lat = np.argsort(lat, 0)
-        sort_order_lon = np.argsort(lon, 1)
+        order = Grid._calc_normalize_order(lat, lon)
+        ordered_lat = Grid._apply_order(lat, order)
+        ordered_lon = Grid._apply_order(Grid.wrap_lon(lon), order)
         if data is None:
             ordered_data = None
         else:
-            ordered_data = data[..., sort_order_lat, sort_order_lon]
-        ordered_lat = lat[sort_order_lat, sort_order_lon]
-        ordered_lon = lon[sort_order_lat, sort_order_lon]
+            ordered_data = Grid._apply_order(data, order)
         return ordered_lat, ordered_lon, ordered_data
 
+    @staticmethod
+    def _axis_order(axis_vals):
+        """
+        Get the reordering of the given axis values into an increasing order.
+        The order is a slice for increasing and decreasing axes, a shift for
+        rolled axes (like a wrapped 0° to 360° longitude axis) and the argsort
+        indices for all other axes.
+        """
+        delta = np.diff(axis_vals)
+        if np.all(delta > 0):
+            return slice(None)
+        elif np.all(delta < 0):
+            return slice(None, None, -1)
+        drops = np.flatnonzero(delta < 0)
+        if len(drops) == 1 and np.all(delta[delta >= 0] > 0) and \
+                axis_vals[-1] < axis_vals[0]:
+            return -int(drops[0]+1)
+        return np.argsort(axis_vals)
+
+    @staticmethod
+    def _calc_normalize_order(lat, lon):
+        """
+        Calculate the permutation to normalize the given coordinates. If the
+        latitudes only depend on the first and the longitudes only on the
+        second dimension, the permutation is expressed per axis, otherwise it
+        is the sort order of both coordinates.
+        """
+        lon = Grid.wrap_lon(lon)
+        if np.all(lat == lat[:, :1]) and np.all(lon == lon[:1, :]):
+            return 'axes', Grid._axis_order(lat[:, 0]), \
+                   Grid._axis_order(lon[0, :])
+        return 'sort', np.argsort(lat, 0), np.argsort(lon, 1)
+
+    @staticmethod
+    def _apply_order(data, order):
+        """
+        Reorder the last two dimensions of the given data with the given
+        normalization order. Slices are applied as views, while shifts and
+        sort orders create a new array.
+        """
+        kind, lat_order, lon_order = order
+        if kind == 'sort':
+            return data[..., lat_order, lon_order]
+        ordered_data = data
+        for axis, axis_order in ((-2, lat_order), (-1, lon_order)):
+            if isinstance(axis_order, slice):
+                ordered_data = ordered_data[(Ellipsis, axis_order) +
+                                            (slice(None), )*(-axis-1)]
+            elif isinstance(axis_order, int):
+                ordered_data = np.roll(ordered_data, axis_order, axis=axis)
+            else:
+                ordered_data = np.take(ordered_data, axis_order, axis=axis)
+        return ordered_data
+
+    @cached_coords
+    def _normalize_order(self):
+        lat, lon = self._calc_lat_lon()
+        return self._calc_normalize_order(lat, lon)
+
+    @cached_coords
+    def _normalized_lat_lon(self):
+        lat, lon, _ = self.normalize_lat_lon(*self._calc_lat_lon())
+        return lat, lon
+
+    def normalize_data(self, data):
+        """
+        Reorder the given data in the same way as the coordinates of this grid
+        are normalized by normalize_lat_lon. The reordering is calculated once
+        per grid. For grids with a decreasing latitude axis or a wrapped
+        longitude axis the reordering is done with slicing and rolling, such
+        that no advanced indexing is needed.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The data which should be reordered. The last two dimensions need to
+            have the same shape as the grid.
+
+        Returns
+        -------
+        ordered_data : numpy.ndarray
+            The reordered data.
+        """
+        return self._apply_order(data, self._normalize_order())
+
+    @staticmethod
+    def wrap_lon(lon):
+        """
+        Normalize longitude values between 0° and 360° to values between
+        -180° and 180°. The given array is not changed.
+
+        Parameters
+        ----------
+        lon : numpy.ndarray
+            The longitude values in degree.
+
+        Returns
+        -------
+        wrapped_lon : numpy.ndarray
+            The normalized longitude values as new array.
+        """
+        wrapped_lon = np.array(lon, dtype=float)
+        while np.any(wrapped_lon > 180):
+            wrapped_lon[wrapped_lon > 180] -= 360
+        return wrapped_lon
+
+    def _normalize_grid(self, grid, data=None):
+        """
+        Get the normalized coordinates of the given grid. Grids with two
+        coordinates are also reordered with normalize_lat_lon, while only the
+        longitudes of unstructured grids are normalized.
+        """
+        if grid.len_coords == 1:
+            lat, lon = grid.raw_lat_lon()
+            return np.asarray(lat), self.wrap_lon(lon), data
+        lat, lon = grid._normalized_lat_lon()
+        if data is not None:
+            data = grid.normalize_data(data)
+        return lat, lon, data
+
     def get_coord_names(self):
         """
         Returns the name of the coordinates.
@@ -228,6 +480,93 @@ def get_coord_names(self):
         """
         return self._grid_dict['yname'], self._grid_dict['xname']
 
+    def remap_weights(self, other_grid, order=0):
+        """
+        Get the remapping weights from this grid to the given other grid. The
+        weights are calculated once per (source grid, target grid, order) and
+        are stored in a least recently used cache, keyed by the grid
+        fingerprints.
+
+        Parameters
+        ----------
+        other_grid : Grid instance
+            The other_grid is used as target grid for the weights.
+        order : int, optional
+            Specifies the interpolation order, based on basemap.interp order.
+            0. order: nearest neighbour
+            1. order: bilinear interpolation
+
+        Returns
+        -------
+        weights : RemapWeights
+            The remapping weights, which could be applied to data of this grid.
+        """
+        try:
+            key = (self.fingerprint, other_grid.fingerprint, order)
+        except AttributeError:
+            raise TypeError('other_grid has to be a child instance of Grid!')
+        weights = remap_cache.get(key)
+        if weights is None:
+            logger.debug('Calculate new remapping weights for {0}'.format(key))
+            weights = self._calc_remap_weights(other_grid, order=order)
+            remap_cache[key] = weights
+        return weights
+
+    @property
+    def triangulation(self):
+        """
+        A Delaunay triangulation of the grid points in the
+        (latitude, longitude) plane. The longitudes are normalized between
+        -180° and 180°. The triangulation is calculated at the first access
+        and cached for this grid.
+
+        Returns
+        -------
+        triangulation : scipy.spatial.Delaunay
+            The triangulation of the flattened grid points.
+        """
+        if self._triangulation is None:
+            logger.debug('Calculate new triangulation for grid {0:s}'.format(
+                self.fingerprint))
+            src_lat, src_lon = self._calc_lat_lon()
+            src_points = np.column_stack(
+                (np.ravel(src_lat), self.wrap_lon(np.ravel(src_lon))))
+            self._triangulation = Delaunay(src_points)
+        return self._triangulation
+
+    def _calc_remap_weights(self, other_grid, order=0):
+        """
+        Calculate the remapping weights to the normalized target grid. For
+        rectilinear grids the weights are calculated based on the latitude and
+        longitude axes, where the normalization of the source grid is included
+        within the weights. For all other grids the nearest neighbour is
+        searched with the KD-tree and the bilinear weights are based on the
+        Delaunay triangulation of the grid points.
+        """
+        trg_lat, trg_lon, _ = self._normalize_grid(other_grid)
+        if self.rectilinear:
+            src_shape = self._calc_lat_lon()[0].shape
+            src_index = np.arange(np.prod(src_shape)).reshape(src_shape)
+            src_lat, src_lon, src_index = self._normalize_grid(self, src_index)
+            weights = structured_weights(
+                src_lat[:, 0], src_lon[0, :], trg_lat, trg_lon, order=order,
+                src_index=src_index)
+        elif order == 0:
+            src_shape = self._calc_lat_lon()[0].shape
+            trg_coords = np.column_stack((trg_lat.ravel(), trg_lon.ravel()))
+            nearest_ind, _ = self.nearest_points(trg_coords)
+            indices = np.ravel_multi_index(nearest_ind, src_shape)[:, None]
+            weights = RemapWeights(indices, np.ones(indices.shape), src_shape,
+                                   trg_lat.shape)
+        elif order == 1:
+            src_shape = self._calc_lat_lon()[0].shape
+            weights = delaunay_weights(self.triangulation, trg_lat, trg_lon,
+                                       src_shape)
+        else:
+            raise ValueError('The interpolation order has to be 0 (nearest '
+                             'neighbour) or 1 (bilinear)!')
+        return weights
+
     def _interpolate_unstructured(self, data, src_lat, src_lon,
                                   trg_lat, trg_lon, order=0):
         """
@@ -241,12 +580,12 @@ def _interpolate_unstructured(self, data, src_lat, src_lon,
         unravel_shape = data.shape[:-self.len_coords]
         src_lat = src_lat.ravel()
         src_lon = src_lon.ravel()
-        src_coords = np.concatenate((src_lat, src_lon), axis=1)
+        src_coords = np.column_stack((src_lat, src_lon))
         unravel_shape = tuple(list(unravel_shape)+list(trg_lat.shape))
         remapped_data = np.zeros((reshaped_data.shape[0], trg_lat.size))
         trg_lat = trg_lat.ravel()
         trg_lon = trg_lon.ravel()
-        trg_coords = np.concatenate((trg_lat, trg_lon), axis=1)
+        trg_coords = np.column_stack((trg_lat, trg_lon))
         for i in range(reshaped_data.shape[0]):
             sliced_array = reshaped_data[i, :]
             remapped_data[i, :] = griddata(src_coords, sliced_array, trg_coords,
@@ -272,13 +611,120 @@ def _interpolate_structured(self, data, src_lat, src_lon,
         remapped_data = np.atleast_2d(remapped_data)
         return remapped_data
 
-    def interpolate(self, data, other_grid, order=0):
+    def _interpolate_slicewise(self, data, other_grid, order=0):
+        """
+        Interpolate the data slice by slice with basemap.interp for rectilinear
+        grids and with scipy.interpolate.griddata for all other grids.
+        """
+        src_lat, src_lon, data = self._normalize_grid(self, data)
+        trg_lat, trg_lon, _ = self._normalize_grid(other_grid)
+        if self.rectilinear and other_grid.len_coords == 2:
+            remapped_data = self._interpolate_structured(
+                data, src_lat[:, 0], src_lon[0, :], trg_lat, trg_lon,
+                order=order)
+        else:
+            remapped_data = self._interpolate_unstructured(
+                data, src_lat, src_lon, trg_lat, trg_lon, order=order)
+        return remapped_data
+
+    @staticmethod
+    def _is_dask(data):
+        return da is not None and isinstance(data, da.Array)
+
+    def _remap_values(self, data, other_grid, order=0, backend='numpy',
+                      out=None):
+        """
+        Remap the given numpy array with the given backend.
+        """
+        if backend == 'slicewise':
+            remapped_data = self._interpolate_slicewise(
+                data, other_grid, order=order)
+        elif backend == 'numpy':
+            weights = self.remap_weights(other_grid, order=order)
+            remapped_data = weights.gather(data, out=out)
+        else:
+            weights = self.remap_weights(other_grid, order=order)
+            remapped_data = weights.apply(data)
+        return remapped_data
+
+    def _remap_dtype(self, data, other_grid, order=0, backend='numpy'):
+        """
+        The dtype of the remapped data for the given data and backend.
         """
-        Interpolate the given data to the given other grid.
+        if backend == 'slicewise':
+            return np.dtype(np.float64)
+        return np.result_type(
+            data.dtype, self.remap_weights(other_grid, order=order).weights)
+
+    def _remap_parallel(self, data, other_grid, order=0, backend='numpy',
+                        out=None, processes=1):
+        """
+        Remap the given numpy array in chunks along the flattened leading
+        dimensions. The chunks are remapped by a thread pool and written into
+        a preallocated output array.
+        """
+        lead_shape = data.shape[:-self.len_coords]
+        trg_shape = tuple(other_grid._calc_lat_lon()[0].shape)
+        if out is None:
+            out = np.empty(lead_shape+trg_shape, dtype=self._remap_dtype(
+                data, other_grid, order=order, backend=backend))
+        elif out.shape != lead_shape+trg_shape:
+            raise ValueError(
+                'The output array needs the shape {0}, but has the shape '
+                '{1}'.format(lead_shape+trg_shape, out.shape))
+        elif not out.flags['C_CONTIGUOUS']:
+            raise ValueError('The output array has to be C-contiguous!')
+        flat_data = data.reshape((-1, )+data.shape[len(lead_shape):])
+        flat_out = out.reshape((-1, )+trg_shape)
+        n_chunks = min(processes, len(flat_data))
+        bounds = np.linspace(0, len(flat_data), n_chunks+1).astype(int)
+
+        def remap_chunk(chunk_bounds):
+            chunk_out = flat_out[chunk_bounds[0]:chunk_bounds[1]]
+            remapped = self._remap_values(
+                flat_data[chunk_bounds[0]:chunk_bounds[1]], other_grid,
+                order=order, backend=backend, out=chunk_out)
+            if remapped is not chunk_out:
+                chunk_out[...] = remapped
+
+        with ThreadPoolExecutor(max_workers=n_chunks) as executor:
+            list(executor.map(remap_chunk, zip(bounds[:-1], bounds[1:])))
+        return out
+
+    def _interpolate_lazy(self, data, other_grid, order=0, backend='numpy'):
+        """
+        Remap the given dask array blockwise. The grid dimensions are merged
+        into a single chunk, while the chunks of the leading dimensions are
+        kept, such that every block is remapped on its own.
+        """
+        lead_ndim = data.ndim-self.len_coords
+        grid_axes = list(range(lead_ndim, data.ndim))
+        data = data.rechunk({axis: -1 for axis in grid_axes})
+        trg_shape = tuple(other_grid._calc_lat_lon()[0].shape)
+        dtype = self._remap_dtype(data, other_grid, order=order,
+                                  backend=backend)
+        remapped_data = da.map_blocks(
+            self._remap_values, data, other_grid=other_grid, order=order,
+            backend=backend, drop_axis=grid_axes,
+            new_axis=list(range(lead_ndim, lead_ndim+len(trg_shape))),
+            chunks=data.chunks[:lead_ndim]+tuple((s, ) for s in trg_shape),
+            dtype=dtype)
+        return remapped_data
+
+    def interpolate(self, data, other_grid, order=0, backend='numpy',
+                    out=None, processes=1):
+        """
+        Interpolate the given data to the given other grid. The remapping
+        weights are calculated once and reused for following interpolations to
+        the same grid, see also `remap_weights`. Rectilinear grids are
+        interpolated like basemap.interp, while for curvilinear, projected and
+        unstructured grids the nearest neighbour is searched with a KD-tree and
+        the linear interpolation is based on a Delaunay triangulation, like
+        scipy.interpolate.griddata.
 
         Parameters
         ----------
-        data : numpy.ndarray or xarray.DataArray
+        data : numpy.ndarray, dask.array.Array or xarray.DataArray
             This data is used for the  interpolation. The shape of data's grid
             axis needs to be the same as this grid.
         other_grid : Grid instance
@@ -287,37 +733,74 @@ def interpolate(self, data, other_grid, order=0):
             Specifies the interpolation order, based on basemap.interp order.
             0. order: nearest neighbour
             1. order: bilinear interpolation
+        backend : str, optional
+            The backend which is used to apply the interpolation. Default is
+            numpy.
+            sparse: The remapping weights are applied as sparse matrix
+                multiplication.
+            numpy: The remapping weights are applied with vectorized numpy
+                indexing over all slices at once. This backend could write
+                into a given output array.
+            slicewise: Every two-dimensional slice is interpolated on its own
+                with basemap.interp or scipy.interpolate.griddata.
+        out : numpy.ndarray or None, optional
+            If this is given, the remapped values are written into this array.
+            The shape has to be the leading data shape followed by the shape of
+            the other grid. The numpy backend writes directly into this array,
+            while the other backends copy their result into it. Default is
+            None.
+        processes : int, optional
+            The number of threads, which are used to remap the data. If this
+            is larger than one, the leading dimensions are split into this
+            number of chunks, which are remapped in parallel and written into
+            a preallocated output array. The numpy and scipy kernels release
+            the GIL, such that the chunks are processed concurrently. Dask
+            arrays are remapped with the dask scheduler instead. Default is 1.
 
         Returns
         -------
-        remapped_data : numpy.ndarray or xarray.DataArray
+        remapped_data : numpy.ndarray, dask.array.Array or xarray.DataArray
             The remapped data with the same type as the input data. If the input
             data is a xarray.DataArray the output data will use the same
-            attributes and non-grid dimensions as the input data.
+            attributes and non-grid dimensions as the input data. Dask arrays
+            and dask-backed DataArrays are remapped lazily and blockwise along
+            the non-grid dimensions, if no output array is given.
         """
+        if backend not in ('sparse', 'numpy', 'slicewise'):
+            raise ValueError(
+                'The given backend {0} is not available, choose sparse, numpy '
+                'or slicewise!'.format(backend))
         if isinstance(data, xr.DataArray):
-            data_values = data.values
+            data_values = data.data
         else:
             data_values = data
+        if not self._is_dask(data_values) or out is not None:
+            data_values = np.asarray(data_values)
         src_lat, src_lon = self._calc_lat_lon()
         if data_values.shape[-self.len_coords:] != src_lat.shape:
             raise ValueError(
                 'The last {0:d} dimensions of the data needs the same shape as '
-                'the coordinates of this grid!'.format())
-        src_lat, src_lon, data_values = self.normalize_lat_lon(
-            src_lat, src_lon, data_values)
-        try:
-            trg_lat, trg_lon = other_grid.raw_lat_lon()
-        except AttributeError:
+                'the coordinates of this grid!'.format(self.len_coords))
+        if not isinstance(other_grid, Grid):
             raise TypeError('other_grid has to be a child instance of Grid!')
-        trg_lat, trg_lon, _ = self.normalize_lat_lon(trg_lat, trg_lon)
-        if min((self.len_coords, other_grid.len_coords)) == 1:
-            remapped_data = self._interpolate_unstructured(
-                data_values, src_lat, src_lon, trg_lat, trg_lon, order=order)
+        if backend != 'slicewise':
+            self.remap_weights(other_grid, order=order)
+        if not isinstance(processes, int) or processes < 1:
+            raise ValueError('The number of processes needs to be a positive '
+                             'integer!')
+        if self._is_dask(data_values):
+            remapped_data = self._interpolate_lazy(
+                data_values, other_grid, order=order, backend=backend)
+        elif processes > 1:
+            remapped_data = self._remap_parallel(
+                data_values, other_grid, order=order, backend=backend,
+                out=out, processes=processes)
         else:
-            remapped_data = self._interpolate_structured(
-                data_values, src_lat[:, 0], src_lon[0, :], trg_lat, trg_lon,
-                order=order)
+            remapped_data = self._remap_values(
+                data_values, other_grid, order=order, backend=backend, out=out)
+        if out is not None and remapped_data is not out:
+            out[...] = remapped_data
+            remapped_data = out
         if isinstance(data, xr.DataArray):
             data_dims = [dim for dim in data.dims
                          if dim not in self.get_coord_names()]
@@ -332,19 +815,83 @@ def interpolate(self, data, other_grid, order=0):
             )
         return remapped_data
 
+    @property
+    def kdtree(self):
+        """
+        A KD-tree over the grid points, which are transformed into
+        three-dimensional cartesian coordinates on the unit sphere. The tree is
+        built at the first access and cached for this grid.
+
+        Returns
+        -------
+        kdtree : scipy.spatial.cKDTree
+            The KD-tree with the flattened grid points.
+        """
+        if self._kdtree is None:
+            logger.debug('Build new KD-tree for grid {0:s}'.format(
+                self.fingerprint))
+            src_lat, src_lon = self._calc_lat_lon()
+            src_xyz = lat_lon_to_xyz(src_lat.ravel(), src_lon.ravel())
+            # The sliding midpoint rule is much faster for grids with many
+            # duplicated points, like the poles of regular lat-lon grids.
+            tree = cKDTree(src_xyz, balanced_tree=False, compact_nodes=False)
+            self._kdtree = (tree, src_lat.shape)
+        return self._kdtree[0]
+
+    def nearest_points(self, coords):
+        """
+        Get the nearest neighbour grid points for many coordinates at once.
+        The search is based on the cached KD-tree of this grid.
+
+        Parameters
+        ----------
+        coords : array_like
+            The coordinates as (latitude, longitude) pairs in degree with shape
+            (number of points, 2).
+
+        Returns
+        -------
+        nearest_ind : tuple(numpy.ndarray)
+            The indices of the nearest grid points. For every grid dimension
+            there is an index array with the number of points as length.
+        distance : numpy.ndarray
+            The great circle distance in meters between the coordinates and
+            their nearest grid points.
+        """
+        coords = np.atleast_2d(np.asarray(coords, dtype=float))
+        if coords.ndim != 2 or coords.shape[-1] != 2:
+            raise ValueError('The coordinates need the shape (number of '
+                             'points, 2)!')
+        trg_xyz = lat_lon_to_xyz(coords[:, 0], coords[:, 1])
+        chord, flat_ind = self.kdtree.query(trg_xyz)
+        distance = 2 * EARTH_RADIUS * np.arcsin(np.clip(chord/2, 0, 1))
+        nearest_ind = np.unravel_index(flat_ind, self._kdtree[1])
+        return nearest_ind, distance
+
     def nearest_point(self, coord):
-        src_lat, src_lon = self._calc_lat_lon()
-        calc_distance = distance_haversine(
-            coord,
-            (src_lat.flatten(), src_lon.flatten()))
-        nearest_ind = np.unravel_index(calc_distance.argmin(), src_lat.shape)
-        return nearest_ind
+        """
+        Get the index of the nearest neighbour grid point for a given
+        coordinate.
+
+        Parameters
+        ----------
+        coord : tuple(float, float)
+            The coordinate (latitude, longitude) in degree.
+
+        Returns
+        -------
+        nearest_ind : tuple(int)
+            The index of the nearest grid point for every grid dimension.
+        """
+        nearest_ind, _ = self.nearest_points([tuple(coord)])
+        return tuple(ind[0] for ind in nearest_ind)
 
     def get_nearest_point(self, data, coord):
         """
         Get the nearest neighbour grid point for a given coordinate. The
-        distance between the grid points and the given coordinates is calculated
-        with the haversine formula.
+        nearest grid point is searched with the cached KD-tree of this grid,
+        which is built on the grid points transformed to the unit sphere, see
+        also `nearest_point`.
 
         Parameters
         ----------
@@ -379,6 +926,312 @@ def get_nearest_point(self, data, coord):
             nearest_data = np.atleast_1d(nearest_data)
         return nearest_data
 
+    def nearest_neighbours(self, coords, k=4, method='kdtree',
+                           dtype=np.float64, max_elements=MAX_ELEMENTS):
+        """
+        Get the k nearest neighbour grid points for many coordinates at once.
+        With the kdtree method, the candidates are searched with the cached
+        KD-tree of this grid, such that the haversine distances are only
+        calculated for the k candidates of every coordinate. With the
+        haversine method, the haversine distances between the coordinates and
+        all grid points are calculated in chunks with bounded working memory.
+
+        Parameters
+        ----------
+        coords : array_like
+            The coordinates as (latitude, longitude) pairs in degree with shape
+            (number of points, 2).
+        k : int, optional
+            The number of nearest neighbours. Default is 4.
+        method : str, optional
+            The search method, either kdtree or haversine. Default is kdtree.
+        dtype : numpy.dtype, optional
+            The floating point type of the chunked distance calculation. This
+            is only used by the haversine method. Default is numpy.float64.
+        max_elements : int, optional
+            The maximum number of elements of a distance chunk. This is only
+            used by the haversine method. Default is 2**22.
+
+        Returns
+        -------
+        nearest_ind : tuple(numpy.ndarray)
+            The indices of the nearest grid points. For every grid dimension
+            there is an index array with the shape (number of points, k). The
+            neighbours are sorted by their distance.
+        distance : numpy.ndarray
+            The great circle distances in meters between the coordinates and
+            their nearest grid points with shape (number of points, k).
+
+        Raises
+        ------
+        ValueError
+            If the coordinates have a wrong shape, if k is not between 1 and
+            the number of grid points or if the method is not known.
+        """
+        coords = np.atleast_2d(np.asarray(coords, dtype=float))
+        if coords.ndim != 2 or coords.shape[-1] != 2:
+            raise ValueError('The coordinates need the shape (number of '
+                             'points, 2)!')
+        src_lat, src_lon = self._calc_lat_lon()
+        if method == 'haversine':
+            flat_ind, distance = k_nearest(
+                (coords[:, 0], coords[:, 1]), (src_lat, src_lon), k=k,
+                dtype=dtype, max_elements=max_elements)
+        elif method == 'kdtree':
+            flat_ind, distance = self._kdtree_neighbours(coords, k)
+        else:
+            raise ValueError('The given method {0} is not available, choose '
+                             'kdtree or haversine!'.format(method))
+        nearest_ind = np.unravel_index(flat_ind, src_lat.shape)
+        return nearest_ind, distance
+
+    def _kdtree_neighbours(self, coords, k):
+        src_lat, src_lon = self._calc_lat_lon()
+        if not 0 < k <= src_lat.size:
+            raise ValueError(
+                'The number of neighbours k={0} has to be between 1 and the '
+                'number of grid points {1:d}'.format(k, src_lat.size))
+        trg_xyz = lat_lon_to_xyz(coords[:, 0], coords[:, 1])
+        # The chord distance on the unit sphere is monotonic in the great
+        # circle distance, such that the candidates are the k nearest points.
+        _, flat_ind = self.kdtree.query(trg_xyz, k=k)
+        flat_ind = flat_ind.reshape(len(coords), k)
+        distance = distance_haversine(
+            (coords[:, :1], coords[:, 1:]),
+            (src_lat.ravel()[flat_ind], src_lon.ravel()[flat_ind]))
+        sort_ind = np.argsort(distance, axis=1, kind='mergesort')
+        flat_ind = np.take_along_axis(flat_ind, sort_ind, axis=1)
+        distance = np.take_along_axis(distance, sort_ind, axis=1)
+        return flat_ind, distance
+
+    def get_idw_points(self, data, coords, k=4, power=2, method='kdtree',
+                       dtype=np.float64):
+        """
+        Extract the data for many coordinates at once with an inverse
+        distance weighting of the k nearest neighbour grid points.
+
+        Parameters
+        ----------
+        data : numpy.ndarray or xarray.DataArray
+            The data is extracted from this array. The last dimension(s) of the
+            array should be the horizontal grid dimensions.
+        coords : array_like
+            The coordinates as (latitude, longitude) pairs in degree with shape
+            (number of points, 2).
+        k : int, optional
+            The number of nearest neighbours, which are used for the
+            weighting. Default is 4.
+        power : float, optional
+            The power parameter of the inverse distance weighting. Default is
+            2.
+        method : str, optional
+            The search method of the neighbours, either kdtree or haversine,
+            see also `nearest_neighbours`. Default is kdtree.
+        dtype : numpy.dtype, optional
+            The floating point type of the chunked distance calculation. This
+            is only used by the haversine method. Default is numpy.float64.
+
+        Returns
+        -------
+        extracted_data : numpy.ndarray or xarray.DataArray
+            The extracted data. The horizontal grid dimensions are replaced by
+            one dimension with the number of points as length. If the data is
+            a xarray.DataArray, this dimension is called station.
+        """
+        src_lat, src_lon = self._calc_lat_lon()
+        if data.shape[-self.len_coords:] != src_lat.shape:
+            raise ValueError(
+                'The last dimension(s) of the data needs the same shape as '
+                'the coordinates of this grid!')
+        nearest_ind, distance = self.nearest_neighbours(
+            coords, k=k, method=method, dtype=dtype)
+        weights = idw_weights(distance, power=power)
+        flat_ind = np.ravel_multi_index(nearest_ind, src_lat.shape)
+        values = np.asarray(data)
+        values = values.reshape(values.shape[:-self.len_coords]+(-1, ))
+        extracted_data = np.sum(values[..., flat_ind]*weights, axis=-1)
+        if isinstance(data, xr.DataArray):
+            grid_dims = data.dims[-self.len_coords:]
+            lead_dims = data.dims[:-self.len_coords]
+            coords = {name: coord for name, coord in data.coords.items()
+                      if not set(coord.dims) & set(grid_dims)}
+            extracted_data = xr.DataArray(
+                extracted_data, dims=lead_dims+('station', ), coords=coords,
+                name=data.name, attrs=data.attrs)
+        return extracted_data
+
+    def cell_map(self, other_grid):
+        """
+        Get a sparse map from the grid cells of this grid to the grid cells of
+        the given other grid. Every grid point of this grid is assigned to the
+        nearest grid point of the other grid, if it is not farther away than
+        the distance between this target point and its nearest neighbour
+        within the other grid. The map is calculated once per (source grid,
+        target grid) and stored in the least recently used remapping cache.
+
+        Parameters
+        ----------
+        other_grid : Grid instance
+            The target grid, which should be coarser than this grid.
+
+        Returns
+        -------
+        cell_map : scipy.sparse.csr_matrix
+            The map with the shape (number of target points, number of source
+            points). The entry is one if the source point is within the target
+            cell and zero otherwise.
+        """
+        try:
+            key = (self.fingerprint, other_grid.fingerprint, 'cells')
+        except AttributeError:
+            raise TypeError('other_grid has to be a child instance of Grid!')
+        cell_map = remap_cache.get(key)
+        if cell_map is None:
+            logger.debug('Calculate new cell map for {0}'.format(key))
+            cell_map = self._calc_cell_map(other_grid)
+            remap_cache[key] = cell_map
+        return cell_map
+
+    def _calc_cell_map(self, other_grid):
+        src_lat, src_lon = self._calc_lat_lon()
+        trg_lat, trg_lon = other_grid._calc_lat_lon()
+        trg_xyz = lat_lon_to_xyz(trg_lat.ravel(), trg_lon.ravel())
+        neighbours = min(4, trg_xyz.shape[0])
+        if neighbours > 1:
+            trg_chord, _ = other_grid.kdtree.query(trg_xyz, k=neighbours)
+            trg_chord[trg_chord == 0] = np.inf
+            spacing = np.min(trg_chord, axis=1)
+        else:
+            spacing = np.array([np.inf])
+        src_xyz = lat_lon_to_xyz(src_lat.ravel(), src_lon.ravel())
+        chord, trg_ind = other_grid.kdtree.query(src_xyz)
+        inside = chord <= spacing[trg_ind]
+        src_ind = np.flatnonzero(inside)
+        cell_map = sparse.csr_matrix(
+            (np.ones(src_ind.size), (trg_ind[inside], src_ind)),
+            shape=(trg_xyz.shape[0], src_xyz.shape[0]))
+        return cell_map
+
+    def _coarse_grid_dict(self, factors):
+        raise ValueError('The {0:s} is not a regular grid, which could be '
+                         'coarsened by factors, please use a target grid '
+                         'instead!'.format(self.__class__.__name__))
+
+    def _coarsen_blocks(self, data_values, factors, how):
+        grid_shape = tuple(self.shape)
+        coarse_shape = tuple(size//factor for size, factor in
+                             zip(grid_shape, factors))
+        lead_shape = data_values.shape[:-self.len_coords]
+        trimmed = data_values[
+            (Ellipsis, )+tuple(slice(0, size*factor) for size, factor in
+                               zip(coarse_shape, factors))]
+        blocked = trimmed.reshape(
+            lead_shape+(coarse_shape[0], factors[0],
+                        coarse_shape[1], factors[1]))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            coarse_values = coarsen_funcs[how](blocked, axis=(-3, -1))
+        return coarse_values
+
+    def _coarsen_cells(self, data_values, other_grid, how):
+        cell_map = self.cell_map(other_grid)
+        lead_shape = data_values.shape[:-self.len_coords]
+        flat_values = data_values.reshape((-1, cell_map.shape[1]))
+        rows_nnz = np.diff(cell_map.indptr)
+        if how in ('mean', 'sum'):
+            valid = ~np.isnan(flat_values)
+            coarse_values = cell_map.dot(np.where(valid, flat_values, 0).T).T
+            if how == 'mean':
+                counts = cell_map.dot(valid.T.astype(float)).T
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    coarse_values = coarse_values / counts
+            coarse_values[:, rows_nnz == 0] = np.nan
+        else:
+            reduce_func = np.fmax if how == 'max' else np.fmin
+            nonempty = rows_nnz > 0
+            coarse_values = np.full(
+                (flat_values.shape[0], cell_map.shape[0]), np.nan)
+            if np.any(nonempty):
+                coarse_values[:, nonempty] = reduce_func.reduceat(
+                    flat_values[:, cell_map.indices],
+                    cell_map.indptr[:-1][nonempty], axis=-1)
+        return coarse_values.reshape(lead_shape+tuple(other_grid.shape))
+
+    def coarsen(self, data, factor=None, other_grid=None, how='mean'):
+        """
+        Coarse grain the given data. Regular grids are coarsened by integer
+        factors, where blocks of grid points are aggregated. Incomplete
+        blocks at the end of the grid are trimmed. Any grid can be coarsened
+        to a given target grid, where the grid points are aggregated within
+        the cells of the target grid with a precomputed sparse cell map.
+
+        Parameters
+        ----------
+        data : numpy.ndarray or xarray.DataArray
+            The data which should be coarsened. The last dimension(s) of the
+            data should be the same as the grid dimensions.
+        factor : int or tuple(int, int) or None, optional
+            The coarsening factor for the (y, x) dimensions of a regular grid.
+            If this is an integer, the same factor is used for both
+            dimensions. This is only used if no other grid is given. Default
+            is None.
+        other_grid : Grid instance or None, optional
+            The target grid for the coarsening. If this is None, the factor
+            is used. Default is None.
+        how : str, optional
+            The aggregation function, either mean, sum, max or min. NaN values
+            are ignored. Default is mean.
+
+        Returns
+        -------
+        coarse_data : numpy.ndarray or xarray.DataArray
+            The coarsened data with the same type as the input data. Target
+            cells without any grid point of this grid are set to NaN.
+        coarse_grid : Grid instance
+            The grid of the coarsened data.
+        """
+        src_lat, src_lon = self._calc_lat_lon()
+        if data.shape[-self.len_coords:] != src_lat.shape:
+            raise ValueError(
+                'The last dimension(s) of the data needs the same shape as '
+                'the coordinates of this grid!')
+        if how not in coarsen_funcs:
+            raise ValueError('The given aggregation {0} is not available, '
+                             'choose one of {1}!'.format(
+                                 how, sorted(coarsen_funcs.keys())))
+        data_values = np.asarray(data)
+        if other_grid is not None:
+            coarse_values = self._coarsen_cells(data_values, other_grid, how)
+            coarse_grid = other_grid
+        elif factor is not None:
+            factors = tuple(np.broadcast_to(np.asarray(factor, dtype=int),
+                                            (2, )))
+            if min(factors) < 1:
+                raise ValueError('The coarsening factors have to be positive '
+                                 'integers!')
+            coarse_grid_dict = self._coarse_grid_dict(factors)
+            coarse_grid = pymepps.GridBuilder(coarse_grid_dict).build_grid()
+            coarse_values = self._coarsen_blocks(data_values, factors, how)
+        else:
+            raise ValueError('Either a factor or a target grid has to be '
+                             'given!')
+        if isinstance(data, xr.DataArray):
+            data_dims = list(data.dims[:-self.len_coords])
+            data_coords = {name: coord for name, coord in data.coords.items()
+                           if set(coord.dims) <= set(data_dims)}
+            data_coords.update(coarse_grid.get_coords())
+            data_dims.extend(coarse_grid.get_coord_names())
+            coarse_data = xr.DataArray(
+                coarse_values,
+                coords=data_coords,
+                dims=data_dims,
+                name=data.name,
+                attrs=data.attrs
+            )
+        else:
+            coarse_data = coarse_values
+        return coarse_data, coarse_grid
+
     @abc.abstractmethod
     def lonlatbox(self, data, ll_box):
         """
@@ -411,15 +1264,26 @@ def _lonlatbox(self, data, ll_box, unstructured=False):
         sliced_grid : Grid
             A new child instance of Grid with the sliced coordinates as values.
         """
-        if isinstance(data, xr.DataArray):
-            data_values = data.values
-        else:
-            data_values = data
         src_lat, src_lon = self._calc_lat_lon()
-        if data_values.shape[-self.len_coords:] != src_lat.shape:
+        if data.shape[-self.len_coords:] != src_lat.shape:
             raise ValueError(
                 'The last two dimension of the data needs the same shape as '
                 'the coordinates of this grid!')
+        if isinstance(data, xr.DataArray) and not unstructured:
+            lat_sel, lon_sel, new_grid_dict = self._structured_slices(ll_box)
+            sliced_grid = pymepps.GridBuilder(new_grid_dict).build_grid()
+            grid_dims = data.dims[-self.len_coords:]
+            sliced_data = data.isel(**{grid_dims[0]: lat_sel,
+                                       grid_dims[1]: lon_sel})
+            rename_dict = {old: new for old, new in zip(
+                grid_dims, sliced_grid.get_coord_names()) if old != new}
+            sliced_data = sliced_data.rename(rename_dict)
+            sliced_data = sliced_data.assign_coords(**sliced_grid.get_coords())
+            return sliced_data, sliced_grid
+        if isinstance(data, xr.DataArray):
+            data_values = data.values
+        else:
+            data_values = data
         if unstructured:
             sliced_data, new_grid_dict = self._unstructured_box(data_values,
                                                                 ll_box)
@@ -441,7 +1305,39 @@ def _lonlatbox(self, data, ll_box, unstructured=False):
             )
         return sliced_data, sliced_grid
 
-    def _structured_box(self, data, ll_box):
+    @staticmethod
+    def _axis_selection(axis_vals, bounds):
+        """
+        Get the selection of the given axis values within the given bounds.
+        For monotonic axes the selection is a contiguous slice, found with
+        searchsorted, such that the sliced data is a view. For all other axes
+        the selection is an index array.
+        """
+        lower, upper = np.min(bounds), np.max(bounds)
+        len_axis = len(axis_vals)
+        delta = np.diff(axis_vals)
+        if np.all(delta >= 0):
+            start = np.searchsorted(axis_vals, lower, side='left')
+            stop = np.searchsorted(axis_vals, upper, side='right')
+            selection = slice(int(start), int(max(start, stop)))
+        elif np.all(delta <= 0):
+            reversed_vals = axis_vals[::-1]
+            start = np.searchsorted(reversed_vals, lower, side='left')
+            stop = np.searchsorted(reversed_vals, upper, side='right')
+            selection = slice(int(len_axis-max(start, stop)),
+                              int(len_axis-start))
+        else:
+            selection = np.flatnonzero(np.logical_and(
+                axis_vals >= lower, axis_vals <= upper))
+        return selection
+
+    def _structured_slices(self, ll_box):
+        """
+        Get the latitude and longitude selections and the new grid
+        description for the given longitude-latitude box. If the axes are
+        described by first, inc and size and the selection is a slice, the new
+        grid is also described by first, inc and size.
+        """
         calc_lat, calc_lon = self._construct_dim()
         if not len(ll_box) == 4:
             raise ValueError(
@@ -449,24 +1345,34 @@ def _structured_box(self, data, ll_box):
                 'instead the length is: {0:d}'.format(len(ll_box)))
         lon_box = (ll_box[0], ll_box[2])
         lat_box = (ll_box[1], ll_box[3])
-        lat_bound = np.logical_and(
-            calc_lat >= np.min(lat_box), calc_lat <= np.max(lat_box)
-        )
-        lon_bound = np.logical_and(
-            calc_lon >= np.min(lon_box), calc_lon <= np.max(lon_box)
-        )
-        sliced_data = data[..., lat_bound, :][..., lon_bound]
-
-        lat_vals = calc_lat[lat_bound]
-        lon_vals = calc_lon[lon_bound]
-
         new_grid_dict = deepcopy(self._grid_dict)
-        new_grid_dict['ysize'] = len(lat_vals)
-        new_grid_dict['xsize'] = len(lon_vals)
-        new_grid_dict['yvals'] = list(lat_vals)
-        new_grid_dict['xvals'] = list(lon_vals)
-        keys_to_del = ['yfirst', 'yinc', 'xfirst', 'xinc']
-        [new_grid_dict.pop(k, None) for k in keys_to_del]
+        selections = []
+        for dim, axis_vals, box in (('y', calc_lat, lat_box),
+                                    ('x', calc_lon, lon_box)):
+            selection = self._axis_selection(axis_vals, box)
+            sliced_vals = axis_vals[selection]
+            keys_to_del = ['{0:s}first'.format(dim), '{0:s}inc'.format(dim),
+                           '{0:s}vals'.format(dim)]
+            regular = isinstance(selection, slice) and \
+                '{0:s}vals'.format(dim) not in self._grid_dict and \
+                all(k in self._grid_dict for k in keys_to_del[:2])
+            [new_grid_dict.pop(k, None) for k in keys_to_del]
+            new_grid_dict['{0:s}size'.format(dim)] = len(sliced_vals)
+            if regular and len(sliced_vals) > 0:
+                new_grid_dict['{0:s}first'.format(dim)] = sliced_vals[0]
+                new_grid_dict['{0:s}inc'.format(dim)] = \
+                    self._grid_dict['{0:s}inc'.format(dim)]
+            else:
+                new_grid_dict['{0:s}vals'.format(dim)] = np.array(sliced_vals)
+            selections.append(selection)
+        return selections[0], selections[1], new_grid_dict
+
+    def _structured_box(self, data, ll_box):
+        lat_sel, lon_sel, new_grid_dict = self._structured_slices(ll_box)
+        if isinstance(lat_sel, slice) or isinstance(lon_sel, slice):
+            sliced_data = data[..., lat_sel, lon_sel]
+        else:
+            sliced_data = data[..., lat_sel, :][..., lon_sel]
         return sliced_data, new_grid_dict
 
     def _unstructured_box(self, data, ll_box):
@@ -505,8 +1411,8 @@ def _unstructured_box(self, data, ll_box):
             yname='lat',
             yunits='degrees',)
         new_grid_dict['gridsize'] = len(lat_vals)
-        new_grid_dict['yvals'] = list(lat_vals)
-        new_grid_dict['xvals'] = list(lon_vals)
+        new_grid_dict['yvals'] = lat_vals
+        new_grid_dict['xvals'] = lon_vals
         return sliced_data, new_grid_dict
 
     @staticmethod
@@ -532,40 +1438,28 @@ def convert_to_deg(field, unit):
                              '{0:s} defined yet!'.format(unit))
         return calculated_field
 
-def distance_haversine(p1, p2):
+def lat_lon_to_xyz(lat, lon):
     """
-    Calculate the great circle distance between two points 
-    on the earth. The formula is based on the haversine formula [1]_.
+    Transform latitude and longitude values in degree into three-dimensional
+    cartesian coordinates on the unit sphere.
 
     Parameters
     ----------
-    p1 : tuple (array_like, array_like)
-        The coordinates (latitude, longitude) of the first point in degrees.
-    p2 : tuple (array_like, array_like)
-        The coordinates (latitude, longitude) of the second point in degrees.
-        
+    lat : array_like
+        The latitude values in degree.
+    lon : array_like
+        The longitude values in degree with the same shape as lat.
+
     Returns
     -------
-    d : float
-        The calculated haversine distance in meters.
-    
-    Notes
-    -----
-    Script based on: http://stackoverflow.com/a/29546836
-    
-    References
-    ----------
-    .. [1] de Mendoza y Ríos, Memoria sobre algunos métodos nuevos de calcular
-       la longitud por las distancias lunares: y aplication de su teórica á la
-       solucion de otros problemas de navegacion, 1795.
+    xyz : numpy.ndarray
+        The cartesian coordinates with the shape of lat and an additional
+        last axis with length 3.
     """
-    lat1, lon1 = p1
-    lat2, lon2 = p2
-    R = 6371E3
-    lat1, lon1, lat2, lon2 = map(np.deg2rad, [lat1, lon1, lat2, lon2])
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = np.sin(dlat/2.0)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2.0)**2
-    c = 2 * np.arcsin(np.sqrt(a))
-    d = R * c
-    return d
+    lat = np.deg2rad(lat)
+    lon = np.deg2rad(lon)
+    cos_lat = np.cos(lat)
+    xyz = np.stack((cos_lat*np.cos(lon), cos_lat*np.sin(lon), np.sin(lat)),
+                   axis=-1)
+    return xyz
+
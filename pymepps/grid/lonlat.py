@@ -31,7 +31,7 @@
 import xarray as xr
 
 # Internal modules
-from .grid import Grid
+from .grid import Grid, cached_coords, grid_dict_to_arrays
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +43,8 @@ class LonLatGrid(Grid):
     This is the right grid if the grid could be described with a evenly
     distributed range of values for longitude and latitude.
     """
+    rectilinear = True
+
     def __init__(self, grid_dict):
         super().__init__(grid_dict)
         self._grid_dict = {
@@ -54,7 +56,7 @@ def __init__(self, grid_dict):
             'yname': 'lat',
             'yunits': 'degrees',
         }
-        self._grid_dict.update(grid_dict)
+        self._grid_dict.update(grid_dict_to_arrays(grid_dict))
 
     def _calc_single_dim(self, dim_name='x'):
         steps = self._grid_dict['{0:s}size'.format(dim_name)]
@@ -67,21 +69,55 @@ def _calc_single_dim(self, dim_name='x'):
                 start + steps * width,
                 width)
         except KeyError:
-            calculated_dim = np.array(
+            calculated_dim = np.asarray(
                 self._grid_dict['{0:s}vals'.format(dim_name)])
         if calculated_dim.ndim >= 1:
             calculated_dim = calculated_dim[:int(steps)]
         return calculated_dim.flatten()
 
+    @cached_coords
     def _construct_dim(self):
         return self._calc_single_dim('y'), self._calc_single_dim('x')
 
+    @cached_coords
     def _calc_lat_lon(self):
         dim_lat, dim_lon = self._construct_dim()
         dim_lat = self.convert_to_deg(dim_lat, self._grid_dict['yunits'])
         dim_lon = self.convert_to_deg(dim_lon, self._grid_dict['xunits'])
-        lat, lon = np.meshgrid(dim_lat, dim_lon)
-        return lat.transpose(), lon.transpose()
+        grid_shape = (len(dim_lat), len(dim_lon))
+        lat = np.broadcast_to(dim_lat[:, None], grid_shape)
+        lon = np.broadcast_to(dim_lon[None, :], grid_shape)
+        return lat, lon
+
+    def _coarse_grid_dict(self, factors):
+        """
+        Get the grid description of the coarsened grid, where blocks of
+        factors grid points are combined. The coarse grid points are the
+        centres of the blocks.
+        """
+        coarse_grid_dict = dict(self._grid_dict)
+        for dim, dim_vals, factor in zip(('y', 'x'), self._construct_dim(),
+                                         factors):
+            coarse_size = len(dim_vals) // factor
+            if coarse_size == 0:
+                raise ValueError(
+                    'The coarsening factor {0:d} is larger than the {1:s} '
+                    'dimension with {2:d} grid points!'.format(
+                        factor, dim, len(dim_vals)))
+            coarse_vals = dim_vals[:coarse_size*factor].reshape(
+                coarse_size, factor).mean(axis=1)
+            coarse_grid_dict['{0:s}size'.format(dim)] = coarse_size
+            inc_key = '{0:s}inc'.format(dim)
+            if inc_key in self._grid_dict and \
+                    '{0:s}vals'.format(dim) not in self._grid_dict:
+                coarse_grid_dict['{0:s}first'.format(dim)] = coarse_vals[0]
+                coarse_grid_dict[inc_key] = self._grid_dict[inc_key] * factor
+            else:
+                coarse_grid_dict['{0:s}vals'.format(dim)] = coarse_vals
+        if 'gridsize' in coarse_grid_dict:
+            coarse_grid_dict['gridsize'] = coarse_grid_dict['ysize'] * \
+                coarse_grid_dict['xsize']
+        return coarse_grid_dict
 
     def lonlatbox(self, data, ll_box):
         """
@@ -26,12 +26,14 @@
 # System modules
 import logging
 import abc
+import functools
 
 # External modules
 import numpy as np
 import pyproj
 
 # Internal modules
+from .grid import cached_coords, grid_dict_to_arrays
 from .lonlat import LonLatGrid
 from .unstructured import UnstructuredGrid
 
@@ -39,6 +41,48 @@
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=32)
+def get_proj(proj4):
+    """
+    Get a pyproj projection for given proj4 string. The projections are
+    cached, such that grids with the same proj4 string share their projection.
+
+    Parameters
+    ----------
+    proj4 : str
+        The proj4 string of the projection.
+
+    Returns
+    -------
+    projection : pyproj.Proj
+        The initialized projection.
+    """
+    return pyproj.Proj(proj4)
+
+
+@functools.lru_cache(maxsize=32)
+def get_transformer(proj4):
+    """
+    Get a pyproj transformer from the projection of given proj4 string to
+    its geodetic coordinate reference system. The transformers are cached,
+    such that the transformation pipeline is only set up once for every proj4
+    string and is reused by all grids with this projection.
+
+    Parameters
+    ----------
+    proj4 : str
+        The proj4 string of the projection.
+
+    Returns
+    -------
+    transformer : pyproj.Transformer
+        The initialized transformer, which transforms projected x and y
+        coordinates into longitude and latitude values in degrees.
+    """
+    crs = pyproj.CRS(proj4)
+    return pyproj.Transformer.from_crs(crs, crs.geodetic_crs, always_xy=True)
+
+
 class ProjectionGrid(LonLatGrid):
     """
     A projection grid could be defined by a evenly distributed grid. The grid
@@ -46,6 +90,9 @@ class ProjectionGrid(LonLatGrid):
     projection. At the moment only projections defined by a proj4 string or a 
     rotated latitude and longitude are supported.
     """
+    rectilinear = False
+    chunk_points = 2**18
+
     def __init__(self, grid_dict):
         super().__init__(grid_dict)
         self._grid_dict = {
@@ -58,12 +105,12 @@ def __init__(self, grid_dict):
             'yunits': 'degrees',
             'proj4': None,
         }
-        self._grid_dict.update(grid_dict)
+        self._grid_dict.update(grid_dict_to_arrays(grid_dict))
         self.proj = self.get_projection()
 
     def get_projection(self):
         if self._grid_dict['proj4'] is not None:
-            projection = pyproj.Proj(self._grid_dict['proj4'])
+            projection = get_proj(self._grid_dict['proj4'])
         elif self._grid_dict['grid_mapping'] == 'rotated_pole':
             projection = RotPoleProj(
                 npole_lat=self._grid_dict['grid_north_pole_latitude'],
@@ -74,11 +121,31 @@ def get_projection(self):
                 'valid proj4 string or a rotated lonlat grid!')
         return projection
 
+    @cached_coords
     def _calc_lat_lon(self):
+        """
+        The latitude and longitude values are transformed in chunks of rows,
+        such that at most `chunk_points` grid points are transformed at once.
+        Projections defined by a proj4 string are transformed with a cached
+        pyproj transformer to their geodetic coordinate reference system.
+        The transformed values are written into preallocated arrays.
+        """
         y, x = self._construct_dim()
-        y, x = np.meshgrid(y, x)
-        lon, lat = self.proj(x.transpose(), y.transpose(), inverse=True)
-        return lat, lon
+        if isinstance(self.proj, RotPoleProj):
+            transform = functools.partial(self.proj, inverse=True)
+        else:
+            transform = get_transformer(self._grid_dict['proj4']).transform
+        lon_lat = np.empty((2, len(y), len(x)))
+        chunk_rows = max(1, self.chunk_points // max(1, len(x)))
+        for start in range(0, len(y), chunk_rows):
+            end = min(start+chunk_rows, len(y))
+            x_chunk, y_chunk = np.meshgrid(x, y[start:end])
+            if isinstance(self.proj, RotPoleProj):
+                transform(x_chunk, y_chunk, out=lon_lat[:, start:end])
+            else:
+                lon_lat[0, start:end], lon_lat[1, start:end] = transform(
+                    x_chunk, y_chunk)
+        return lon_lat[1], lon_lat[0]
 
     def lonlatbox(self, data, ll_box):
         """
@@ -132,27 +199,29 @@ def transform_from_latlon(self, lon, lat):
 
     @staticmethod
     def _check_lat(lat):
-        if not np.all(-90<=lat):
+        lat_min, lat_max = np.min(lat), np.max(lat)
+        if not -90 <= lat_min:
             raise ValueError(
-                'The given latitude {0:.4f} is not between -90\° and '
-                '90\°'.format(lat))
-        elif not np.all(lat<=90):
+                'The given latitude {0:.4f} is not between -90 deg and '
+                '90 deg'.format(lat_min))
+        elif not lat_max <= 90:
             raise ValueError(
-                'The given latitude {0} is not between -90 deg and '
-                '90 deg'.format(lat))
+                'The given latitude {0:.4f} is not between -90 deg and '
+                '90 deg'.format(lat_max))
         return lat
 
     @staticmethod
     def _check_lon(lon):
-        if not np.all(-180<=lon):
+        lon_min, lon_max = np.min(lon), np.max(lon)
+        if not -180 <= lon_min:
             raise ValueError(
-                'The given longitude {0:.4f} is not between -180\° and '
-                '360\°'.format(lon))
-        elif not np.all(lon<=360):
+                'The given longitude {0:.4f} is not between -180 deg and '
+                '360 deg'.format(lon_min))
+        elif not lon_max <= 360:
             raise ValueError(
-                'The given longitude {0:.4f} is not between -180\° and '
-                '360\°'.format(lon))
-        elif np.any(180<lon):
+                'The given longitude {0:.4f} is not between -180 deg and '
+                '360 deg'.format(lon_max))
+        elif 180 < lon_max:
             lon = 360 - lon
         return lon
 
@@ -172,6 +241,11 @@ class RotPoleProj(BaseProj):
     calculated in a cf-conform manner, with a rotated north pole. The
     calculations are based on [1]_. If the resulting latitude coordinate equals
     -90° or 90° the longitude coordinate will be set to 0°.
+
+    The rotation is expressed as 3x3 rotation matrix, which is precomputed for
+    the forward and the inverse transformation, such that every
+    transformation is a single matrix multiplication of the cartesian
+    coordinates.
     
     Parameters
     ----------
@@ -179,21 +253,28 @@ class RotPoleProj(BaseProj):
         The latitude of the rotated north pole in degrees.
     npole_lon: float
         The longitude of the rotated north pole in degrees.
+    dtype: numpy.dtype, optional
+        The floating point type which is used for the calculations. With
+        numpy.float32 the memory consumption is halved for the price of
+        precision. Default is numpy.float64.
     
     References
     ----------
     [1] http://de.mathworks.com/matlabcentral/fileexchange/43435-rotated-grid-
         transform
     """
-    def __init__(self, npole_lat, npole_lon):
+    def __init__(self, npole_lat, npole_lon, dtype=np.float64):
         self._north_pole = None
+        self._rot_matrix = None
+        self._inv_matrix = None
+        self.dtype = np.dtype(dtype)
         self.north_pole = (npole_lat, npole_lon)
 
-    def __call__(self, x, y, inverse=False):
+    def __call__(self, x, y, inverse=False, out=None):
         if inverse:
-            return self.transform_to_lonlat(x, y)
+            return self.transform_to_lonlat(x, y, out=out)
         else:
-            return self.transform_from_lonlat(x, y)
+            return self.transform_from_lonlat(x, y, out=out)
 
     @property
     def north_pole(self):
@@ -208,68 +289,111 @@ def north_pole(self, coords):
             'lat': self._deg2rad(self._check_lat(coords[0])),
             'lon': self._deg2rad(self._check_lon(coords[1]))
         }
+        self._rot_matrix = self._calc_rotation_matrix().astype(self.dtype)
+        self._inv_matrix = np.ascontiguousarray(self._rot_matrix.T)
 
-    def _prepare_rotation(self, lat, lon):
-        lat = self._deg2rad(self._check_lat(lat))
-        lon = self._deg2rad(self._check_lon(lon))
-        x = np.cos(lon)*np.cos(lat)
-        y = np.sin(lon)*np.cos(lat)
-        z = np.sin(lat)
+    def _calc_rotation_matrix(self):
+        """
+        Calculate the rotation matrix from normal to rotated cartesian
+        coordinates. The inverse rotation is the transposed matrix.
+        """
         theta = np.pi*1/2-self._north_pole['lat']
-        phi = self._deg2rad(self._check_lon(
-            self._rad2deg(self._north_pole['lon'])))
-        if np.abs(self._north_pole['lat'])!=np.pi/2:
+        phi = self._north_pole['lon']
+        if np.abs(self._north_pole['lat']) != np.pi/2:
             phi = np.pi+phi
-        return x, y, z, theta, phi
-
-    def _rotate_coords(self, x, y, z, theta, phi):
-        x_new = np.cos(theta)*np.cos(phi)*x\
-                + np.cos(theta)*np.sin(phi)*y\
-                + np.sin(theta)*z
-        y_new = -np.sin(phi)*x\
-                + np.cos(phi)*y
-        z_new = -np.sin(theta)*np.cos(phi)*x\
-                - np.sin(theta)*np.sin(phi)*y\
-                + np.cos(theta)*z
-        return x_new, y_new, z_new
-
-    def _derotate_coords(self, x, y, z, theta, phi):
-        phi = -phi
-        theta = -theta
-        x_new = np.cos(theta)*np.cos(phi)*x\
-                +np.sin(phi)*y\
-                +np.sin(theta)*np.cos(phi)*z
-        y_new = -np.cos(theta)*np.sin(phi)*x\
-                +np.cos(phi)*y\
-                -np.sin(theta)*np.sin(phi)*z
-        z_new = -np.sin(theta)*x\
-                +np.cos(theta)*z
-        return x_new, y_new, z_new
-
-    def _post_rotation(self, x, y, z):
-        lat = self._rad2deg(np.arcsin(z))
-        lon = self._rad2deg(np.arctan2(y, x))
-        if np.all(lat==np.pi/2):
-            lon = 0
-        return lat, lon
-
-    def transform_from_lonlat(self, lon, lat):
+        cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+        cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+        rot_matrix = np.array([
+            [cos_theta*cos_phi, cos_theta*sin_phi, sin_theta],
+            [-sin_phi, cos_phi, 0],
+            [-sin_theta*cos_phi, -sin_theta*sin_phi, cos_theta]
+        ])
+        return rot_matrix
+
+    def _transform(self, lon, lat, rot_matrix, out=None):
         """
-        Transform the given lon, lat arrays to x and  y values.
+        Transform the given longitude and latitude values with the given
+        rotation matrix. The coordinates are converted into cartesian
+        coordinates on the unit sphere, which are rotated in a single matrix
+        multiplication.
         """
-        x, y, z, theta, phi = self._prepare_rotation(lat, lon)
-        rot_x, rot_y, rot_z = self._rotate_coords(x, y, z, theta, phi)
-        rot_lat, rot_lon = self._post_rotation(rot_x, rot_y, rot_z)
+        lon = self._check_lon(np.asarray(lon, dtype=self.dtype))
+        lat = self._check_lat(np.asarray(lat, dtype=self.dtype))
+        lon, lat = np.broadcast_arrays(lon, lat)
+        lon_rad = np.deg2rad(lon)
+        lat_rad = np.deg2rad(lat)
+        xyz = np.empty((3, lat.size), dtype=self.dtype)
+        np.cos(lat_rad.ravel(), out=xyz[2])
+        np.multiply(np.cos(lon_rad.ravel()), xyz[2], out=xyz[0])
+        np.multiply(np.sin(lon_rad.ravel()), xyz[2], out=xyz[1])
+        np.sin(lat_rad.ravel(), out=xyz[2])
+        del lon_rad, lat_rad
+        rot_xyz = np.dot(rot_matrix, xyz)
+        del xyz
+        if out is None:
+            out = np.empty((2, )+lat.shape, dtype=self.dtype)
+        elif np.shape(out) != (2, )+lat.shape:
+            raise ValueError('The output array needs the shape {0}'.format(
+                (2, )+lat.shape))
+        rot_lon, rot_lat = out[0, ...], out[1, ...]
+        np.clip(rot_xyz[2], -1, 1, out=rot_xyz[2])
+        np.arcsin(rot_xyz[2].reshape(lat.shape), out=rot_lat)
+        np.rad2deg(rot_lat, out=rot_lat)
+        np.arctan2(rot_xyz[1].reshape(lat.shape),
+                   rot_xyz[0].reshape(lat.shape), out=rot_lon)
+        np.rad2deg(rot_lon, out=rot_lon)
+        rot_lon[np.abs(rot_lat) == 90] = 0
+        if rot_lat.ndim == 0:
+            return rot_lon[()], rot_lat[()]
         return rot_lon, rot_lat
 
-    def transform_to_lonlat(self, x, y):
+    def transform_from_lonlat(self, lon, lat, out=None):
+        """
+        Transform the given lon, lat arrays to x and  y values.
+
+        Parameters
+        ----------
+        lon : array_like
+            The longitude values in degree.
+        lon : array_like
+            The latitude values in degree.
+        out : numpy.ndarray or None, optional
+            If this is given, the rotated longitudes and latitudes are written
+            into this array with shape (2, ) + shape of the coordinates. If
+            this is None, a new array is created. Default is None.
+
+        Returns
+        -------
+        rot_lon : numpy.ndarray
+            The rotated longitude values in degree.
+        rot_lat : numpy.ndarray
+            The rotated latitude values in degree.
+        """
+        return self._transform(lon, lat, self._rot_matrix, out=out)
+
+    def transform_to_lonlat(self, x, y, out=None):
         """
         Transform the given x and y arrays to latitude and longitude values.
+
+        Parameters
+        ----------
+        x : array_like
+            The rotated longitude values in degree.
+        y : array_like
+            The rotated latitude values in degree.
+        out : numpy.ndarray or None, optional
+            If this is given, the longitudes and latitudes are written into
+            this array with shape (2, ) + shape of the coordinates. If this is
+            None, a new array is created. Default is None.
+
+        Returns
+        -------
+        lon : numpy.ndarray
+            The longitude values in degree.
+        lat : numpy.ndarray
+            The latitude values in degree.
         """
-        rot_x, rot_y, rot_z, theta, phi = self._prepare_rotation(y, x)
-        x, y, z = self._derotate_coords(rot_x, rot_y, rot_z, theta, phi)
-        lat, lon = self._post_rotation(x, y, z)
-        return lon, lat
+        return self._transform(x, y, self._inv_matrix, out=out)
 
     def lonlatbox(self, data, ll_box):
         """
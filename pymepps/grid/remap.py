@@ -0,0 +1,370 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 17.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# System modules
+import logging
+import threading
+from collections import OrderedDict
+
+# External modules
+import numpy as np
+import scipy.sparse
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+
+class RemapWeights(object):
+    """
+    Precomputed remapping weights from a source grid to a target grid. Every
+    target point is calculated as weighted sum of a fixed number of source
+    points (the stencil). The weights could be applied to data with an
+    arbitrary number of leading dimensions in a single sparse matrix
+    multiplication.
+
+    Parameters
+    ----------
+    indices : numpy.ndarray
+        The flat source indices with shape (target size, stencil size). The
+        indices are based on the flattened source grid dimensions.
+    weights : numpy.ndarray
+        The weights with the same shape as indices.
+    src_shape : tuple(int)
+        The shape of the source grid dimensions.
+    trg_shape : tuple(int)
+        The shape of the target grid dimensions.
+    """
+    def __init__(self, indices, weights, src_shape, trg_shape):
+        self.indices = np.atleast_2d(indices)
+        self.weights = np.atleast_2d(weights)
+        self.src_shape = tuple(src_shape)
+        self.trg_shape = tuple(trg_shape)
+        self._matrix = None
+
+    def __repr__(self):
+        return '{0:s}({1} -> {2}, stencil={3:d})'.format(
+            self.__class__.__name__, self.src_shape, self.trg_shape,
+            self.indices.shape[-1])
+
+    @property
+    def src_size(self):
+        return int(np.prod(self.src_shape))
+
+    @property
+    def trg_size(self):
+        return int(np.prod(self.trg_shape))
+
+    @property
+    def matrix(self):
+        """
+        The weights as sparse matrix with shape (target size, source size). The
+        matrix is created at the first access.
+        """
+        if self._matrix is None:
+            stencil = self.indices.shape[-1]
+            indptr = np.arange(0, self.trg_size*stencil+1, stencil)
+            self._matrix = scipy.sparse.csr_matrix(
+                (self.weights.ravel(), self.indices.ravel(), indptr),
+                shape=(self.trg_size, self.src_size)
+            )
+        return self._matrix
+
+    def _flatten_data(self, data):
+        data = np.asarray(data)
+        grid_dims = len(self.src_shape)
+        if data.shape[data.ndim-grid_dims:] != self.src_shape:
+            raise ValueError(
+                'The last {0:d} dimensions of the data needs the same shape as '
+                'the source grid {1}!'.format(grid_dims, self.src_shape))
+        lead_shape = data.shape[:data.ndim-grid_dims]
+        flat_data = data.reshape((-1, self.src_size))
+        return flat_data, lead_shape
+
+    def apply(self, data):
+        """
+        Apply the remapping weights to the given data.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The data which should be remapped. The last dimensions of the data
+            need to have the same shape as the source grid.
+
+        Returns
+        -------
+        remapped_data : numpy.ndarray
+            The remapped data. The leading dimensions are the same as for the
+            input data, while the grid dimensions are replaced by the target
+            grid dimensions.
+        """
+        flat_data, lead_shape = self._flatten_data(data)
+        remapped_data = self.matrix.dot(flat_data.T).T
+        return remapped_data.reshape(lead_shape+self.trg_shape)
+
+    def gather(self, data, out=None):
+        """
+        Apply the remapping weights to the given data with vectorized numpy
+        indexing. For every stencil point the source values of all slices are
+        gathered at once, such that there is no loop over the leading
+        dimensions.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The data which should be remapped. The last dimensions of the data
+            need to have the same shape as the source grid.
+        out : numpy.ndarray or None, optional
+            The remapped data is written into this C-contiguous array. The
+            shape of the array needs to be the leading data shape followed by
+            the target grid shape. If this is None, a new array is created.
+            Default is None.
+
+        Returns
+        -------
+        remapped_data : numpy.ndarray
+            The remapped data. If out is given, out is returned.
+        """
+        flat_data, lead_shape = self._flatten_data(data)
+        if out is None:
+            out = np.empty(lead_shape+self.trg_shape,
+                           dtype=np.result_type(flat_data, self.weights))
+        elif out.shape != lead_shape+self.trg_shape:
+            raise ValueError(
+                'The output array needs the shape {0}, but has the shape '
+                '{1}'.format(lead_shape+self.trg_shape, out.shape))
+        elif not out.flags['C_CONTIGUOUS']:
+            raise ValueError('The output array has to be C-contiguous!')
+        flat_out = out.reshape((-1, self.trg_size))
+        np.multiply(flat_data.take(self.indices[:, 0], axis=1),
+                    self.weights[:, 0], out=flat_out)
+        for k in range(1, self.indices.shape[-1]):
+            flat_out += flat_data.take(self.indices[:, k], axis=1) * \
+                        self.weights[:, k]
+        return out
+
+
+class WeightCache(object):
+    """
+    A thread-safe least recently used cache for remapping weights. If more
+    than maxsize weights are stored, the least recently used weights are
+    removed.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of cached weights. Default is 16.
+    """
+    def __init__(self, maxsize=16):
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __setitem__(self, key, weights):
+        with self._lock:
+            self._cache[key] = weights
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                removed_key, _ = self._cache.popitem(last=False)
+                logger.debug('Removed remapping weights {0} from cache'.format(
+                    removed_key))
+
+    def get(self, key, default=None):
+        """
+        Get the weights for the given key. The key is marked as recently used.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the weights.
+        default : obj, optional
+            This is returned if the key is not cached. Default is None.
+
+        Returns
+        -------
+        weights : RemapWeights or obj
+            The cached weights or the default value.
+        """
+        with self._lock:
+            try:
+                self._cache.move_to_end(key)
+            except KeyError:
+                return default
+            return self._cache[key]
+
+    def clear(self):
+        """
+        Remove all cached weights.
+        """
+        with self._lock:
+            self._cache.clear()
+
+
+remap_cache = WeightCache()
+
+
+def _fractional_index(src_axis, trg_vals):
+    """
+    Calculate the fractional index of the target values within the monotonic
+    increasing source axis. The calculation is the same as in basemap.interp,
+    such that values outside the source axis are clipped to the boundaries.
+    """
+    trg_vals = np.asarray(trg_vals)
+    len_axis = len(src_axis)
+    if len_axis < 2:
+        return np.zeros(trg_vals.shape)
+    delta = src_axis[1:]-src_axis[:-1]
+    if np.max(delta)-np.min(delta) < 1E-4:
+        frac_ind = (len_axis-1)*(trg_vals-src_axis[0]) / \
+                   (src_axis[-1]-src_axis[0])
+    else:
+        ind = np.searchsorted(src_axis, trg_vals)-1
+        lower = np.clip(ind, 0, len_axis-2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac_ind = ind+(trg_vals-src_axis[lower]) / \
+                       (src_axis[lower+1]-src_axis[lower])
+        frac_ind = np.where(ind < 0, -1, frac_ind)
+        frac_ind = np.where(ind >= len_axis-1, len_axis, frac_ind)
+    return np.clip(frac_ind, 0, len_axis-1)
+
+
+def structured_weights(src_lat, src_lon, trg_lat, trg_lon, order=0,
+                       src_index=None):
+    """
+    Calculate the remapping weights from a structured source grid with
+    monotonic increasing latitude and longitude axes to the given target
+    points. The weights are calculated in the same way as basemap.interp.
+
+    Parameters
+    ----------
+    src_lat : numpy.ndarray
+        The increasing latitude axis of the source grid.
+    src_lon : numpy.ndarray
+        The increasing longitude axis of the source grid.
+    trg_lat : numpy.ndarray
+        The latitude values of the target points. The target grid shape is
+        based on the shape of this array.
+    trg_lon : numpy.ndarray
+        The longitude values of the target points, with the same shape as
+        trg_lat.
+    order : int, optional
+        The interpolation order. 0 is nearest neighbour and 1 is bilinear
+        interpolation. Default is 0.
+    src_index : numpy.ndarray or None, optional
+        The flat source indices for every (latitude, longitude) pair of the
+        source axes. This could be used to map the weights to the original
+        order of an unsorted source grid. If this is None, the source data is
+        assumed to be ordered like the axes. Default is None.
+
+    Returns
+    -------
+    weights : RemapWeights
+        The calculated remapping weights.
+    """
+    src_lat = np.asarray(src_lat)
+    src_lon = np.asarray(src_lon)
+    trg_lat = np.asarray(trg_lat)
+    trg_lon = np.asarray(trg_lon)
+    src_shape = (len(src_lat), len(src_lon))
+    if src_index is None:
+        src_index = np.arange(np.prod(src_shape)).reshape(src_shape)
+    lat_coords = _fractional_index(src_lat, trg_lat).ravel()
+    lon_coords = _fractional_index(src_lon, trg_lon).ravel()
+    if order == 0:
+        lat_ind = np.around(lat_coords).astype(np.int32)
+        lon_ind = np.around(lon_coords).astype(np.int32)
+        indices = src_index[lat_ind, lon_ind][:, None]
+        weights = np.ones(indices.shape)
+    elif order == 1:
+        lat_ind = lat_coords.astype(np.int32)
+        lon_ind = lon_coords.astype(np.int32)
+        lat_ind_1 = np.clip(lat_ind+1, 0, src_shape[0]-1)
+        lon_ind_1 = np.clip(lon_ind+1, 0, src_shape[1]-1)
+        del_lat = lat_coords-lat_ind.astype(np.float32)
+        del_lon = lon_coords-lon_ind.astype(np.float32)
+        indices = np.stack((
+            src_index[lat_ind, lon_ind],
+            src_index[lat_ind_1, lon_ind_1],
+            src_index[lat_ind, lon_ind_1],
+            src_index[lat_ind_1, lon_ind],
+        ), axis=-1)
+        weights = np.stack((
+            (1.-del_lat)*(1.-del_lon),
+            del_lat*del_lon,
+            (1.-del_lat)*del_lon,
+            del_lat*(1.-del_lon),
+        ), axis=-1)
+    else:
+        raise ValueError('The interpolation order has to be 0 (nearest '
+                         'neighbour) or 1 (bilinear)!')
+    return RemapWeights(indices, weights, src_index.shape, trg_lat.shape)
+
+
+def delaunay_weights(triangulation, trg_lat, trg_lon, src_shape):
+    """
+    Calculate linear remapping weights based on a Delaunay triangulation of
+    the source points. The weights are the barycentric coordinates of the
+    target points within their enclosing triangles, which is the same as the
+    linear method of scipy.interpolate.griddata.
+
+    Parameters
+    ----------
+    triangulation : scipy.spatial.Delaunay
+        The triangulation of the flattened source points in the
+        (latitude, longitude) plane.
+    trg_lat : numpy.ndarray
+        The latitude values of the target points. The target grid shape is
+        based on the shape of this array.
+    trg_lon : numpy.ndarray
+        The longitude values of the target points, with the same shape as
+        trg_lat.
+    src_shape : tuple(int)
+        The shape of the source grid dimensions.
+
+    Returns
+    -------
+    weights : RemapWeights
+        The calculated remapping weights. Target points outside of the convex
+        hull of the source points get NaN as weights.
+    """
+    trg_lat = np.asarray(trg_lat)
+    trg_points = np.column_stack((trg_lat.ravel(), np.ravel(trg_lon)))
+    simplex = triangulation.find_simplex(trg_points)
+    outside = simplex < 0
+    indices = triangulation.simplices[simplex]
+    transform = triangulation.transform[simplex]
+    bary = np.einsum('nij,nj->ni', transform[:, :2],
+                     trg_points-transform[:, 2])
+    weights = np.column_stack((bary, 1.-bary.sum(axis=1)))
+    indices[outside] = 0
+    weights[outside] = np.nan
+    return RemapWeights(indices, weights, src_shape, trg_lat.shape)
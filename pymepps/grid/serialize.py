@@ -0,0 +1,213 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 17.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# System modules
+import logging
+
+# External modules
+import numpy as np
+import xarray as xr
+
+# Internal modules
+from .builder import GridBuilder
+
+
+logger = logging.getLogger(__name__)
+
+
+GRID_PREFIX = 'ppgrid_'
+
+# Name of unnamed xarray.DataArray instances within a netcdf file
+DATAARRAY_NAME = '__xarray_dataarray_variable__'
+
+
+def encode_grid(grid, compress=True):
+    """
+    Encode the grid description of a grid into attributes and variables. Grid
+    description entries with more than one value, like the coordinate values
+    of curvilinear and unstructured grids, are stored as own variables, while
+    scalar entries are stored as attributes.
+
+    Parameters
+    ----------
+    grid : child instance of Grid
+        The grid which should be encoded.
+    compress : bool, optional
+        If the variables should be compressed with zlib if they are written
+        to a netcdf file. Default is True.
+
+    Returns
+    -------
+    grid_attrs : dict(str, str or float)
+        The scalar grid description entries with prefixed keys.
+    grid_vars : dict(str, xarray.Variable)
+        The array-like grid description entries with prefixed names. Every
+        variable has its own dimension.
+    """
+    grid_attrs = {}
+    grid_vars = {}
+    for key, value in grid._grid_dict.items():
+        if value is None:
+            continue
+        name = '{0:s}{1:s}'.format(GRID_PREFIX, key)
+        if isinstance(value, (np.ndarray, list, tuple)):
+            encoding = {'zlib': True, 'complevel': 4} if compress else {}
+            grid_vars[name] = xr.Variable(
+                ('{0:s}_size'.format(name), ), np.asarray(value),
+                encoding=encoding)
+        else:
+            grid_attrs[name] = value
+    return grid_attrs, grid_vars
+
+
+def get_grid_dict(attrs, grid_vars=None):
+    """
+    Get the grid description from prefixed attributes and variables.
+
+    Parameters
+    ----------
+    attrs : dict
+        The attributes with the prefixed scalar grid description entries.
+        Attributes without prefix are skipped. For backward compatibility,
+        array-like attributes are also used.
+    grid_vars : dict(str, array_like) or None, optional
+        The variables with the prefixed array-like grid description entries.
+        Variables without prefix are skipped. Default is None.
+
+    Returns
+    -------
+    grid_dict : dict
+        The grid description as dict without prefixes.
+    """
+    len_prefix = len(GRID_PREFIX)
+    grid_dict = {key[len_prefix:]: value for key, value in attrs.items()
+                 if key.startswith(GRID_PREFIX)}
+    if grid_vars is not None:
+        for name in grid_vars:
+            if name.startswith(GRID_PREFIX):
+                grid_dict[name[len_prefix:]] = np.asarray(grid_vars[name])
+    return grid_dict
+
+
+def decode_grid(attrs, grid_vars=None):
+    """
+    Decode and build a grid from prefixed attributes and variables.
+
+    Parameters
+    ----------
+    attrs : dict
+        The attributes with the prefixed scalar grid description entries.
+    grid_vars : dict(str, array_like) or None, optional
+        The variables with the prefixed array-like grid description entries.
+        Default is None.
+
+    Returns
+    -------
+    grid : child instance of Grid
+        The decoded and interned grid.
+
+    Raises
+    ------
+    KeyError
+        If no valid grid description could be found.
+    ValueError
+        If the grid type is not available.
+    """
+    grid_dict = get_grid_dict(attrs, grid_vars)
+    return GridBuilder(grid_dict).build_grid(intern=True)
+
+
+def grid_to_dataset(data_array, grid, compress=True):
+    """
+    Combine a data array and its grid into a dataset, which can be saved as
+    netcdf file. The scalar grid entries are stored as attributes of the data
+    variable, while the array-like entries are stored as own variables.
+
+    Parameters
+    ----------
+    data_array : xarray.DataArray
+        The data array which should be combined with the grid.
+    grid : child instance of Grid
+        The grid of the data array.
+    compress : bool, optional
+        If the grid variables should be compressed. Default is True.
+
+    Returns
+    -------
+    dataset : xarray.Dataset
+        The combined dataset.
+    """
+    grid_attrs, grid_vars = encode_grid(grid, compress=compress)
+    name = DATAARRAY_NAME if data_array.name is None else data_array.name
+    dataset = data_array.to_dataset(name=name)
+    dataset[name].attrs.update(grid_attrs)
+    for var_name, variable in grid_vars.items():
+        dataset[var_name] = variable
+    return dataset
+
+
+def dataset_to_grid(dataset):
+    """
+    Split a dataset, which was created by `grid_to_dataset`, into its data
+    array and the grid.
+
+    Parameters
+    ----------
+    dataset : xarray.Dataset
+        The dataset with one data variable and the grid.
+
+    Returns
+    -------
+    data_array : xarray.DataArray
+        The data array without grid attributes and with the original name.
+    grid : child instance of Grid or None
+        The decoded grid. If no grid could be decoded, this is None.
+
+    Raises
+    ------
+    ValueError
+        If the dataset has not exactly one data variable besides the grid
+        variables.
+    """
+    data_names = [name for name in dataset.data_vars
+                  if not name.startswith(GRID_PREFIX)]
+    if len(data_names) != 1:
+        raise ValueError('The given dataset needs exactly one data variable '
+                         'besides the grid variables, found: {0}'.format(
+                             data_names))
+    data_array = dataset[data_names[0]]
+    grid_vars = {name: dataset[name] for name in dataset.data_vars
+                 if name.startswith(GRID_PREFIX)}
+    try:
+        grid = decode_grid(data_array.attrs, grid_vars)
+    except (KeyError, ValueError) as e:
+        logger.debug('Couldn\'t decode the grid, due to {0}'.format(e))
+        grid = None
+    else:
+        data_array.attrs = {key: value for key, value in data_array.attrs.items()
+                            if not key.startswith(GRID_PREFIX)}
+    if data_array.name == DATAARRAY_NAME:
+        data_array.name = None
+    return data_array, grid
@@ -30,7 +30,7 @@
 import numpy as np
 
 # Internal modules
-from .lonlat import Grid
+from .grid import Grid, cached_coords, grid_dict_to_arrays
 
 
 logger = logging.getLogger(__name__)
@@ -55,7 +55,7 @@ def __init__(self, grid_dict):
             'yunits': 'degrees',
         }
         self.__nr_coords = 1
-        self._grid_dict.update(grid_dict)
+        self._grid_dict.update(grid_dict_to_arrays(grid_dict))
 
     @property
     def len_coords(self):
@@ -69,6 +69,7 @@ def len_coords(self):
         """
         return self.__nr_coords
 
+    @cached_coords
     def _construct_dim(self):
         constructed_dim = np.arange(0, self._grid_dict['gridsize'], 1)
         return constructed_dim
@@ -85,9 +86,10 @@ def get_coord_names(self):
         """
         return ['ncells',]
 
+    @cached_coords
     def _calc_lat_lon(self):
-        return np.array(self._grid_dict['yvals']),\
-               np.array(self._grid_dict['xvals'])
+        return np.asarray(self._grid_dict['yvals']),\
+               np.asarray(self._grid_dict['xvals'])
 
     def lonlatbox(self, data, ll_box):
         """
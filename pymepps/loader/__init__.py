@@ -1,4 +1,5 @@
 from .model import open_model_dataset
 from .station import open_station_dataset
+from .index import VariableIndex
 
-__all__ = ['open_model_dataset', 'open_station_dataset']
+__all__ = ['open_model_dataset', 'open_station_dataset', 'VariableIndex']
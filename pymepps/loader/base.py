@@ -27,6 +27,7 @@
 import logging
 import glob
 import os
+import re
 from functools import partial
 from collections import Counter
 
@@ -39,12 +40,87 @@
 logger = logging.getLogger(__name__)
 
 
+NC_SIGNATURES = (b'CDF\x01', b'CDF\x02', b'CDF\x05')
+HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+HDF5_OFFSETS = (0, 512, 1024, 2048)
+# Optional start of heading, sequence number and abbreviated heading
+# (TTAAii CCCC [YYGGgg] [BBB]) of a WMO bulletin
+WMO_HEADING = re.compile(
+    br'\x01?[\r\n]*(?:\d{3,5}[\r\n]+)?'
+    br'[A-Z]{4}\d{2} [A-Z]{4}(?: \d{6})?(?: [A-Z]{3})?[\r\n]+')
+
+
+def _grib_edition(head):
+    """
+    Get the edition of the GRIB indicator section at the beginning of given
+    bytes. The edition is only returned if the section has a valid message
+    length.
+    """
+    if not head.startswith(b'GRIB') or len(head) < 8:
+        return None
+    edition = head[7]
+    if edition == 1:
+        msg_length = int.from_bytes(head[4:7], 'big')
+        min_length = 8
+    elif edition == 2 and len(head) >= 16:
+        msg_length = int.from_bytes(head[8:16], 'big')
+        min_length = 16
+    else:
+        return None
+    if msg_length <= min_length:
+        return None
+    return edition
+
+
+def sniff_file_type(file_path, n_bytes=4096):
+    """
+    Determine the file type of a given file based on the first bytes of the
+    file. netCDF files are recognized by the classic or HDF5 signature, GRIB
+    files by their indicator section at the beginning of the file or directly
+    after a WMO bulletin heading and Wettermast text files by their header.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file.
+    n_bytes : int, optional
+        The number of bytes, which are read from the beginning of the file.
+        Default is 4096.
+
+    Returns
+    -------
+    file_type : str or None
+        The determined file type, either grib1, grib2, nc or wm. If the file
+        type could not be determined or the file could not be read, None is
+        returned.
+    """
+    try:
+        with open(file_path, 'rb') as opened_file:
+            head = opened_file.read(n_bytes)
+    except (OSError, TypeError, ValueError):
+        return None
+    if head.startswith(NC_SIGNATURES) or any(
+            head[offset:offset+8] == HDF5_SIGNATURE for offset in HDF5_OFFSETS):
+        return 'nc'
+    heading = WMO_HEADING.match(head)
+    grib_start = heading.end() if heading is not None else 0
+    edition = _grib_edition(head[grib_start:])
+    if edition is not None:
+        return 'grib{0:d}'.format(edition)
+    header = head.decode('UTF-8', errors='ignore').split('\n')[:7]
+    if any(line.strip()[1:].startswith('Names=') for line in header):
+        return 'wm'
+    return None
+
+
 class BaseLoader(object):
-    def __init__(self, data_path, file_type=None, processes=1, checking=True):
+    def __init__(self, data_path, file_type=None, processes=1, checking=True,
+                 index=None):
         self.data_path = data_path
         self.file_type = file_type
         self.processes = processes
         self.checking = checking
+        self.index = index
         self._available_file_type = {}
 
     @staticmethod
@@ -76,7 +152,76 @@ def _get_file_handlers(self, files):
             file_handlers = self._determine_file_handler(files)
         return file_handlers
 
+    @staticmethod
+    def _sniff_file(file_path):
+        return file_path, sniff_file_type(file_path)
+
+    def _sniff_file_handlers(self, files):
+        """
+        Determine the file handlers based on the first bytes of the files.
+        The files are classified in parallel and grouped by their file
+        handler class. Files, whose type could not be sniffed, are checked
+        with the file handlers, if at least one file could be sniffed. Only
+        the file handlers of the majority class are created.
+        """
+        logger.info('Started file type sniffing for {0:d} files'.format(
+            len(files)))
+        mt = MultiThread(processes=self.processes)
+        sniffed_types = dict(mt.map(self._sniff_file, files, flatten=False))
+        grouped_files = {}
+        unsniffed_files = []
+        for file_path in files:
+            try:
+                handler = self._available_file_type[sniffed_types[file_path]]
+            except KeyError:
+                unsniffed_files.append(file_path)
+                continue
+            try:
+                grouped_files[handler].append(file_path)
+            except KeyError:
+                grouped_files[handler] = [file_path, ]
+        if not grouped_files:
+            return []
+        if unsniffed_files:
+            self._check_unsniffed_files(unsniffed_files, grouped_files)
+        handler = max(grouped_files, key=lambda k: len(grouped_files[k]))
+        logger.info('Sniffed {0:d} files for {1:s}'.format(
+            len(grouped_files[handler]), handler.__name__))
+        return [handler(file_path) for file_path in grouped_files[handler]]
+
+    def _check_unsniffed_files(self, files, grouped_files):
+        """
+        Check files, whose type could not be sniffed, with the is_type method
+        of every available file handler class. A file is added to the group
+        of the first file handler class, which accepts the file.
+        """
+        logger.info('Could not sniff {0:d} files, started file handler '
+                    'checking for these files'.format(len(files)))
+        handlers = []
+        for handler in self._available_file_type.values():
+            if handler not in handlers:
+                handlers.append(handler)
+        mt = MultiThread(processes=self.processes)
+        for handler in handlers:
+            if not files:
+                break
+            check_fh = partial(self._check_file_handler, base_handler=handler)
+            checked_files = {fh.file for fh in mt.map(check_fh, files)}
+            if checked_files:
+                grouped_files.setdefault(handler, []).extend(
+                    f for f in files if f in checked_files)
+            files = [f for f in files if f not in checked_files]
+        for file_path in files:
+            logger.info('Skipped {0:s}, the file type could not be '
+                        'determined'.format(file_path))
+
     def _determine_file_handler(self, files):
+        if all(isinstance(file_path, str) for file_path in files):
+            file_handlers = self._sniff_file_handlers(files)
+            if file_handlers:
+                return file_handlers
+            logger.info('Could not sniff the file types, fall back to the '
+                        'file handler checking')
         all_file_handlers = {
             type: self._get_specific_type_handlers(files, type)
             for type in self._available_file_type}
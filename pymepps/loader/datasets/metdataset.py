@@ -26,12 +26,15 @@
 import logging
 import abc
 from functools import partial
+from collections import OrderedDict
 
 # External modules
 from tqdm import tqdm
 
 # Internal modules
 from pymepps.utilities import MultiThread
+from pymepps.loader.index import VariableIndex
+from pymepps.loader.filehandler.pool import file_pool
 
 logger = logging.getLogger(__name__)
 
@@ -61,14 +64,29 @@ class MetDataset(object):
         processes is one the functions will be processed sequential. For more
         processes than one the multiprocessing module will be used.
         Default is 1.
+    index : VariableIndex, str or None, optional
+        The persistent variable index, which is used to look up the variable
+        names of the files. Only new or changed files are opened and scanned,
+        while their variable names are stored within the index afterwards. If
+        this is a str, it is used as path to the index database. If this is
+        None, every file is scanned. Default is None.
     """
-    def __init__(self, file_handlers, data_origin=None, processes=1):
+    _group_funcs = {
+        'runtime': '_get_runtime',
+        'ensemble': '_get_ensemble',
+        'validtime': '_get_validtime',
+    }
+
+    def __init__(self, file_handlers, data_origin=None, processes=1,
+                 index=None):
         self._file_handlers = None
         self._multiproc = None
         self._processes = 1
+        self._index = None
         self.data_origin = data_origin
         self.file_handlers = file_handlers
         self.processes = processes
+        self.index = index
         self.__variables = self._initialize_variables()
 
     def __repr__(self):
@@ -91,28 +109,97 @@ def processes(self, nr_proc):
         self._multiproc = MultiThread(nr_proc)
         self._processes = nr_proc
 
+    @property
+    def index(self):
+        return self._index
+
+    @index.setter
+    def index(self, new_index):
+        if isinstance(new_index, str):
+            new_index = VariableIndex(new_index)
+        elif new_index is not None and \
+                not isinstance(new_index, VariableIndex):
+            raise TypeError('The given index has to be a VariableIndex, a '
+                            'path or None!')
+        self._index = new_index
+
     @staticmethod
-    def _get_variables(file_handler):
-        file_handler.open()
-        var_names = list(file_handler.var_names)
-        file_handler.close()
-        return var_names
+    def _scan_file_handler(file_handler):
+        file_handler.acquire()
+        try:
+            var_names = list(file_handler.var_names)
+            metadata = file_handler._get_index_metadata()
+        finally:
+            file_handler.release()
+        return file_handler, var_names, metadata
+
+    def _scan_file_handlers(self, file_handlers):
+        """
+        Scan the given file handlers for their variable names. The multi
+        threaded mapping returns the results unordered, such that the scanned
+        file handler is returned together with its variable names and
+        metadata.
+        """
+        if not file_handlers:
+            return [], [], []
+        mt = MultiThread(processes=self.processes)
+        scanned = mt.map(self._scan_file_handler, file_handlers,
+                         flatten=False)
+        return [list(entries) for entries in zip(*scanned)]
+
+    def _get_file_variables(self):
+        """
+        Get the variable names for every file handler. If an index is set,
+        only the file handlers without valid index entry are scanned.
+        """
+        if self.index is None:
+            scanned_fh, var_names, _ = self._scan_file_handlers(
+                self._file_handlers)
+            return list(zip(scanned_fh, var_names))
+        indexed_names = self.index.lookup(self._file_handlers)
+        missing_fh = [fh for fh, var_names in
+                      zip(self._file_handlers, indexed_names)
+                      if var_names is None]
+        logger.info('Found {0:d} of {1:d} files within the variable '
+                    'index'.format(len(self._file_handlers)-len(missing_fh),
+                                   len(self._file_handlers)))
+        scanned_fh, var_names, metadata = self._scan_file_handlers(
+            missing_fh)
+        self.index.store(scanned_fh, var_names, metadata)
+        file_variables = [
+            (fh, names) for fh, names in zip(self._file_handlers,
+                                             indexed_names)
+            if names is not None]
+        for fh, names in file_variables:
+            fh._var_names = names
+        file_variables.extend(zip(scanned_fh, var_names))
+        return file_variables
 
     def _initialize_variables(self):
         if self._file_handlers is None:
             return {}
         new_variables = {}
-        mt = MultiThread(processes=self.processes)
-        var_names_list = mt.map(self._get_variables, self._file_handlers,
-                                flatten=False)
-        for key, var_names in enumerate(var_names_list):
+        fh_order = {id(fh): key for key, fh in enumerate(self._file_handlers)}
+        file_variables = sorted(self._get_file_variables(),
+                                key=lambda entry: fh_order[id(entry[0])])
+        for file_handler, var_names in file_variables:
             for var_name in var_names:
                 try:
-                    new_variables[var_name].append(self._file_handlers[key])
+                    new_variables[var_name].append(file_handler)
                 except KeyError:
-                    new_variables[var_name] = [self._file_handlers[key], ]
+                    new_variables[var_name] = [file_handler, ]
         return new_variables
 
+    def close(self):
+        """
+        Close all file handlers of this dataset and remove them from the
+        shared file pool. Lazily selected data, which is not computed yet,
+        reopens its files when it is read.
+        """
+        if self._file_handlers is not None:
+            for file_handler in self._file_handlers:
+                file_pool.discard(file_handler)
+
     @property
     def variables(self):
         """
@@ -226,6 +313,114 @@ def select(self, var_name, **kwargs):
         extracted_data = self.data_merge(data, var_name)
         return extracted_data
 
+    def group_file_handlers(self, var_name, by='runtime', **kwargs):
+        """
+        Group the file handlers of a variable by a coordinate. The coordinate
+        value of a file handler is inferred from the given keyword arguments
+        or from the file path, such that the files are not opened. File
+        handlers, where the value cannot be inferred, are grouped together
+        with None as value. The grouping refers only to these path-encoded
+        values, files with several coordinate values, e.g. several validtimes
+        within one file, are not split.
+
+        Parameters
+        ----------
+        var_name : str
+            The file handlers of this variable are grouped.
+        by : str, optional
+            The coordinate, which is used to group the file handlers. This can
+            be either runtime, ensemble or validtime. Default is runtime.
+        kwargs : dict
+            Additional parameters that are passed to the file handlers.
+
+        Returns
+        -------
+        grouped_handlers : OrderedDict(obj, list of FileHandler)
+            The file handlers for every coordinate value. The coordinate
+            values are sorted, while None is the last value.
+
+        Raises
+        ------
+        ValueError
+            A ValueError is raised if the variable is not available or if the
+            coordinate is not known.
+        """
+        if var_name not in self.var_names:
+            raise ValueError(
+                'The variable {0:s} is not in the available variable names '
+                'list. The possible variables are: {1:s}'.format(
+                    var_name, str(self.var_names)))
+        try:
+            get_value = self._group_funcs[by]
+        except KeyError:
+            raise ValueError(
+                'The given coordinate {0:s} is not available for grouping, '
+                'choose runtime, ensemble or validtime!'.format(by))
+        grouped_handlers = {}
+        for file_handler in self.variables[var_name]:
+            value = getattr(file_handler, get_value)(**kwargs)
+            try:
+                grouped_handlers[value].append(file_handler)
+            except KeyError:
+                grouped_handlers[value] = [file_handler, ]
+        sorted_values = sorted(grouped_handlers,
+                               key=lambda value: (value is None, value))
+        return OrderedDict((value, grouped_handlers[value])
+                           for value in sorted_values)
+
+    def iter_select(self, var_name, by='runtime', **kwargs):
+        """
+        Select a variable from this dataset piece by piece. The file handlers
+        are grouped by the given coordinate, see also `group_file_handlers`.
+        The data of a group is loaded and merged not until the next chunk is
+        requested, such that long archives could be processed in a streaming
+        pipeline, where only a single chunk is held in memory. The chunks are
+        based on the path-encoded coordinate values, if the merged data of a
+        chunk has more than one value of the coordinate, a warning is logged.
+
+        Parameters
+        ----------
+        var_name : str
+            The variable which should be extracted.
+        by : str, optional
+            The coordinate, which is used to group the file handlers. This can
+            be either runtime, ensemble or validtime. Default is runtime.
+        kwargs : dict
+            Additional parameters that are passed to the file handlers.
+
+        Yields
+        ------
+        value : obj
+            The coordinate value of this chunk. If the value could not be
+            inferred for the file handlers, this is None.
+        extracted_data : SpatialData or TSData
+            The merged data of the file handlers with this coordinate value.
+        """
+        grouped_handlers = self.group_file_handlers(var_name, by=by,
+                                                    **kwargs)
+        logger.info('Started iterative select {0:s} from {1:d} groups'.format(
+            var_name, len(grouped_handlers)))
+        single_func = partial(self._get_file_data, var_name=var_name, **kwargs)
+        for value, file_handlers in grouped_handlers.items():
+            data = self._multiproc.map(single_func, file_handlers,
+                                       flatten=True)
+            merged_data = self.data_merge(data, var_name)
+            n_values = self._get_coord_size(merged_data, by)
+            if n_values > 1:
+                logger.warning(
+                    'The chunk for {0:s}={1} has {2:d} different {0:s} values, '
+                    'the chunks are only based on the {0:s} values within the '
+                    'file paths or keyword arguments'.format(
+                        by, value, n_values))
+            yield value, merged_data
+
+    @staticmethod
+    def _get_coord_size(data, coord):
+        try:
+            return data.coords[coord].size
+        except (AttributeError, KeyError, TypeError):
+            return 1
+
     def select_ds(self, include=None, exclude=None, **kwargs):
         """
         Extract the dataset data into a MetData instance. The include list is
@@ -28,9 +28,13 @@
 import getpass
 import datetime as dt
 
+# External modules
+import numpy as np
+
 # Internal modules
 import pymepps
 from pymepps.grid import GridBuilder
+from pymepps.grid.serialize import GRID_PREFIX, decode_grid
 import pymepps.utilities.cdo_funcs as cdo
 from .metdataset import MetDataset
 
@@ -71,6 +75,16 @@ class SpatialDataset(MetDataset):
         processes is one the functions will be processed sequential. For more
         processes than one the multiprocessing module will be used.
         Default is 1.
+    lazy : bool, optional
+        If the selected variables should be backed by dask arrays. The file
+        handlers return only the coordinates and the data is read from the
+        files, when the values are needed. The files are reopened if they
+        were closed in the meantime. File handlers without lazy support, like
+        GribHandler, return loaded data. Default is False.
+    index : VariableIndex, str or None, optional
+        The persistent variable index, which is used to look up the variable
+        names of the files. Only new or changed files are scanned. If this is
+        a str, it is used as path to the index database. Default is None.
 
     Methods
     -------
@@ -81,15 +95,19 @@ class SpatialDataset(MetDataset):
     sellonlatbox
         Method to slice a box with the given coordinates.
     """
-    def __init__(self, file_handlers, grid=None, data_origin=None, processes=1):
-        super().__init__(file_handlers, data_origin, processes)
+    def __init__(self, file_handlers, grid=None, data_origin=None, processes=1,
+                 lazy=False, index=None):
+        super().__init__(file_handlers, data_origin, processes, index=index)
         self.grid = grid
+        self.lazy = lazy
 
     def get_grid(self, var_name, data_array=None):
         """
-        Method to get for given variable name a Grid instance. If the grid
-        attribute is already a Grid instance this grid will be returned. If the 
-        grid attribute is a str instance, the str will be read from file or from
+        Method to get for given variable name a Grid instance. If a grid is
+        stored within the first corresponding file handler, this grid is
+        decoded once per file handler and returned. Else if the grid attribute
+        is already a Grid instance this grid will be returned. If the grid
+        attribute is a str instance, the str will be read from file or from
         the given grid str. If the grid attribute isn't set the grid instance
         will be the grid for the variable selected with the first corresponding
         file handler and cdo.
@@ -109,7 +127,9 @@ def get_grid(self, var_name, data_array=None):
             The returned grid. If the returned grid is None, the grid could not
             be read.
         """
-        grid = self._get_grid_from_dataarray(data_array)
+        grid = self._get_grid_from_file(var_name)
+        if grid is None:
+            grid = self._get_grid_from_dataarray(data_array)
         if grid is None:
             if isinstance(self.grid, str):
                 grid = self._get_grid_from_str(self.grid)
@@ -119,14 +139,24 @@ def get_grid(self, var_name, data_array=None):
                 grid = self._get_grid_from_cdo(var_name)
         return grid
 
+    def _get_grid_from_file(self, var_name):
+        try:
+            file_handler = self.variables[var_name][0]
+        except (KeyError, IndexError, TypeError):
+            return None
+        file_handler.acquire()
+        try:
+            grid = file_handler.get_grid(var_name)
+        finally:
+            file_handler.release()
+        if grid is not None:
+            logger.info('Got the grid from the file')
+        return grid
+
     @staticmethod
     def _get_grid_from_dataarray(data_array):
         try:
-            grid_attrs = {attr[7:]: data_array.attrs[attr]
-                          for attr in data_array.attrs
-                          if attr[:7] == 'ppgrid_'}
-            grid_builder = GridBuilder(grid_attrs)
-            grid = grid_builder.build_grid()
+            grid = decode_grid(data_array.attrs)
             logger.info('Got the grid from the data array')
         except (KeyError, ValueError, AttributeError):
             grid = None
@@ -153,17 +183,18 @@ def _get_grid_from_str(self, grid_str):
             read_str = grid_str
         try:
             grid_builder = GridBuilder(read_str)
-            grid = grid_builder.build_grid()
+            grid = grid_builder.build_grid(intern=True)
         except (KeyError, ValueError):
             grid = None
         return grid
 
     def _get_file_data(self, file, var_name, **kwargs):
-        file.open()
+        kwargs.setdefault('lazy', self.lazy)
+        file.acquire()
         try:
             data = file.get_messages(var_name, **kwargs)
         finally:
-            file.close()
+            file.release()
         return data
 
     def _multi_select_var(self, data, var_name):
@@ -173,6 +204,23 @@ def _multi_select_var(self, data, var_name):
                 variable=[var_name, ])
             yield add_coordinate
 
+    @staticmethod
+    def _merge_items(merged_array, items):
+        """
+        Merge the given items into the given DataArray. Loaded data is
+        assembled into a preallocated array, while dask-backed data and
+        items, which cannot be assembled, are merged with the update routine.
+        """
+        all_loaded = isinstance(merged_array.data, np.ndarray) and all(
+            isinstance(item.data, np.ndarray) for item in items)
+        if all_loaded:
+            try:
+                return merged_array.pp.assemble(*items)
+            except (ValueError, TypeError) as e:
+                logger.debug('Could not assemble the data, fall back to '
+                             'update: {0}'.format(e))
+        return merged_array.pp.update(*items)
+
     def data_merge(self, data, var_name):
         """
         Method to merge instances of xarray.DataArray into a single
@@ -198,10 +246,10 @@ def data_merge(self, data, var_name):
         #merged_array = merged_array.pp.set_grid(grid)
         if len(data) > 1:
             logger.debug('Number of data items: {0:d}'.format(len(data)))
-            merged_array = merged_array.pp.update(*data[1:])
+            merged_array = self._merge_items(merged_array, data[1:])
         loaded_attrs = {attr: merged_array.attrs[attr]
                         for attr in merged_array.attrs
-                        if not attr.startswith('ppgrid_')}
+                        if not attr.startswith(GRID_PREFIX)}
         loaded_attrs['name'] = merged_array._name = var_name
         merged_array.attrs = loaded_attrs
         merged_array = merged_array.pp.set_grid(grid)
@@ -59,6 +59,10 @@ class TSDataset(MetDataset):
         The coordinates (longitude, latitude) where the data is valid. If 
         this is None the coordinates will be set based on data_origin or 
         based on the first file handler.
+    index : VariableIndex, str or None, optional
+        The persistent variable index, which is used to look up the variable
+        names of the files. Only new or changed files are scanned. If this is
+        a str, it is used as path to the index database. Default is None.
 
     Methods
     -------
@@ -66,8 +70,8 @@ class TSDataset(MetDataset):
         Method to select a variable.
     """
     def __init__(self, file_handlers, data_origin=None, lonlat=None,
-                 processes=1):
-        super().__init__(file_handlers, data_origin, processes)
+                 processes=1, index=None):
+        super().__init__(file_handlers, data_origin, processes, index=index)
         self.lon_lat = lonlat
 
     def __str__(self):
@@ -90,11 +94,11 @@ def _get_lon_lat(self):
                 return None
 
     def _get_file_data(self, file, var_name, **kwargs):
-        file.open()
+        file.acquire()
         try:
             ts_data = file.get_timeseries(var_name, **kwargs)
         finally:
-            file.close()
+            file.release()
         return ts_data
 
     def _multi_select_var(self, data, var_name):
@@ -35,12 +35,15 @@
 import xarray as xr
 
 # Internal modules
+from .pool import file_pool
 
 
 logger = logging.getLogger(__name__)
 
 
 class FileHandler(object):
+    supports_lazy = False
+
     def __init__(self, file_path):
         """
         Base class for files with meteorological content. A FileHandler could
@@ -55,6 +58,7 @@ def __init__(self, file_path):
         self.ds = None
         self.file = file_path
         self._var_names = None
+        self._grids = {}
 
     @property
     def var_names(self):
@@ -62,6 +66,44 @@ def var_names(self):
             self._var_names = self._get_varnames()
         return self._var_names
 
+    def get_grid(self, var_name):
+        """
+        Get the grid of a variable, which is stored within the file. The file
+        handler has to be opened.
+
+        Parameters
+        ----------
+        var_name : str
+            The grid of this variable is returned.
+
+        Returns
+        -------
+        grid : child instance of Grid or None
+            The grid stored within the file. If the file has no stored grid,
+            None is returned.
+        """
+        return None
+
+    def acquire(self):
+        """
+        Open this file handler with the shared file pool. The opened file is
+        reused by following acquisitions and it is not closed by the pool
+        until this file handler is released.
+
+        Returns
+        -------
+        self : FileHandler
+            The opened file handler.
+        """
+        return file_pool.acquire(self)
+
+    def release(self):
+        """
+        Release this file handler to the shared file pool. The file stays
+        opened, until it is closed as least recently used file of the pool.
+        """
+        file_pool.release(self)
+
     @abc.abstractmethod
     def get_messages(self, var_name, **kwargs):
         pass
@@ -77,6 +119,13 @@ def _get_varnames(self):
     def _get_metadata(self):
         pass
 
+    def _get_index_metadata(self):
+        """
+        Get basic JSON-serializable metadata of the opened file, which is
+        stored together with the variable names within a VariableIndex.
+        """
+        return {}
+
     @staticmethod
     def _check_list_in_list(sublist, check_list):
         in_list = False
@@ -67,6 +67,9 @@ def is_type(self):
         return return_value
 
     def _get_varnames(self):
+        # An opened file could be reused from the file pool, such that the
+        # file has to be rewound before its messages are iterated.
+        self.ds.seek(0)
         var_names = [msg['shortName'] for msg in self.ds]
         return set(var_names)
 
@@ -87,6 +90,7 @@ def get_messages(self, var_name, **kwargs):
             have six coordinates (analysis, ensemble, time, level, y, x).
             The shape of DataArray are normally (1,1,1,1,y_size,x_size).
         """
+        self.ds.seek(0)
         msgs = self.ds.select(shortName=var_name)
         logger.debug('Selected {0:s} from file {1:s}'.format(var_name,
                                                              self.file))
@@ -113,13 +117,13 @@ def get_messages(self, var_name, **kwargs):
                 coords=grid_coords,
                 dims=dims
             )
-            ana_date = msg.analDate,
+            ana_date = msg.analDate
             try:
-                ens = [msg['perturbationNumber'], ]
+                ens = msg['perturbationNumber']
             except RuntimeError:
-                ens = ['det', ]
+                ens = 'det'
             valid_date = msg.validDate
-            level = [":".join(str(msg).split(':')[4:6]).replace(' ', '_'), ]
+            level = ":".join(str(msg).split(':')[4:6]).replace(' ', '_')
             normalized_array = constructed_array.pp.normalize_coords(
                 height=level,
                 validtime=valid_date,
@@ -31,6 +31,7 @@
 
 # Internal modules
 from .filehandler import FileHandler
+from pymepps.grid.serialize import GRID_PREFIX, decode_grid
 
 
 logger = logging.getLogger(__name__)
@@ -54,10 +55,60 @@ def cube_to_series(cube, var_name):
 
 
 class NetCDFHandler(FileHandler):
+    supports_lazy = True
+
     def _get_varnames(self):
-        var_names = list(self.ds.data_vars)
+        var_names = [name for name in self.ds.data_vars
+                     if not name.startswith(GRID_PREFIX)]
         return var_names
 
+    def _get_index_metadata(self):
+        metadata = {
+            name: {'dims': list(self.ds[name].dims),
+                   'shape': list(self.ds[name].shape)}
+            for name in self.var_names
+        }
+        return metadata
+
+    def _get_grid_vars(self):
+        """
+        Get the grid variables, which were saved together with a DataArray,
+        as dict of numpy arrays.
+        """
+        grid_vars = {name: self.ds[name].values for name in self.ds.data_vars
+                     if name.startswith(GRID_PREFIX)}
+        return grid_vars
+
+    def get_grid(self, var_name):
+        """
+        Get the grid, which was saved together with a variable. The grid is
+        decoded from the prefixed attributes and grid variables once and
+        cached for this file handler. The file handler has to be opened.
+
+        Parameters
+        ----------
+        var_name : str
+            The grid of this variable is returned.
+
+        Returns
+        -------
+        grid : child instance of Grid or None
+            The decoded grid. If no valid grid description is stored within
+            the file, None is returned.
+        """
+        try:
+            return self._grids[var_name]
+        except KeyError:
+            pass
+        attrs = dict(self.ds.attrs)
+        attrs.update(self.ds[var_name].attrs)
+        try:
+            grid = decode_grid(attrs, self._get_grid_vars())
+        except (KeyError, ValueError):
+            grid = None
+        self._grids[var_name] = grid
+        return grid
+
     def is_type(self):
         try:
             self.open()
@@ -68,7 +119,8 @@ def is_type(self):
 
     def open(self):
         if self.ds is None:
-            self.ds = xr.open_dataset(self.file, engine='netcdf4')
+            self.ds = xr.open_dataset(self.file, engine='netcdf4',
+                                      cache=False)
         return self
 
     def close(self):
@@ -93,7 +145,7 @@ def lon_lat(self):
             pass
         return attrs
 
-    def load_cube(self, var_name):
+    def load_cube(self, var_name, lazy=False):
         """
         Method to load a variable from the netcdf file and return it as
         xr.DataArray.
@@ -102,6 +154,10 @@ def load_cube(self, var_name):
         ----------
         var_name : str
             The variable name, which should be extracted.
+        lazy : bool, optional
+            If the variable should be returned as dask-backed DataArray. The
+            missing values are then masked lazily and the data is read from
+            the file not until the values are needed. Default is False.
 
         Returns
         -------
@@ -110,11 +166,18 @@ def load_cube(self, var_name):
         """
         variable = self.ds[var_name]
         if hasattr(variable, '_FillValue'):
-            variable.values[variable.values == variable._FillValue] = np.nan
+            fill_value = variable._FillValue
         elif hasattr(variable, 'missing_value'):
-            variable.values[variable.values == variable.missing_value] = np.nan
+            fill_value = variable.missing_value
+        else:
+            fill_value = 9.96921e+36
+        if lazy:
+            variable = variable.chunk()
+            variable = variable.where(variable != fill_value)
         else:
-            variable.values[variable.values==9.96921e+36] = np.nan
+            values = variable.values
+            values[values == fill_value] = np.nan
+            variable = variable.copy(data=values)
         return variable
 
     def get_timeseries(self, var_name, **kwargs):
@@ -158,6 +221,11 @@ def get_messages(self, var_name, **kwargs):
             by large opendap requests. These slice will be used from the behind.
             So (slice(1,2,1), slice(3,5,1)) means [..., 1:2, 3:5]. If it is not
             set all data is used. T
+        lazy : bool, optional
+            If the message should be returned as dask-backed DataArray. Only
+            the coordinates are loaded and normalized, while the values are
+            read from the file when they are needed. The file has to stay
+            opened until the values are computed. Default is False.
 
         Returns
         -------
@@ -166,11 +234,13 @@ def get_messages(self, var_name, **kwargs):
             have six coordinates (analysis, ensemble, time, level, y, x).
             The shape of DataArray are normally (1,1,1,1,y_size,x_size).
         """
-        cube = self.load_cube(var_name)
+        lazy = kwargs.get('lazy', False)
+        cube = self.load_cube(var_name, lazy=lazy)
         if 'sliced_coords' in kwargs:
             cube = cube[(...,)+kwargs['sliced_coords']]
         cube.attrs.update(self.ds.attrs)
-        cube = cube.load()
+        if not lazy:
+            cube = cube.load()
         cube = cube.pp.normalize_coords(
             runtime=self._get_runtime(**kwargs),
             ensemble=self._get_ensemble(**kwargs),
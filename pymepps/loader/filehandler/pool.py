@@ -0,0 +1,182 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 17.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import logging
+import threading
+from collections import OrderedDict
+
+# External modules
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+
+def _default_maxsize():
+    """
+    The default number of pooled files, a quarter of the soft limit of open
+    files, but at most 128.
+    """
+    try:
+        soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    except (AttributeError, ValueError, OSError):
+        return 128
+    if soft_limit < 0:
+        return 128
+    return max(1, min(128, soft_limit//4))
+
+
+class _PoolEntry(object):
+    def __init__(self):
+        self.references = 0
+        self.lock = threading.Lock()
+
+
+class FilePool(object):
+    """
+    A thread-safe least recently used pool of opened file handlers. Acquired
+    file handlers are opened once and stay opened after they are released,
+    such that following acquisitions reuse the opened file. If more than
+    maxsize file handlers are opened, the least recently used file handlers,
+    which are not acquired, are closed.
+
+    Parameters
+    ----------
+    maxsize : int or None, optional
+        The maximum number of opened file handlers, which are not acquired.
+        If this is None, a quarter of the open file limit, but at most 128,
+        is used. Default is None.
+    """
+    def __init__(self, maxsize=None):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if maxsize is None:
+            maxsize = _default_maxsize()
+        self.maxsize = maxsize
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, file_handler):
+        return file_handler in self._entries
+
+    def _evict(self):
+        """
+        Close the least recently used file handlers, which are not acquired,
+        until the pool is within its size. This needs to be called with the
+        pool lock.
+        """
+        n_evict = len(self._entries)-self.maxsize
+        if n_evict <= 0:
+            return
+        evict_handlers = [fh for fh, entry in self._entries.items()
+                          if not entry.references][:n_evict]
+        for file_handler in evict_handlers:
+            del self._entries[file_handler]
+            file_handler.close()
+            logger.debug('Closed {0} within the file pool'.format(
+                file_handler.file))
+
+    def acquire(self, file_handler):
+        """
+        Acquire a given file handler. The file handler is opened if it is not
+        opened yet and it is not closed by the pool until it is released.
+
+        Parameters
+        ----------
+        file_handler : child instance of FileHandler
+            This file handler is acquired.
+
+        Returns
+        -------
+        file_handler : child instance of FileHandler
+            The opened file handler.
+        """
+        with self._lock:
+            try:
+                entry = self._entries[file_handler]
+            except KeyError:
+                entry = self._entries[file_handler] = _PoolEntry()
+            self._entries.move_to_end(file_handler)
+            entry.references += 1
+        try:
+            with entry.lock:
+                file_handler.open()
+        except Exception:
+            self.release(file_handler)
+            raise
+        with self._lock:
+            self._evict()
+        return file_handler
+
+    def release(self, file_handler):
+        """
+        Release a given file handler. The file handler stays opened until it
+        is removed as least recently used file handler.
+
+        Parameters
+        ----------
+        file_handler : child instance of FileHandler
+            This file handler is released.
+        """
+        with self._lock:
+            try:
+                entry = self._entries[file_handler]
+            except KeyError:
+                return
+            entry.references = max(0, entry.references-1)
+            self._evict()
+
+    def discard(self, file_handler):
+        """
+        Close a given file handler and remove it from the pool, also if it is
+        still acquired.
+
+        Parameters
+        ----------
+        file_handler : child instance of FileHandler
+            This file handler is closed and removed.
+        """
+        with self._lock:
+            self._entries.pop(file_handler, None)
+            file_handler.close()
+
+    def close_all(self):
+        """
+        Close all file handlers within this pool, also those that are still
+        acquired.
+        """
+        with self._lock:
+            for file_handler in self._entries:
+                file_handler.close()
+            self._entries.clear()
+
+
+file_pool = FilePool()
@@ -0,0 +1,206 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+#
+#Created on 17.10.26
+#
+#Created for pymepps
+#
+#@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#    Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# System modules
+import logging
+import os
+import json
+import sqlite3
+import threading
+from contextlib import closing
+
+# External modules
+
+# Internal modules
+
+
+logger = logging.getLogger(__name__)
+
+
+class VariableIndex(object):
+    """
+    A persistent on-disk index of the variables within files. The index is
+    a SQLite database, where the variable names and basic metadata of every
+    file are stored. The entries are keyed by the absolute path, the size and
+    the modification time of the file and the file handler type. If a file is
+    changed, the old entry is invalid and the file has to be scanned again.
+
+    Parameters
+    ----------
+    index_path : str
+        The path to the SQLite database. If the database doesn't exist, it is
+        created.
+    """
+    _schema = 'CREATE TABLE IF NOT EXISTS files (' \
+              'path TEXT NOT NULL, handler TEXT NOT NULL, ' \
+              'size INTEGER NOT NULL, mtime INTEGER NOT NULL, ' \
+              'var_names TEXT NOT NULL, metadata TEXT NOT NULL, ' \
+              'PRIMARY KEY (path, handler))'
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute(self._schema)
+
+    def __repr__(self):
+        return '{0:s}({1:s})'.format(self.__class__.__name__,
+                                     repr(self.index_path))
+
+    def __len__(self):
+        with self._lock, closing(self._connect()) as connection:
+            return connection.execute(
+                'SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def _connect(self):
+        return sqlite3.connect(self.index_path, timeout=60)
+
+    @staticmethod
+    def file_key(file_handler):
+        """
+        Get the index key for a given file handler.
+
+        Parameters
+        ----------
+        file_handler : child instance of FileHandler
+            The key is determined for the file of this file handler.
+
+        Returns
+        -------
+        key : tuple(str, str, int, int) or None
+            The absolute path, the name of the file handler class, the size in
+            bytes and the modification time in nanoseconds of the file. If the
+            file is not a local file, e.g. an opendap url or an opened file,
+            None is returned.
+        """
+        if not isinstance(file_handler.file, str):
+            return None
+        try:
+            stat = os.stat(file_handler.file)
+        except (OSError, ValueError):
+            return None
+        return (os.path.abspath(file_handler.file),
+                file_handler.__class__.__name__, stat.st_size,
+                stat.st_mtime_ns)
+
+    def lookup(self, file_handlers):
+        """
+        Look up the indexed variable names for given file handlers.
+
+        Parameters
+        ----------
+        file_handlers : list of child instances of FileHandler
+            The variable names are looked up for these file handlers.
+
+        Returns
+        -------
+        var_names : list(list(str) or None)
+            The indexed variable names for every file handler. If the file is
+            not indexed or the file was changed since indexing, the entry is
+            None.
+        """
+        keys = [self.file_key(fh) for fh in file_handlers]
+        var_names = []
+        with self._lock, closing(self._connect()) as connection:
+            for key in keys:
+                row = None
+                if key is not None:
+                    row = connection.execute(
+                        'SELECT var_names FROM files WHERE path=? AND '
+                        'handler=? AND size=? AND mtime=?', key).fetchone()
+                if row is None:
+                    var_names.append(None)
+                else:
+                    var_names.append(json.loads(row[0]))
+        return var_names
+
+    def get_metadata(self, file_handler):
+        """
+        Get the indexed metadata for a given file handler.
+
+        Parameters
+        ----------
+        file_handler : child instance of FileHandler
+            The metadata is searched for this file handler.
+
+        Returns
+        -------
+        metadata : dict or None
+            The indexed metadata of the file. If the file is not indexed or
+            the file was changed since indexing, None is returned.
+        """
+        key = self.file_key(file_handler)
+        if key is None:
+            return None
+        with self._lock, closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT metadata FROM files WHERE path=? AND handler=? AND '
+                'size=? AND mtime=?', key).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def store(self, file_handlers, var_names, metadata=None):
+        """
+        Store the variable names and metadata of given file handlers within
+        this index. Already existing entries for the same files are replaced.
+        All entries are written within a single transaction.
+
+        Parameters
+        ----------
+        file_handlers : list of child instances of FileHandler
+            The entries are stored for these file handlers. File handlers
+            without a local file are skipped.
+        var_names : list(list(str))
+            The variable names of every file handler.
+        metadata : list(dict) or None, optional
+            The JSON-serializable metadata of every file handler. If this is
+            None, empty dicts are stored. Default is None.
+        """
+        if metadata is None:
+            metadata = [{}, ]*len(file_handlers)
+        rows = []
+        for fh, fh_var_names, fh_metadata in zip(file_handlers, var_names,
+                                                 metadata):
+            key = self.file_key(fh)
+            if key is not None:
+                rows.append(key+(json.dumps(sorted(fh_var_names)),
+                                 json.dumps(fh_metadata)))
+        with self._lock, closing(self._connect()) as connection:
+            with connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO files (path, handler, size, '
+                    'mtime, var_names, metadata) VALUES (?, ?, ?, ?, ?, ?)',
+                    rows)
+        logger.debug('Stored {0:d} files in variable index {1:s}'.format(
+            len(rows), self.index_path))
+
+    def clear(self):
+        """
+        Remove all entries from this index.
+        """
+        with self._lock, closing(self._connect()) as connection:
+            with connection:
+                connection.execute('DELETE FROM files')
@@ -64,11 +64,22 @@ class ModelLoader(BaseLoader):
         The grid describes the horizontal grid of the spatial data. The given 
         grid will be forwarded to the given SpatialDataset instance. Default is
         None.
+    lazy : bool, optional
+        If the selected variables of the SpatialDataset should be backed by
+        dask arrays, which are read from the files only when the values are
+        needed. Default is False.
+    index : VariableIndex, str or None, optional
+        The persistent variable index is forwarded to the SpatialDataset. Only
+        files, which are new or changed since the last indexing, are opened
+        to determine their variable names. If this is a str, it is used as
+        path to the index database. Default is None.
     """
     def __init__(self, data_path, file_type=None, grid=None, processes=1,
-                 checking=True):
-        super().__init__(data_path, file_type, processes, checking=checking)
+                 checking=True, lazy=False, index=None):
+        super().__init__(data_path, file_type, processes, checking=checking,
+                         index=index)
         self.grid = grid
+        self.lazy = lazy
         self._available_file_type = {
             'nc': NetCDFHandler,
             'grib2': GribHandler,
@@ -78,11 +89,13 @@ def __init__(self, data_path, file_type=None, grid=None, processes=1,
 
     def _convert_filehandlers_to_dataset(self, file_handlers):
         ds = SpatialDataset(file_handlers, self.grid, data_origin=self,
-                            processes=self.processes)
+                            processes=self.processes, lazy=self.lazy,
+                            index=self.index)
         return ds
 
 
 def open_model_dataset(data_path, file_type=None, grid=None, processes=1,
-                       checking=True):
-    loader = ModelLoader(data_path, file_type, grid, processes, checking)
+                       checking=True, lazy=False, index=None):
+    loader = ModelLoader(data_path, file_type, grid, processes, checking,
+                         lazy=lazy, index=index)
     return loader.load_data()
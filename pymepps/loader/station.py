@@ -60,10 +60,16 @@ class StationLoader(BaseLoader):
     lonlat: tuple(float, float), optional
         The lonlat coordinate tuple describes the position of the station in
         degrees. If this is None the position is unknown. Default is None.
+    index : VariableIndex, str or None, optional
+        The persistent variable index is forwarded to the TSDataset. Only
+        files, which are new or changed since the last indexing, are opened
+        to determine their variable names. If this is a str, it is used as
+        path to the index database. Default is None.
     """
     def __init__(self, data_path, file_type=None, lonlat=None, processes=1,
-                 checking=True):
-        super().__init__(data_path, file_type, processes, checking=checking)
+                 checking=True, index=None):
+        super().__init__(data_path, file_type, processes, checking=checking,
+                         index=index)
         self.lonlat = lonlat
         self._available_file_type = {
             'nc': NetCDFHandler,
@@ -75,11 +81,12 @@ def lon_lat(self):
 
     def _convert_filehandlers_to_dataset(self, file_handlers):
         ds = TSDataset(file_handlers, data_origin=self,
-                       processes=self.processes)
+                       processes=self.processes, index=self.index)
         return ds
 
 
 def open_station_dataset(data_path, file_type=None, lonlat=None, processes=1,
-                         checking=True):
-    loader = StationLoader(data_path, file_type, lonlat, processes, checking)
+                         checking=True, index=None):
+    loader = StationLoader(data_path, file_type, lonlat, processes, checking,
+                           index=index)
     return loader.load_data()
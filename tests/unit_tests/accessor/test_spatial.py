@@ -177,6 +177,36 @@ def test_update_updated_array_has_same_grid(self):
         self.assertIsNotNone(updated_array.pp.grid)
         self.assertEqual(id(self.grid), id(updated_array.pp.grid))
 
+    def test_assemble_same_as_update(self):
+        self.array.pp.grid = self.grid
+        normalized = self.array.pp.normalize_coords(
+            runtime=np.datetime64('2016-12-19T06:00'))
+        grid = normalized.pp.grid
+        items = []
+        for height in (500., 850., 500.):
+            for lead in (6, 0, 3):
+                item = normalized+np.random.normal()
+                item['height'] = [height, ]
+                item['validtime'] = [np.timedelta64(lead, 'h'), ]
+                item.pp.grid = grid
+                items.append(item)
+        assembled = items[0].pp.assemble(*items[1:])
+        updated = items[0].pp.update(*items[1:])
+        xr.testing.assert_identical(assembled, updated)
+        self.assertEqual(assembled.pp.grid, grid)
+        np.testing.assert_equal(assembled.sel(height=500.).values,
+                                xr.concat(items[-3:], dim='validtime')
+                                .sortby('validtime').values.squeeze(axis=-3))
+
+    def test_assemble_raises_valueerror_for_missing_coords(self):
+        self.array.pp.grid = self.grid
+        normalized = self.array.pp.normalize_coords()
+        test_array = normalized.copy()
+        test_array['height'] = [np.nan, ]
+        test_array.pp.grid = normalized.pp.grid
+        with self.assertRaises(ValueError):
+            normalized.pp.assemble(test_array)
+
     def test_set_grid_cooordinates_returns_grid_array(self):
         returned_array = self.array.pp.set_grid(self.grid)
         self.assertEqual(id(returned_array.pp.grid), id(self.grid))
@@ -340,6 +370,76 @@ def test_load_removes_grid_attrs(self):
                          if attr[:7] == 'ppgrid_']
         self.assertFalse(gridded_attrs)
 
+    def test_save_load_stores_grid_values_as_variables(self):
+        grid_dict = {
+            'gridtype': 'unstructured',
+            'gridsize': 20,
+            'xvals': np.random.uniform(0, 20, size=20),
+            'yvals': np.random.uniform(40, 60, size=20),
+        }
+        grid = GridBuilder(grid_dict).build_grid()
+        array = xr.DataArray(np.random.normal(size=grid.shape),
+                             dims=('ncells', ), name='T')
+        array.pp.grid = grid
+        array.pp.save('test.nc')
+        saved_ds = xr.open_dataset('test.nc')
+        self.assertIn('ppgrid_xvals', saved_ds.data_vars)
+        self.assertNotIn('ppgrid_xvals', saved_ds['T'].attrs)
+        self.assertEqual(saved_ds['T'].attrs['ppgrid_gridtype'],
+                         'unstructured')
+        saved_ds.close()
+        opened_array = xr.DataArray.pp.load('test.nc')
+        xr.testing.assert_identical(opened_array, array)
+        self.assertEqual(opened_array.pp.grid, grid)
+
+    def test_load_loads_grid_from_attrs(self):
+        self.array.pp.grid = self.grid
+        self.array.pp.grid_to_attrs().to_netcdf('test.nc')
+        opened_array = xr.DataArray.pp.load('test.nc')
+        self.assertEqual(opened_array.pp.grid, self.grid)
+
+    def test_interp_vertical_interpolates_all_columns(self):
+        self.array.pp.grid = self.grid
+        normalized = self.array.pp.normalize_coords()
+        array = xr.concat([normalized, normalized+10, normalized+30],
+                          dim='height')
+        array['height'] = [1000., 800., 600.]
+        array.pp.grid = self.grid
+        returned = array.pp.interp_vertical([900., 700., 300.])
+        self.assertEqual(returned.dims, array.dims)
+        np.testing.assert_equal(returned['height'].values, [900, 700, 300])
+        np.testing.assert_allclose(returned.isel(height=0),
+                                   normalized.isel(height=0)+5)
+        np.testing.assert_allclose(returned.isel(height=1),
+                                   normalized.isel(height=0)+20)
+        self.assertTrue(np.all(np.isnan(returned.isel(height=2))))
+        self.assertEqual(returned.pp.grid, self.grid)
+
+    def test_interp_vertical_reuses_weights(self):
+        normalized = self.array.pp.normalize_coords()
+        array = xr.concat([normalized, normalized+10], dim='height')
+        array['height'] = [1000., 500.]
+        pressure = xr.DataArray([1000., 500.], dims=('height', ))
+        weights = array.pp.vertical_weights([700.], src_levels=pressure,
+                                            method='log')
+        returned = array.pp.interp_vertical(weights=weights)
+        trg_weight = np.log(1000/700)/np.log(1000/500)
+        np.testing.assert_allclose(
+            returned.isel(height=0),
+            normalized.isel(height=0)+10*trg_weight)
+        with self.assertRaises(ValueError):
+            array.pp.interp_vertical()
+
+    def test_coarsen_sets_coarse_grid(self):
+        self.array.pp.grid = self.grid
+        returned = self.array.pp.coarsen(factor=4, how='max')
+        coarse_grid = self.grid.coarsen(self.array.values, factor=4)[1]
+        self.assertEqual(returned.pp.grid, coarse_grid)
+        self.assertEqual(returned.shape[-2:], tuple(coarse_grid.shape))
+        np.testing.assert_allclose(
+            returned.values[..., 0, 0],
+            np.nanmax(self.array.values[..., :4, :4], axis=(-2, -1)))
+
     def test_get_coord_name_detects_approx_variants(self):
         variant = dict(approx=['ti', ], exact=[])
         returned_coord = self.array.pp._get_coord_name(self.array, variant)
@@ -607,6 +707,63 @@ def test_selpoint_creates_and_set_new_grid(self):
         grid = GridBuilder(grid_dict).build_grid()
         self.assertEqual(grid, returned_array.pp.grid)
 
+    def test_selpoints_same_as_selpoint(self):
+        coords = [(10.1, 53.5), (9.8, 52.3), (350.2, -10.7)]
+        self.array = self.array.pp.set_grid(self.grid)
+        returned_array = self.array.pp.selpoints(coords)
+        self.assertEqual(returned_array.dims[-1], 'station')
+        self.assertEqual(len(returned_array.station), 3)
+        for k, coord in enumerate(coords):
+            sliced_array = self.array.pp.selpoint(coord)
+            np.testing.assert_equal(
+                returned_array.isel(station=k).values.squeeze(),
+                sliced_array.values.squeeze())
+        np.testing.assert_equal(returned_array.lon.values,
+                                np.array(coords)[:, 0])
+
+    def test_selpoints_uses_trailing_data_dims(self):
+        coords = [(10.1, 53.5), (350.2, -10.7)]
+        self.array = self.array.pp.set_grid(self.grid)
+        renamed_array = self.array.rename({'lat': 'y', 'lon': 'x'})
+        renamed_array.pp.grid = self.grid
+        returned_array = renamed_array.pp.selpoints(coords)
+        self.assertEqual(returned_array.dims[-1], 'station')
+        self.assertNotIn('y', returned_array.coords)
+        np.testing.assert_equal(returned_array.values,
+                                self.array.pp.selpoints(coords).values)
+
+    def test_selpoints_bilinear_same_as_interpolate(self):
+        coords = [(10.1, 53.5), (9.8, 52.3)]
+        self.array = self.array.pp.set_grid(self.grid)
+        returned_array = self.array.pp.selpoints(
+            coords, method='bilinear', names=['a', 'b'])
+        grid_dict = {
+            'gridtype': 'unstructured',
+            'gridsize': 2,
+            'xvals': [10.1, 9.8],
+            'yvals': [53.5, 52.3],
+        }
+        station_grid = GridBuilder(grid_dict).build_grid()
+        interpolated = self.grid.interpolate(self.array.values, station_grid,
+                                             order=1)
+        np.testing.assert_equal(returned_array.values, interpolated)
+        np.testing.assert_equal(returned_array.station.values, ['a', 'b'])
+
+    def test_selpoints_raises_valueerror_if_unknown_method(self):
+        self.array = self.array.pp.set_grid(self.grid)
+        with self.assertRaises(ValueError):
+            self.array.pp.selpoints([(10.1, 53.5), ], method='test')
+
+    def test_to_pandas_multiple_lonlats_returns_wide_dataframe(self):
+        coords = [(10, 53.5), (11, 54)]
+        self.array.pp.grid = self.grid
+        returned_df = self.array.pp.to_pandas(coords)
+        for k, coord in enumerate(coords):
+            station_df = self.array.pp.to_pandas(coord)
+            np.testing.assert_equal(
+                returned_df.xs(k, axis=1, level='station').values,
+                station_df.values)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+# """
+# Created on 17.10.26
+#
+# Created for pymepps
+#
+# @author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#     Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# """
+# System modules
+import unittest
+import logging
+
+# External modules
+import numpy as np
+
+# Internal modules
+from pymepps.accessor.vertical import VerticalWeights
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestVerticalWeights(unittest.TestCase):
+    def setUp(self):
+        rnd = np.random.RandomState(42)
+        self.src_levels = np.array([1000., 925., 850., 700., 500., 300.])
+        self.trg_levels = np.array([950., 800., 600., 400., 1013., 200.])
+        self.data = rnd.normal(size=(3, 4, 5, len(self.src_levels)))
+
+    def column_interp(self, data, src_levels, trg_levels, transform):
+        src = transform(src_levels)[::-1]
+        trg = transform(trg_levels)
+        return np.interp(trg, src, data[::-1], left=np.nan, right=np.nan)
+
+    def test_linear_same_as_np_interp(self):
+        weights = VerticalWeights(self.src_levels, self.trg_levels)
+        returned = weights.apply(self.data)
+        self.assertEqual(returned.shape, self.data.shape[:-1]+(6, ))
+        for ind in np.ndindex(self.data.shape[:-1]):
+            np.testing.assert_allclose(
+                returned[ind], self.column_interp(
+                    self.data[ind], self.src_levels, self.trg_levels,
+                    lambda x: x))
+
+    def test_log_same_as_np_interp_of_log(self):
+        weights = VerticalWeights(self.src_levels, self.trg_levels,
+                                  method='log')
+        returned = weights.apply(self.data)
+        for ind in np.ndindex(self.data.shape[:-1]):
+            np.testing.assert_allclose(
+                returned[ind], self.column_interp(
+                    self.data[ind], self.src_levels, self.trg_levels,
+                    np.log))
+
+    def test_column_levels_broadcast_to_data(self):
+        rnd = np.random.RandomState(1)
+        src_levels = self.src_levels * rnd.uniform(
+            0.95, 1.05, size=(4, 5, 1))
+        weights = VerticalWeights(src_levels, self.trg_levels, method='log')
+        returned = weights.apply(self.data)
+        for ind in np.ndindex(self.data.shape[:-1]):
+            np.testing.assert_allclose(
+                returned[ind], self.column_interp(
+                    self.data[ind], src_levels[ind[1:]], self.trg_levels,
+                    np.log))
+
+    def test_target_levels_at_source_levels_are_exact(self):
+        weights = VerticalWeights(self.src_levels, self.src_levels)
+        np.testing.assert_allclose(weights.apply(self.data), self.data)
+
+    def test_raises_valueerror(self):
+        with self.assertRaises(ValueError):
+            VerticalWeights(self.src_levels, self.trg_levels, method='cubic')
+        with self.assertRaises(ValueError):
+            VerticalWeights(-self.src_levels, self.trg_levels, method='log')
+        with self.assertRaises(ValueError):
+            VerticalWeights([1000., ], self.trg_levels)
+        weights = VerticalWeights(self.src_levels, self.trg_levels)
+        with self.assertRaises(ValueError):
+            weights.apply(self.data[..., :3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,6 +28,7 @@
 import os
 import glob
 import re
+import tempfile
 
 # External modules
 import numpy as np
@@ -147,14 +148,36 @@ def test_decode_grid_file_str(self):
             grid_str = self.grid.open_string(grid_path)
             returned_dict = self.grid.decode_str(grid_str)
             grid_dict = self.decode_grid_file(grid_str)
-            self.assertEqual(returned_dict, grid_dict)
+            np.testing.assert_equal(returned_dict, grid_dict)
 
     def test_griddes_decodes_str_to_grid_des(self):
         for grid_path in self.available_grids:
             grid = GridBuilder(griddes=grid_path)
             decoded_grid = self.grid.decode_str(
                 self.grid.open_string(grid_path))
-            self.assertEqual(grid.griddes, decoded_grid)
+            np.testing.assert_equal(grid.griddes, decoded_grid)
+
+    def test_decode_str_decodes_number_blocks_to_array(self):
+        test_str = 'gridtype=unstructured\nxvals = 1 -2.5\n  3E2 4\n' \
+                   'yvals = 1.5f 2\nxname = "lon"'
+        returned_dict = self.grid.decode_str(test_str)
+        self.assertIsInstance(returned_dict['xvals'], np.ndarray)
+        np.testing.assert_equal(returned_dict['xvals'], [1, -2.5, 300, 4])
+        self.assertIsInstance(returned_dict['yvals'], np.ndarray)
+        np.testing.assert_equal(returned_dict['yvals'], [1.5, 2])
+        self.assertEqual(returned_dict['xname'], 'lon')
+
+    def test_griddes_uses_cache_dir(self):
+        grid_path = os.path.join(BASE_PATH, 'grids', 'unstructured')
+        with tempfile.TemporaryDirectory() as cache_dir:
+            grid = GridBuilder(grid_path, cache_dir=cache_dir)
+            cache_files = os.listdir(cache_dir)
+            self.assertEqual(len(cache_files), 1)
+            cached_grid = GridBuilder(grid_path, cache_dir=cache_dir)
+            np.testing.assert_equal(cached_grid.griddes, grid.griddes)
+            self.assertEqual(os.listdir(cache_dir), cache_files)
+            for key, value in grid.griddes.items():
+                self.assertEqual(type(cached_grid.griddes[key]), type(value))
 
     def test_griddes_raises_typeerror_if_no_str_none_dict(self):
         grid = GridBuilder('gridtype=lonlat')
@@ -191,6 +214,14 @@ def test_build_grid(self):
         grid = grid_builder.build_grid()
         self.assertIsInstance(grid, CurvilinearGrid)
 
+    def test_build_grid_interns_same_description(self):
+        file = os.path.join(BASE_PATH, 'grids', 'unstructured')
+        grid = GridBuilder(file).build_grid(intern=True)
+        self.assertIs(GridBuilder(file).build_grid(intern=True), grid)
+        self.assertIsNot(GridBuilder(file).build_grid(), grid)
+        other_file = os.path.join(BASE_PATH, 'grids', 'lon_lat_single')
+        self.assertIsNot(GridBuilder(other_file).build_grid(intern=True), grid)
+
 
 if __name__ == '__main__':
     unittest.main()
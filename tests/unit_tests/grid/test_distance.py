@@ -0,0 +1,84 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Created on 17.10.26
+
+Created for pymepps
+
+@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+
+    Copyright (C) {2017}  {Tobias Sebastian Finn}
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# System modules
+import unittest
+import logging
+
+# External modules
+import numpy as np
+
+# Internal modules
+from pymepps.grid.distance import distance_haversine, pairwise_haversine, \
+    k_nearest, idw_weights
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestDistance(unittest.TestCase):
+    def setUp(self):
+        rnd = np.random.RandomState(42)
+        self.p1 = (rnd.uniform(-80, 80, 30), rnd.uniform(-180, 180, 30))
+        self.p2 = (rnd.uniform(-80, 80, 200), rnd.uniform(0, 360, 200))
+        self.distance = distance_haversine(
+            (self.p1[0][:, None], self.p1[1][:, None]),
+            (self.p2[0][None, :], self.p2[1][None, :]))
+
+    def test_pairwise_same_as_distance_haversine(self):
+        for max_elements in (1, 450, 2**22):
+            returned = pairwise_haversine(self.p1, self.p2,
+                                          max_elements=max_elements)
+            np.testing.assert_allclose(returned, self.distance)
+
+    def test_pairwise_float32_close_to_float64(self):
+        returned = pairwise_haversine(self.p1, self.p2, dtype=np.float32)
+        self.assertEqual(returned.dtype, np.float32)
+        np.testing.assert_allclose(returned, self.distance, rtol=1E-3,
+                                   atol=10)
+
+    def test_k_nearest_same_as_sorted_distance(self):
+        nearest_ind, nearest_distance = k_nearest(self.p1, self.p2, k=5,
+                                                  max_elements=450)
+        sort_ind = np.argsort(self.distance, axis=1)[:, :5]
+        np.testing.assert_equal(nearest_ind, sort_ind)
+        np.testing.assert_allclose(
+            nearest_distance, np.sort(self.distance, axis=1)[:, :5])
+
+    def test_k_nearest_raises_valueerror_for_wrong_k(self):
+        with self.assertRaises(ValueError):
+            k_nearest(self.p1, self.p2, k=0)
+        with self.assertRaises(ValueError):
+            k_nearest(self.p1, self.p2, k=201)
+
+    def test_idw_weights_normalized_and_exact(self):
+        distance = np.array([[1., 2., 4.], [3., 0., 1.]])
+        weights = idw_weights(distance, power=1)
+        np.testing.assert_allclose(weights.sum(axis=-1), 1)
+        np.testing.assert_allclose(weights[0], np.array([4, 2, 1])/7)
+        np.testing.assert_equal(weights[1], [0, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,12 +30,18 @@
 # External modules
 import numpy as np
 import xarray as xr
+try:
+    import dask.array as da
+except ImportError:
+    da = None
 
 from mpl_toolkits.basemap import interp
 
 # Internal modules
 from pymepps.grid import GridBuilder
 from pymepps.grid.lonlat import LonLatGrid
+from pymepps.grid.grid import distance_haversine
+from pymepps.grid.distance import k_nearest
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -201,6 +207,27 @@ def test_normalize_grid_normalize_lon(self):
         lon = lon[sort_order_lat, sort_order_lon]
         np.testing.assert_array_equal(lon, normalized_output[1])
 
+    def test_normalize_data_same_as_normalize_lat_lon(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=(2, )+ll_lat.shape)
+        _, _, target_data = self.grid.normalize_lat_lon(ll_lat, ll_lon, data)
+        np.testing.assert_array_equal(self.grid.normalize_data(data),
+                                      target_data)
+        self.assertIs(self.grid._normalize_order(),
+                      self.grid._normalize_order())
+
+    def test_normalize_order_uses_slices_and_roll(self):
+        lat, lon = np.meshgrid(np.arange(90, -91, -30), np.arange(0, 360, 30),
+                               indexing='ij')
+        kind, lat_order, lon_order = self.grid._calc_normalize_order(lat, lon)
+        self.assertEqual(kind, 'axes')
+        self.assertEqual(lat_order, slice(None, None, -1))
+        self.assertEqual(lon_order, -7)
+        data = np.random.normal(size=lat.shape)
+        ordered_data = self.grid._apply_order(
+            data, ('axes', lat_order, slice(None)))
+        self.assertTrue(np.shares_memory(ordered_data, data))
+
     def test_interpolate_with_nearest_neighbour(self):
         ll_lat, ll_lon = self.grid._calc_lat_lon()
         data = np.arange(ll_lat.size).reshape(ll_lat.shape)
@@ -230,6 +257,147 @@ def test_interpolate_with_bilinear(self):
                                      g_lat, g_lon, order=1)
         np.testing.assert_array_equal(remapped_values, interpolated_values)
 
+    def test_fingerprint_is_cached(self):
+        fingerprint = self.grid.fingerprint
+        self.assertEqual(self.grid._fingerprint, fingerprint)
+        self.assertIs(self.grid.fingerprint, fingerprint)
+
+    def test_eq_uses_fingerprint(self):
+        file = os.path.join(BASE_PATH, 'grids', 'lon_lat')
+        other_grid = GridBuilder(file).build_grid()
+        self.assertEqual(self.grid, other_grid)
+        self.assertEqual(hash(self.grid), hash(other_grid))
+        self.assertNotEqual(self.grid, 'test')
+        other_grid = GridBuilder(os.path.join(
+            BASE_PATH, 'grids', 'gaussian_y')).build_grid()
+        self.assertNotEqual(self.grid, other_grid)
+
+    def test_eq_compares_coordinates_across_descriptions(self):
+        inc_grid = GridBuilder('gridtype=lonlat\nxsize=4\nysize=3\n'
+                               'xfirst=0\nxinc=0.5\nyfirst=50\n'
+                               'yinc=-0.5').build_grid()
+        vals_grid = GridBuilder({
+            'gridtype': 'lonlat', 'xsize': 4, 'ysize': 3,
+            'xvals': [0, 0.5, 1, 1.5], 'yvals': [50, 49.5, 49]}).build_grid()
+        units_grid = GridBuilder('gridtype=lonlat\nxsize=4\nysize=3\n'
+                                 'xfirst=0\nxinc=0.5\nyfirst=50\n'
+                                 'yinc=-0.5\nxunits=degrees_east'
+                                 ).build_grid()
+        self.assertNotEqual(inc_grid.fingerprint, vals_grid.fingerprint)
+        self.assertEqual(inc_grid, vals_grid)
+        self.assertEqual(inc_grid, units_grid)
+        self.assertEqual(hash(inc_grid), hash(vals_grid))
+        shifted_grid = GridBuilder('gridtype=lonlat\nxsize=4\nysize=3\n'
+                                   'xfirst=0.5\nxinc=0.5\nyfirst=50\n'
+                                   'yinc=-0.5').build_grid()
+        self.assertNotEqual(inc_grid, shifted_grid)
+        self.assertNotEqual(hash(inc_grid), hash(shifted_grid))
+
+    def test_grid_is_hashable(self):
+        file = os.path.join(BASE_PATH, 'grids', 'lon_lat')
+        grid_cache = {self.grid: 1}
+        self.assertEqual(grid_cache[GridBuilder(file).build_grid()], 1)
+
+    def test_calc_lat_lon_is_memoised_read_only_view(self):
+        lat, lon = self.grid._calc_lat_lon()
+        self.assertIs(self.grid._calc_lat_lon()[0], lat)
+        self.assertFalse(lat.flags.writeable)
+        self.assertFalse(lon.flags.writeable)
+        self.assertEqual(lat.strides[-1], 0)
+        self.assertEqual(lon.strides[0], 0)
+
+    def test_get_coords_returns_new_dict(self):
+        coords = self.grid.get_coords()
+        coords['test'] = 1
+        self.assertNotIn('test', self.grid.get_coords())
+
+    def test_normalize_lat_lon_does_not_change_input(self):
+        lat, lon = np.meshgrid(np.arange(-10, 11, 5), np.arange(0, 360, 90),
+                               indexing='ij')
+        orig_lon = lon.copy()
+        _, norm_lon, _ = self.grid.normalize_lat_lon(lat, lon)
+        np.testing.assert_array_equal(lon, orig_lon)
+        self.assertTrue(np.all(norm_lon <= 180))
+
+    def test_remap_weights_are_cached(self):
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        weights = self.grid.remap_weights(gaussian_grid, order=1)
+        self.assertEqual(
+            id(weights), id(self.grid.remap_weights(gaussian_grid, order=1)))
+        self.assertNotEqual(
+            id(weights), id(self.grid.remap_weights(gaussian_grid, order=0)))
+
+    def test_remap_weights_raises_typeerror_if_no_grid(self):
+        with self.assertRaises(TypeError):
+            self.grid.remap_weights(None)
+
+    def test_interpolate_multi_dim(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.arange(2*ll_lat.size).reshape((2,)+ll_lat.shape)
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        remapped_values = self.grid.interpolate(data, gaussian_grid, 1)
+        np.testing.assert_array_equal(
+            remapped_values[1],
+            self.grid.interpolate(data[1], gaussian_grid, 1))
+
+    def test_interpolate_backends_are_the_same(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=(3,)+ll_lat.shape)
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        for order in (0, 1):
+            sparse_values = self.grid.interpolate(
+                data, gaussian_grid, order, backend='sparse')
+            for backend in ('numpy', 'slicewise'):
+                np.testing.assert_allclose(
+                    self.grid.interpolate(data, gaussian_grid, order,
+                                          backend=backend),
+                    sparse_values)
+
+    def test_interpolate_writes_into_out(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=(2,)+ll_lat.shape)
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        out = np.empty((2,)+tuple(gaussian_grid.shape))
+        for backend in ('sparse', 'numpy'):
+            remapped_values = self.grid.interpolate(
+                data, gaussian_grid, 1, backend=backend, out=out)
+            self.assertIs(remapped_values, out)
+            np.testing.assert_allclose(
+                out, self.grid.interpolate(data, gaussian_grid, 1))
+
+    def test_interpolate_parallel_same_as_serial(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=(3, 2)+ll_lat.shape)
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        for backend in ('sparse', 'numpy'):
+            np.testing.assert_allclose(
+                self.grid.interpolate(data, gaussian_grid, 1,
+                                      backend=backend, processes=4),
+                self.grid.interpolate(data, gaussian_grid, 1,
+                                      backend=backend))
+        out = np.empty((3, 2)+tuple(gaussian_grid.shape), dtype=np.float32)
+        remapped_values = self.grid.interpolate(data, gaussian_grid, 0,
+                                                out=out, processes=16)
+        self.assertIs(remapped_values, out)
+        np.testing.assert_allclose(
+            out, self.grid.interpolate(data, gaussian_grid, 0), rtol=1E-6)
+        with self.assertRaises(ValueError):
+            self.grid.interpolate(data, gaussian_grid, 0, processes=0)
+        with self.assertRaises(ValueError):
+            self.grid.interpolate(data, gaussian_grid, 0, processes=2,
+                                  out=out[:2])
+
+    def test_interpolate_raises_valueerror_if_unknown_backend(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=ll_lat.shape)
+        with self.assertRaises(ValueError):
+            self.grid.interpolate(data, self.grid, 1, backend='test')
+
     def test_get_nearest_point(self):
         ll_lat, ll_lon = self.grid._calc_lat_lon()
         data = np.random.normal(size=ll_lat.shape)
@@ -250,6 +418,160 @@ def test_get_nearest_point_multi_dim(self):
         extracted_data = self.grid.get_nearest_point(data, target_point)
         np.testing.assert_array_equal(target_data, extracted_data)
 
+    @unittest.skipIf(da is None, 'dask is not installed')
+    def test_interpolate_dask_array_lazy(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = xr.DataArray(
+            np.random.normal(size=(4, )+ll_lat.shape),
+            coords=dict(time=np.arange(4), **self.grid.get_coords()),
+            dims=['time', ]+list(self.grid.get_coord_names())
+        )
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        lazy_data = data.chunk({'time': 1, 'lat': 100})
+        for backend in ('numpy', 'sparse', 'slicewise'):
+            remapped_data = self.grid.interpolate(
+                lazy_data, gaussian_grid, 1, backend=backend)
+            self.assertIsInstance(remapped_data.data, da.Array)
+            self.assertEqual(remapped_data.chunks[0], (1, 1, 1, 1))
+            np.testing.assert_allclose(
+                remapped_data.values,
+                self.grid.interpolate(data, gaussian_grid, 1).values)
+
+    def test_interpolate_to_unstructured_grid(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=(2, )+ll_lat.shape)
+        file = os.path.join(BASE_PATH, 'grids', 'unstructured')
+        unstructured_grid = GridBuilder(file).build_grid()
+        u_lat, u_lon = unstructured_grid._calc_lat_lon()
+        remapped_values = self.grid.interpolate(data, unstructured_grid, 1)
+        self.assertEqual(remapped_values.shape, (2, )+u_lat.shape)
+        ll_lat, ll_lon, data = self.grid.normalize_lat_lon(ll_lat, ll_lon, data)
+        interpolated_values = interp(
+            data[1].T, ll_lat[:, 0], ll_lon[0, :], u_lat,
+            self.grid.wrap_lon(u_lon), order=1)
+        np.testing.assert_allclose(remapped_values[1], interpolated_values)
+
+    def test_nearest_points_returns_indices_for_all_coords(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        coords = np.array([(53.45, 10.05), (-20.2, 100.3), (0.1, 359.9)])
+        nearest_ind, distance = self.grid.nearest_points(coords)
+        self.assertEqual(len(nearest_ind), 2)
+        self.assertEqual(distance.shape, (3, ))
+        for k, coord in enumerate(coords):
+            haversine = distance_haversine(
+                coord, (ll_lat.flatten(), ll_lon.flatten()))
+            target_ind = np.unravel_index(haversine.argmin(), ll_lat.shape)
+            self.assertEqual((nearest_ind[0][k], nearest_ind[1][k]),
+                             target_ind)
+            np.testing.assert_allclose(distance[k], haversine.min(),
+                                       atol=1E-3)
+
+    def test_nearest_points_raises_valueerror_for_wrong_shape(self):
+        with self.assertRaises(ValueError):
+            self.grid.nearest_points(np.zeros((3, 3)))
+
+    def test_nearest_neighbours_first_is_nearest_point(self):
+        coords = np.array([(53.45, 10.05), (-20.2, 100.3), (0.1, 359.9)])
+        nearest_ind, distance = self.grid.nearest_points(coords)
+        neighbour_ind, neighbour_distance = self.grid.nearest_neighbours(
+            coords, k=4)
+        self.assertEqual(neighbour_distance.shape, (3, 4))
+        np.testing.assert_equal(neighbour_ind[0][:, 0], nearest_ind[0])
+        np.testing.assert_equal(neighbour_ind[1][:, 0], nearest_ind[1])
+        np.testing.assert_allclose(neighbour_distance[:, 0], distance,
+                                   atol=1E-3)
+        self.assertTrue(np.all(np.diff(neighbour_distance, axis=1) >= 0))
+
+    def test_nearest_neighbours_same_as_brute_force(self):
+        coords = np.array([(53.45, 10.05), (-20.2, 100.3), (0.1, 359.9),
+                           (89.9, 12.), (-89.9, 200.)])
+        src_lat, src_lon = self.grid._calc_lat_lon()
+        flat_ind, distance = k_nearest(
+            (coords[:, 0], coords[:, 1]), (src_lat, src_lon), k=6)
+        neighbour_ind, neighbour_distance = self.grid.nearest_neighbours(
+            coords, k=6)
+        np.testing.assert_allclose(neighbour_distance, distance, atol=1E-3)
+        # The poles have many equidistant points, such that only the
+        # indices of the other points are unique.
+        returned_ind = np.ravel_multi_index(neighbour_ind, src_lat.shape)
+        np.testing.assert_equal(np.sort(returned_ind[:3], axis=1),
+                                np.sort(flat_ind[:3], axis=1))
+        with self.assertRaises(ValueError):
+            self.grid.nearest_neighbours(coords, k=src_lat.size+1)
+
+    def test_nearest_neighbours_haversine_method_uses_chunks(self):
+        coords = np.array([(53.45, 10.05), (-20.2, 100.3), (0.1, 359.9)])
+        tree_ind, tree_distance = self.grid.nearest_neighbours(coords, k=4)
+        chunk_ind, chunk_distance = self.grid.nearest_neighbours(
+            coords, k=4, method='haversine', dtype=np.float32,
+            max_elements=2**16)
+        self.assertEqual(chunk_distance.dtype, np.float32)
+        np.testing.assert_allclose(chunk_distance, tree_distance, rtol=1E-4)
+        np.testing.assert_equal(np.sort(chunk_ind[0], axis=1),
+                                np.sort(tree_ind[0], axis=1))
+        with self.assertRaises(ValueError):
+            self.grid.nearest_neighbours(coords, method='test')
+
+    def test_get_idw_points_weights_neighbours(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = xr.DataArray(
+            np.random.normal(size=(2, )+ll_lat.shape),
+            dims=('time', 'lat', 'lon'), coords={'time': [0, 1]})
+        coords = np.array([(53.45, 10.05), (-20.2, 100.3)])
+        nearest_ind, distance = self.grid.nearest_neighbours(coords, k=3)
+        weights = 1/distance**2
+        weights /= weights.sum(axis=1, keepdims=True)
+        target = np.sum(
+            data.values[:, nearest_ind[0], nearest_ind[1]]*weights, axis=-1)
+        returned = self.grid.get_idw_points(data, coords, k=3)
+        self.assertEqual(returned.dims, ('time', 'station'))
+        np.testing.assert_allclose(returned.values, target)
+        nearest = self.grid.get_idw_points(data.values, coords, k=1)
+        np.testing.assert_equal(
+            nearest, data.values[:, nearest_ind[0][:, 0], nearest_ind[1][:, 0]])
+
+    def test_coarsen_by_factor_aggregates_blocks(self):
+        grid = GridBuilder('gridtype=lonlat\nxsize=41\nysize=30\n'
+                           'xfirst=0\nxinc=0.25\nyfirst=50\n'
+                           'yinc=-0.25').build_grid()
+        data = np.random.normal(size=(2, 30, 41))
+        coarse_data, coarse_grid = grid.coarsen(data, factor=(3, 2))
+        self.assertEqual(tuple(coarse_grid.shape), (10, 20))
+        np.testing.assert_allclose(
+            coarse_data,
+            data[..., :40].reshape(2, 10, 3, 20, 2).mean(axis=(-3, -1)))
+        coarse_lat, coarse_lon = coarse_grid._calc_lat_lon()
+        np.testing.assert_allclose(coarse_lat[:, 0], 50-0.25-np.arange(10)*0.75)
+        np.testing.assert_allclose(coarse_lon[0], 0.125+np.arange(20)*0.5)
+        with self.assertRaises(ValueError):
+            grid.coarsen(data, factor=(3, 2), how='median')
+        with self.assertRaises(ValueError):
+            grid.coarsen(data)
+
+    def test_coarsen_to_grid_same_as_factor(self):
+        grid = GridBuilder('gridtype=lonlat\nxsize=40\nysize=30\n'
+                           'xfirst=0\nxinc=0.25\nyfirst=50\n'
+                           'yinc=-0.25').build_grid()
+        data = xr.DataArray(np.random.normal(size=(2, 30, 40)),
+                            dims=('time', 'lat', 'lon'),
+                            coords={'time': [0, 1]})
+        data[0, 0, 0] = np.nan
+        for how in ('mean', 'max'):
+            coarse_data, coarse_grid = grid.coarsen(data, factor=2, how=how)
+            cell_data, cell_grid = grid.coarsen(data, other_grid=coarse_grid,
+                                                how=how)
+            self.assertIs(cell_grid, coarse_grid)
+            self.assertEqual(cell_data.dims, ('time', 'lat', 'lon'))
+            np.testing.assert_allclose(cell_data, coarse_data)
+        self.assertIs(grid.cell_map(coarse_grid), grid.cell_map(coarse_grid))
+
+    def test_kdtree_is_cached(self):
+        tree = self.grid.kdtree
+        self.assertIs(self.grid.kdtree, tree)
+        self.grid.nearest_point((53.45, 10.05))
+        self.assertIs(self.grid.kdtree, tree)
+
     def test_lonlatbox_returns_array(self):
         ll_lat, ll_lon = self.grid._calc_lat_lon()
         data = np.random.normal(size=[5,]+list(ll_lat.shape))
@@ -289,8 +611,44 @@ def test_lonlatbox_slices_lon_lat_from_data(self):
         lon_bound = np.logical_and(calc_lon >= target_box[0],
                                    calc_lon <= target_box[2])
         extracted_data, _ = self.grid.lonlatbox(data, target_box)
-        target_data = data[..., lat_bound, lon_bound]
+        target_data = data[..., lat_bound, :][..., lon_bound]
         np.testing.assert_array_equal(extracted_data, target_data)
+        self.assertTrue(np.shares_memory(extracted_data, data))
+
+    def test_lonlatbox_slices_dataarray_lazy(self):
+        ll_lat, ll_lon = self.grid._calc_lat_lon()
+        data = xr.DataArray(
+            np.random.normal(size=[2, ]+list(ll_lat.shape)),
+            coords=dict(time=np.arange(2), **self.grid.get_coords()),
+            dims=['time', ]+list(self.grid.get_coord_names())
+        )
+        target_box = (0, 10, 10, 0)
+        target_data, target_grid = self.grid.lonlatbox(data.values,
+                                                       target_box)
+        extracted_data, new_grid = self.grid.lonlatbox(data, target_box)
+        self.assertIsInstance(extracted_data, xr.DataArray)
+        np.testing.assert_array_equal(extracted_data.values, target_data)
+        self.assertEqual(new_grid, target_grid)
+        if da is not None:
+            extracted_data, _ = self.grid.lonlatbox(
+                data.chunk({'time': 1}), target_box)
+            self.assertIsInstance(extracted_data.data, da.Array)
+            np.testing.assert_array_equal(extracted_data.values, target_data)
+
+    def test_lonlatbox_keeps_vals_of_irregular_axis(self):
+        file = os.path.join(BASE_PATH, 'grids', 'gaussian_y')
+        gaussian_grid = GridBuilder(file).build_grid()
+        calc_lat, calc_lon = gaussian_grid._construct_dim()
+        data = np.random.normal(size=[5, ]+list(gaussian_grid.shape))
+        target_box = (0, 50, 30, 10)
+        extracted_data, new_grid = gaussian_grid.lonlatbox(data, target_box)
+        lat_bound = np.logical_and(calc_lat >= 10, calc_lat <= 50)
+        lon_bound = np.logical_and(calc_lon >= 0, calc_lon <= 30)
+        np.testing.assert_array_equal(
+            extracted_data, data[..., lat_bound, :][..., lon_bound])
+        np.testing.assert_array_equal(new_grid._grid_dict['yvals'],
+                                      calc_lat[lat_bound])
+        self.assertIn('xfirst', new_grid._grid_dict)
 
     def test_lonlatbox_returns_new_grid_with_right_values(self):
         calc_lat, calc_lon = self.grid._construct_dim()
@@ -306,14 +664,13 @@ def test_lonlatbox_returns_new_grid_with_right_values(self):
         new_lon = calc_lon[lon_bound]
         self.assertEqual(new_grid._grid_dict['ysize'], len(new_lat))
         self.assertEqual(new_grid._grid_dict['xsize'], len(new_lon))
-        np.testing.assert_array_equal(
-            new_grid._grid_dict['yvals'], new_lat
-        )
-        np.testing.assert_array_equal(
-            new_grid._grid_dict['xvals'], new_lon
-        )
-        self.assertNotIn('xfirst', new_grid._grid_dict)
-        self.assertNotIn('yfirst', new_grid._grid_dict)
+        self.assertEqual(new_grid._grid_dict['yfirst'], new_lat[0])
+        self.assertEqual(new_grid._grid_dict['xfirst'], new_lon[0])
+        self.assertNotIn('xvals', new_grid._grid_dict)
+        self.assertNotIn('yvals', new_grid._grid_dict)
+        new_dim_lat, new_dim_lon = new_grid._construct_dim()
+        np.testing.assert_allclose(new_dim_lat, new_lat)
+        np.testing.assert_allclose(new_dim_lon, new_lon)
 
 
 if __name__ == '__main__':
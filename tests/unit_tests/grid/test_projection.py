@@ -34,7 +34,8 @@
 # Internal modules
 from pymepps.grid import GridBuilder
 from pymepps.grid.projection import ProjectionGrid
-from pymepps.grid.projection import RotPoleProj
+from pymepps.grid.projection import RotPoleProj, get_proj
+from pymepps.grid.projection import get_transformer
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -127,6 +128,42 @@ def test_get_projection_accepts_rotated_pole(self):
         self.assertEqual(returned_proj.north_pole['lat'], 36.0625)
         self.assertEqual(returned_proj.north_pole['lon'], -170.415)
 
+    def test_calc_lat_lon_chunked_same_as_full_transform(self):
+        for grid_name in ('lcc', 'rot_lat_lon'):
+            builder = GridBuilder(os.path.join(BASE_PATH, 'grids', grid_name))
+            grid = builder.build_grid()
+            grid.chunk_points = 1234
+            y, x = grid._construct_dim()
+            x, y = np.meshgrid(x, y)
+            lon, lat = grid.proj(x, y, inverse=True)
+            calculated_lat_lon = grid._calc_lat_lon()
+            np.testing.assert_allclose(lat, calculated_lat_lon[0])
+            np.testing.assert_allclose(lon, calculated_lat_lon[1])
+            self.assertIs(calculated_lat_lon, grid._calc_lat_lon())
+
+    def test_get_projection_shares_proj4_projection(self):
+        grid_dict = {
+            'proj4': '+proj=lcc +lat_0=63 +lon_0=15 +lat_1=63 +lat_2=63 '
+                     '+no_defs +R=6.371e+06',
+        }
+        first_grid = ProjectionGrid(grid_dict)
+        second_grid = ProjectionGrid(grid_dict)
+        self.assertIs(first_grid.proj, second_grid.proj)
+        self.assertIs(first_grid.proj, get_proj(grid_dict['proj4']))
+
+    def test_get_transformer_cached_transformer(self):
+        proj4 = '+proj=lcc +lat_0=63 +lon_0=15 +lat_1=63 +lat_2=63 ' \
+                '+no_defs +R=6.371e+06'
+        transformer = get_transformer(proj4)
+        self.assertIsInstance(transformer, pyproj.Transformer)
+        self.assertIs(transformer, get_transformer(proj4))
+        x, y = np.meshgrid(np.linspace(-1E5, 1E5, 5),
+                           np.linspace(-1E5, 1E5, 4))
+        lon, lat = pyproj.Proj(proj4)(x, y, inverse=True)
+        trans_lon, trans_lat = transformer.transform(x, y)
+        np.testing.assert_allclose(lon, trans_lon)
+        np.testing.assert_allclose(lat, trans_lat)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Created on 17.10.26
+
+Created for pymepps
+
+@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+
+    Copyright (C) {2017}  {Tobias Sebastian Finn}
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# System modules
+import unittest
+import logging
+
+# External modules
+import numpy as np
+from mpl_toolkits.basemap import interp
+
+# Internal modules
+from pymepps.grid.remap import RemapWeights, WeightCache, structured_weights
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestRemapWeights(unittest.TestCase):
+    def setUp(self):
+        self.src_lat = np.arange(-10, 10.1, 2.5)
+        self.src_lon = np.arange(0, 20.1, 2)
+        trg_lat, trg_lon = np.meshgrid(np.arange(-12, 12, 1.5),
+                                       np.arange(1, 19, 0.7))
+        self.trg_lat = trg_lat.transpose()
+        self.trg_lon = trg_lon.transpose()
+        self.data = np.random.normal(
+            size=(len(self.src_lat), len(self.src_lon)))
+
+    def test_weights_same_as_basemap_interp(self):
+        for order in (0, 1):
+            weights = structured_weights(self.src_lat, self.src_lon,
+                                         self.trg_lat, self.trg_lon,
+                                         order=order)
+            interpolated = interp(self.data.T, self.src_lat, self.src_lon,
+                                  self.trg_lat, self.trg_lon, order=order)
+            np.testing.assert_array_equal(weights.apply(self.data),
+                                          interpolated)
+
+    def test_weights_raises_valueerror_for_unknown_order(self):
+        with self.assertRaises(ValueError):
+            structured_weights(self.src_lat, self.src_lon, self.trg_lat,
+                               self.trg_lon, order=3)
+
+    def test_matrix_has_target_source_shape(self):
+        weights = structured_weights(self.src_lat, self.src_lon,
+                                     self.trg_lat, self.trg_lon, order=1)
+        self.assertEqual(weights.matrix.shape,
+                         (self.trg_lat.size, self.data.size))
+
+    def test_apply_uses_all_leading_dimensions(self):
+        weights = structured_weights(self.src_lat, self.src_lon,
+                                     self.trg_lat, self.trg_lon, order=1)
+        data = np.random.normal(size=(3, 2)+self.data.shape)
+        remapped = weights.apply(data)
+        self.assertEqual(remapped.shape, (3, 2)+self.trg_lat.shape)
+        np.testing.assert_array_equal(remapped[1, 1],
+                                      weights.apply(data[1, 1]))
+
+    def test_apply_raises_valueerror_if_wrong_shape(self):
+        weights = structured_weights(self.src_lat, self.src_lon,
+                                     self.trg_lat, self.trg_lon, order=0)
+        with self.assertRaises(ValueError):
+            weights.apply(np.zeros((5, 4, 4)))
+
+    def test_gather_same_as_apply(self):
+        data = np.random.normal(size=(4, )+self.data.shape)
+        for order in (0, 1):
+            weights = structured_weights(self.src_lat, self.src_lon,
+                                         self.trg_lat, self.trg_lon,
+                                         order=order)
+            np.testing.assert_allclose(weights.gather(data),
+                                       weights.apply(data))
+
+    def test_gather_writes_into_out(self):
+        weights = structured_weights(self.src_lat, self.src_lon,
+                                     self.trg_lat, self.trg_lon, order=1)
+        out = np.zeros(self.trg_lat.shape, dtype=np.float32)
+        returned = weights.gather(self.data, out=out)
+        self.assertIs(returned, out)
+        np.testing.assert_allclose(out, weights.apply(self.data),
+                                   rtol=1E-5, atol=1E-6)
+
+    def test_gather_raises_valueerror_if_wrong_out(self):
+        weights = structured_weights(self.src_lat, self.src_lon,
+                                     self.trg_lat, self.trg_lon, order=1)
+        with self.assertRaises(ValueError):
+            weights.gather(self.data, out=np.zeros((2, 2)))
+        out = np.zeros(self.trg_lat.shape[::-1]).T
+        with self.assertRaises(ValueError):
+            weights.gather(self.data, out=out)
+
+    def test_src_index_reorders_source(self):
+        src_index = np.arange(self.data.size).reshape(self.data.shape)
+        src_index = src_index[::-1, :]
+        weights = structured_weights(self.src_lat, self.src_lon,
+                                     self.trg_lat, self.trg_lon, order=1,
+                                     src_index=src_index)
+        reference = structured_weights(self.src_lat, self.src_lon,
+                                       self.trg_lat, self.trg_lon, order=1)
+        np.testing.assert_array_equal(weights.apply(self.data[::-1, :]),
+                                      reference.apply(self.data))
+
+
+class TestWeightCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = WeightCache(maxsize=2)
+        self.weights = RemapWeights(np.zeros((4, 1), dtype=int),
+                                    np.ones((4, 1)), (2, 2), (2, 2))
+
+    def test_get_returns_default_if_not_cached(self):
+        self.assertIsNone(self.cache.get('test'))
+        self.assertEqual(self.cache.get('test', 1), 1)
+
+    def test_get_returns_cached_weights(self):
+        self.cache['test'] = self.weights
+        self.assertEqual(id(self.cache.get('test')), id(self.weights))
+
+    def test_least_recently_used_is_removed(self):
+        self.cache['a'] = self.weights
+        self.cache['b'] = self.weights
+        self.cache.get('a')
+        self.cache['c'] = self.weights
+        self.assertEqual(len(self.cache), 2)
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+
+    def test_clear_removes_weights(self):
+        self.cache['a'] = self.weights
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
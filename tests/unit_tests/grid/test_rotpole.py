@@ -87,6 +87,34 @@ def test_call_transform_to_rot_lat_lon(self):
             returned = self.proj(*v)
             np.testing.assert_almost_equal(returned, self.rot_lat_lon[k])
 
+    def test_transform_with_float32_close_to_float64(self):
+        proj = RotPoleProj(npole_lat=36, npole_lon=-170, dtype=np.float32)
+        rot_lon, rot_lat = np.meshgrid(np.linspace(-20, 20, 30),
+                                       np.linspace(-30, 30, 20))
+        returned = proj(rot_lon, rot_lat, inverse=True)
+        self.assertEqual(returned[0].dtype, np.float32)
+        np.testing.assert_allclose(
+            returned, self.proj(rot_lon, rot_lat, inverse=True), atol=1E-3)
+
+    def test_transform_writes_into_out(self):
+        rot_lon, rot_lat = np.meshgrid(np.linspace(-20, 20, 30),
+                                       np.linspace(-30, 30, 20))
+        out = np.empty((2, )+rot_lon.shape)
+        lon, lat = self.proj(rot_lon, rot_lat, inverse=True, out=out)
+        self.assertTrue(np.shares_memory(lon, out))
+        np.testing.assert_equal(out[1], lat)
+        np.testing.assert_almost_equal(
+            out, self.proj(rot_lon, rot_lat, inverse=True))
+        with self.assertRaises(ValueError):
+            self.proj(rot_lon, rot_lat, inverse=True, out=np.empty((2, 3)))
+
+    def test_transform_round_trip(self):
+        rot_lon, rot_lat = np.meshgrid(np.linspace(-20, 20, 30),
+                                       np.linspace(-30, 30, 20))
+        lon, lat = self.proj(rot_lon, rot_lat, inverse=True)
+        returned = self.proj(lon, lat)
+        np.testing.assert_almost_equal(returned, (rot_lon, rot_lat))
+
 
 if __name__ == '__main__':
     unittest.main()
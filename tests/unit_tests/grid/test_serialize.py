@@ -0,0 +1,86 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Created on 17.10.26
+
+Created for pymepps
+
+@author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+
+    Copyright (C) {2017}  {Tobias Sebastian Finn}
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+# System modules
+import unittest
+import logging
+import os
+
+# External modules
+import numpy as np
+import xarray as xr
+
+# Internal modules
+from pymepps.grid import GridBuilder
+from pymepps.grid.serialize import encode_grid, decode_grid, \
+    grid_to_dataset, dataset_to_grid
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.realpath(__file__)))),
+    'data')
+
+
+class TestSerialize(unittest.TestCase):
+    def setUp(self):
+        file = os.path.join(BASE_PATH, 'grids', 'unstructured')
+        self.grid = GridBuilder(file).build_grid()
+        self.array = xr.DataArray(
+            np.random.normal(size=(2, )+tuple(self.grid.shape)),
+            dims=('time', 'ncells'), name='T')
+
+    def test_encode_grid_splits_scalars_and_arrays(self):
+        grid_attrs, grid_vars = encode_grid(self.grid)
+        self.assertEqual(grid_attrs['ppgrid_gridtype'], 'unstructured')
+        self.assertNotIn('ppgrid_xvals', grid_attrs)
+        np.testing.assert_equal(grid_vars['ppgrid_xvals'].values,
+                                self.grid._grid_dict['xvals'])
+        self.assertTrue(grid_vars['ppgrid_xvals'].encoding['zlib'])
+        for value in grid_attrs.values():
+            self.assertNotIsInstance(value, np.ndarray)
+
+    def test_decode_grid_decodes_encoded_grid(self):
+        grid_attrs, grid_vars = encode_grid(self.grid)
+        self.assertEqual(decode_grid(grid_attrs, grid_vars), self.grid)
+
+    def test_decode_grid_decodes_array_attrs(self):
+        grid_attrs = {'ppgrid_{0:s}'.format(k): v
+                      for k, v in self.grid._grid_dict.items()}
+        self.assertEqual(decode_grid(grid_attrs), self.grid)
+
+    def test_dataset_to_grid_splits_grid_to_dataset(self):
+        dataset = grid_to_dataset(self.array, self.grid)
+        self.assertIn('ppgrid_yvals', dataset.data_vars)
+        data_array, grid = dataset_to_grid(dataset)
+        xr.testing.assert_identical(data_array, self.array)
+        self.assertEqual(grid, self.grid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -29,10 +29,14 @@
 
 # External modules
 import numpy as np
+from scipy.interpolate import griddata
 import xarray as xr
 
 # Internal modules
 from pymepps.grid import GridBuilder
+from pymepps.grid.lonlat import LonLatGrid
+from pymepps.grid.grid import distance_haversine
+from pymepps.grid.unstructured import UnstructuredGrid
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -69,5 +73,93 @@ def test__calc_lat_lon_gets_lat_lon(self):
             self.grid._grid_dict['xvals']
         )
 
+    def test_grid_dict_holds_contiguous_arrays(self):
+        grid_dict = dict(gridtype='unstructured', gridsize=3,
+                         xvals=[1, 2, 3], yvals=np.array([4., 5., 6.]))
+        grid = UnstructuredGrid(grid_dict)
+        for key in ('xvals', 'yvals'):
+            self.assertIsInstance(grid._grid_dict[key], np.ndarray)
+            self.assertEqual(grid._grid_dict[key].dtype, np.float64)
+            self.assertTrue(grid._grid_dict[key].flags['C_CONTIGUOUS'])
+        self.assertFalse(np.shares_memory(grid._grid_dict['yvals'],
+                                          grid_dict['yvals']))
+        lat, lon = grid._calc_lat_lon()
+        self.assertTrue(np.shares_memory(lat, grid._grid_dict['yvals']))
+
+    def test_coarsen_to_grid_aggregates_cells(self):
+        trg_grid = GridBuilder('gridtype=lonlat\nxsize=4\nysize=3\n'
+                               'xfirst=0\nxinc=90\nyfirst=-60\n'
+                               'yinc=60').build_grid()
+        src_lat, src_lon = self.grid._calc_lat_lon()
+        data = np.random.normal(size=(2, )+src_lat.shape)
+        coarse_data, coarse_grid = self.grid.coarsen(
+            data, other_grid=trg_grid, how='sum')
+        self.assertEqual(coarse_data.shape, (2, 3, 4))
+        trg_ind, _ = trg_grid.nearest_points(
+            np.column_stack((src_lat, src_lon)))
+        target = np.zeros((2, 3, 4))
+        np.add.at(target, (slice(None), )+trg_ind, data)
+        np.testing.assert_allclose(coarse_data, target)
+        with self.assertRaises(ValueError):
+            self.grid.coarsen(data, factor=2)
+
+    def test_shape_returns_gridsize(self):
+        self.assertEqual(self.grid.shape, [self.grid._grid_dict['gridsize'], ])
+
+    def test_nearest_points_same_as_haversine(self):
+        src_lat, src_lon = self.grid._calc_lat_lon()
+        coords = np.stack((src_lat[:10]+0.01, src_lon[:10]-0.01), axis=-1)
+        nearest_ind, distance = self.grid.nearest_points(coords)
+        for k, coord in enumerate(coords):
+            haversine = distance_haversine(coord, (src_lat, src_lon))
+            self.assertEqual(nearest_ind[0][k], haversine.argmin())
+            np.testing.assert_allclose(distance[k], haversine.min())
+
+    def _get_lonlat_grid(self):
+        grid_dict = {
+            'gridtype': 'lonlat',
+            'xsize': 17,
+            'ysize': 9,
+            'xfirst': -160,
+            'xinc': 20,
+            'yfirst': -40,
+            'yinc': 10,
+        }
+        return LonLatGrid(grid_dict)
+
+    def test_interpolate_bilinear_same_as_griddata(self):
+        trg_grid = self._get_lonlat_grid()
+        src_lat, src_lon = self.grid._calc_lat_lon()
+        trg_lat, trg_lon = trg_grid._calc_lat_lon()
+        data = np.random.normal(size=(3, src_lat.size))
+        remapped_data = self.grid.interpolate(data, trg_grid, order=1)
+        self.assertEqual(remapped_data.shape, (3, )+trg_lat.shape)
+        for k in range(data.shape[0]):
+            interpolated = griddata(
+                np.column_stack((src_lat, self.grid.wrap_lon(src_lon))),
+                data[k], (trg_lat, trg_lon), method='linear')
+            np.testing.assert_allclose(remapped_data[k], interpolated)
+        np.testing.assert_allclose(
+            self.grid.interpolate(data, trg_grid, order=1,
+                                  backend='slicewise'),
+            remapped_data)
+
+    def test_interpolate_nearest_uses_nearest_points(self):
+        trg_grid = self._get_lonlat_grid()
+        src_lat, src_lon = self.grid._calc_lat_lon()
+        trg_lat, trg_lon = trg_grid._calc_lat_lon()
+        data = np.arange(src_lat.size)
+        remapped_data = self.grid.interpolate(data, trg_grid, order=0)
+        nearest_ind, _ = self.grid.nearest_points(
+            np.column_stack((trg_lat.ravel(), trg_lon.ravel())))
+        np.testing.assert_array_equal(remapped_data.ravel(), nearest_ind[0])
+
+    def test_triangulation_is_cached(self):
+        triangulation = self.grid.triangulation
+        self.assertIs(self.grid.triangulation, triangulation)
+        self.grid.interpolate(np.zeros(self.grid._calc_lat_lon()[0].shape),
+                              self._get_lonlat_grid(), order=1)
+        self.assertIs(self.grid.triangulation, triangulation)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+# """
+# Created on 17.10.26
+#
+# Created for pymepps
+#
+# @author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#     Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# """
+# System modules
+import unittest
+import logging
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+# External modules
+import numpy as np
+import xarray as xr
+
+# Internal modules
+from pymepps.loader.base import sniff_file_type
+from pymepps.loader.model import ModelLoader
+from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.realpath(__file__))))),
+    'data')
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestSniffFileType(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_file(self, content):
+        file_path = os.path.join(self.tmp_dir, 'test')
+        with open(file_path, 'wb') as opened_file:
+            opened_file.write(content)
+        return file_path
+
+    def test_sniff_detects_netcdf(self):
+        self.assertEqual(sniff_file_type(os.path.join(
+            BASE_PATH, 'model', 'GFS_Global_0p25deg_20161219_0600.nc')), 'nc')
+        self.assertEqual(sniff_file_type(os.path.join(
+            BASE_PATH, 'station', 'wettermast.nc')), 'nc')
+        self.assertEqual(sniff_file_type(self.write_file(b'CDF\x01\x00')),
+                         'nc')
+
+    def test_sniff_detects_netcdf_with_grib_attribute(self):
+        file_path = os.path.join(self.tmp_dir, 'test.nc')
+        ds = xr.Dataset({'t2m': (('lat', ), np.zeros(3))},
+                        attrs={'GRIB': 'test'})
+        ds.to_netcdf(file_path, format='NETCDF3_CLASSIC')
+        with open(file_path, 'rb') as opened_file:
+            self.assertIn(b'GRIB', opened_file.read())
+        self.assertEqual(sniff_file_type(file_path), 'nc')
+
+    def test_sniff_detects_grib_edition(self):
+        self.assertEqual(
+            sniff_file_type(self.write_file(
+                b'GRIB\x00\x00\x00\x02\x00\x00\x00\x00\x00\x00\x01\x00')),
+            'grib2')
+        self.assertEqual(
+            sniff_file_type(self.write_file(
+                b'\x01\r\r\n123\r\r\nYTXA98 EDZW\r\r\nGRIB\x00\x10\x00\x01')),
+            'grib1')
+
+    def test_sniff_checks_grib_position_and_length(self):
+        self.assertIsNone(sniff_file_type(self.write_file(
+            b'test GRIB\x00\x10\x00\x01')))
+        self.assertIsNone(sniff_file_type(self.write_file(
+            b'GRIB\x00\x00\x00\x01')))
+        self.assertIsNone(sniff_file_type(self.write_file(
+            b'GRIB\x00\x00\x00\x02')))
+        self.assertIsNone(sniff_file_type(self.write_file(
+            b'GRIB\x00\x10\x00\x03')))
+
+    def test_sniff_detects_wettermast_text(self):
+        header = '#Station=Wettermast\n#Names=DATE;TIME;TT\n'
+        self.assertEqual(sniff_file_type(self.write_file(header.encode())),
+                         'wm')
+
+    def test_sniff_returns_none_if_unknown(self):
+        self.assertIsNone(sniff_file_type(self.write_file(b'test')))
+        self.assertIsNone(sniff_file_type(os.path.join(self.tmp_dir, 'no')))
+        self.assertIsNone(sniff_file_type('http://test.de'))
+
+    def test_loader_creates_handlers_without_checking(self):
+        model_file = os.path.join(BASE_PATH, 'model',
+                                  'GFS_Global_0p25deg_20161219_0600.nc')
+        loader = ModelLoader(model_file)
+        with mock.patch.object(NetCDFHandler, 'is_type') as is_type_mock:
+            file_handlers = loader._get_file_handlers([model_file, ])
+        is_type_mock.assert_not_called()
+        self.assertEqual(len(file_handlers), 1)
+        self.assertIsInstance(file_handlers[0], NetCDFHandler)
+
+    def test_loader_checks_unsniffed_files(self):
+        model_file = os.path.join(BASE_PATH, 'model',
+                                  'GFS_Global_0p25deg_20161219_0600.nc')
+        unknown_file = os.path.join(self.tmp_dir, 'unknown')
+        accepted_file = os.path.join(self.tmp_dir, 'accepted')
+        for file_path in (unknown_file, accepted_file):
+            with open(file_path, 'wb') as opened_file:
+                opened_file.write(b'test')
+        loader = ModelLoader(model_file)
+
+        def is_type(handler):
+            return handler.file == accepted_file
+
+        with mock.patch.object(NetCDFHandler, 'is_type', autospec=True,
+                               side_effect=is_type) as is_type_mock:
+            with self.assertLogs('pymepps.loader.base', level=logging.INFO):
+                file_handlers = loader._get_file_handlers(
+                    [model_file, unknown_file, accepted_file])
+        checked_files = [c[0][0].file for c in is_type_mock.call_args_list]
+        self.assertNotIn(model_file, checked_files)
+        self.assertEqual([fh.file for fh in file_handlers],
+                         [model_file, accepted_file])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+# """
+# Created on 17.10.26
+#
+# Created for pymepps
+#
+# @author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#     Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# """
+# System modules
+import unittest
+import logging
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+# External modules
+
+# Internal modules
+from pymepps.loader import VariableIndex
+from pymepps.loader.datasets.spatialdataset import SpatialDataset
+from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.realpath(__file__))))),
+    'data')
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestVariableIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.tmp_dir, 'test.nc')
+        shutil.copy(
+            os.path.join(BASE_PATH, 'model',
+                         'GFS_Global_0p25deg_20161219_0600.nc'),
+            self.file)
+        self.index = VariableIndex(os.path.join(self.tmp_dir, 'index.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_lookup_returns_none_if_not_indexed(self):
+        self.assertEqual(self.index.lookup([NetCDFHandler(self.file)]),
+                         [None])
+        self.assertEqual(
+            self.index.lookup([NetCDFHandler(self.file+'.missing')]), [None])
+
+    def test_store_and_lookup(self):
+        handler = NetCDFHandler(self.file)
+        self.index.store([handler], [['b', 'a']], [{'a': {'dims': ['x']}}])
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.lookup([handler]), [['a', 'b']])
+        self.assertEqual(self.index.get_metadata(handler),
+                         {'a': {'dims': ['x']}})
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+
+    def test_changed_file_invalidates_entry(self):
+        handler = NetCDFHandler(self.file)
+        self.index.store([handler], [['a']])
+        stat = os.stat(self.file)
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns+10**9))
+        self.assertEqual(self.index.lookup([handler]), [None])
+        self.assertIsNone(self.index.get_metadata(handler))
+
+    def test_dataset_scans_only_new_files(self):
+        ds = SpatialDataset(NetCDFHandler(self.file), index=self.index)
+        metadata = self.index.get_metadata(ds.file_handlers[0])
+        self.assertEqual(sorted(metadata), ds.var_names)
+        with mock.patch.object(NetCDFHandler, 'open') as open_mock:
+            indexed_ds = SpatialDataset(
+                NetCDFHandler(self.file), index=self.index.index_path)
+        open_mock.assert_not_called()
+        self.assertEqual(indexed_ds.var_names, ds.var_names)
+        self.assertEqual(indexed_ds.file_handlers[0].var_names, ds.var_names)
+
+    def test_dataset_raises_typeerror_for_wrong_index(self):
+        with self.assertRaises(TypeError):
+            SpatialDataset(NetCDFHandler(self.file), index=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
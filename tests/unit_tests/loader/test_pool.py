@@ -0,0 +1,147 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+# """
+# Created on 17.10.26
+#
+# Created for pymepps
+#
+# @author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#     Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# """
+# System modules
+import unittest
+import logging
+import os
+import threading
+
+# External modules
+try:
+    import pygrib
+except ImportError:
+    pygrib = None
+
+# Internal modules
+from pymepps.loader.filehandler.pool import FilePool, file_pool
+
+
+logging.basicConfig(level=logging.DEBUG)
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.realpath(__file__))))),
+    'data')
+
+
+class CountingHandler(object):
+    def __init__(self, file_path):
+        self.file = file_path
+        self.ds = None
+        self.opened = 0
+
+    def open(self):
+        if self.ds is None:
+            self.ds = self.file
+            self.opened += 1
+        return self
+
+    def close(self):
+        self.ds = None
+
+
+class TestFilePool(unittest.TestCase):
+    def setUp(self):
+        self.pool = FilePool(maxsize=2)
+        self.handlers = [CountingHandler(str(k)) for k in range(3)]
+
+    def test_acquire_reuses_opened_file(self):
+        handler = self.handlers[0]
+        for _ in range(3):
+            self.assertIs(self.pool.acquire(handler), handler)
+            self.pool.release(handler)
+        self.assertEqual(handler.opened, 1)
+        self.assertIsNotNone(handler.ds)
+        self.assertIn(handler, self.pool)
+
+    def test_least_recently_used_is_closed(self):
+        for handler in self.handlers:
+            self.pool.acquire(handler)
+            self.pool.release(handler)
+        self.assertEqual(len(self.pool), 2)
+        self.assertIsNone(self.handlers[0].ds)
+        self.assertNotIn(self.handlers[0], self.pool)
+        self.assertIsNotNone(self.handlers[2].ds)
+
+    def test_acquired_handlers_are_not_closed(self):
+        self.pool.acquire(self.handlers[0])
+        for handler in self.handlers[1:]:
+            self.pool.acquire(handler)
+            self.pool.release(handler)
+        self.assertIsNotNone(self.handlers[0].ds)
+        self.assertIsNone(self.handlers[1].ds)
+        self.pool.release(self.handlers[0])
+        self.assertEqual(len(self.pool), 2)
+
+    def test_discard_and_close_all_close_acquired_handlers(self):
+        for handler in self.handlers[:2]:
+            self.pool.acquire(handler)
+        self.pool.discard(self.handlers[0])
+        self.assertIsNone(self.handlers[0].ds)
+        self.assertEqual(len(self.pool), 1)
+        self.pool.close_all()
+        self.assertIsNone(self.handlers[1].ds)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_concurrent_acquire_opens_once(self):
+        handler = self.handlers[0]
+
+        def acquire_release():
+            for _ in range(100):
+                self.pool.acquire(handler)
+                self.pool.release(handler)
+
+        threads = [threading.Thread(target=acquire_release) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(handler.opened, 1)
+
+    @unittest.skipIf(pygrib is None, 'pygrib is not installed')
+    def test_reused_grib_handler_is_rewound(self):
+        from pymepps.loader.filehandler.gribhandler import GribHandler
+        handler = GribHandler(os.path.join(BASE_PATH, 'model',
+                                           'ECMWF_t_z_isobaric.grib'))
+        try:
+            handler.acquire()
+            self.assertEqual(handler._get_varnames(), {'t', 'z'})
+            handler.release()
+            handler.acquire()
+            self.assertEqual(handler._get_varnames(), {'t', 'z'})
+            messages = handler.get_messages('t')
+            self.assertEqual(len(messages), 12)
+            self.assertEqual(messages[0].dims[:4],
+                             ('runtime', 'ensemble', 'validtime', 'height'))
+            handler.release()
+        finally:
+            file_pool.discard(handler)
+
+
+if __name__ == '__main__':
+    unittest.main()
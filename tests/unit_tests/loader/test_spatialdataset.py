@@ -0,0 +1,180 @@
+#!/bin/env python
+# -*- coding: utf-8 -*-
+# """
+# Created on 17.10.26
+#
+# Created for pymepps
+#
+# @author: Tobias Sebastian Finn, tobias.sebastian.finn@studium.uni-hamburg.de
+#
+#     Copyright (C) {2017}  {Tobias Sebastian Finn}
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     This program is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# """
+# System modules
+import unittest
+import logging
+import os
+import datetime
+import shutil
+import tempfile
+
+# External modules
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+try:
+    import dask.array as da
+except ImportError:
+    da = None
+
+# Internal modules
+from pymepps.grid import GridBuilder
+from pymepps.loader.datasets.spatialdataset import SpatialDataset
+from pymepps.loader.filehandler.netcdfhandler import NetCDFHandler
+from pymepps.loader.filehandler.pool import file_pool
+
+
+BASE_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(
+                os.path.dirname(
+                    os.path.realpath(__file__))))),
+    'data')
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class TestSpatialDataset(unittest.TestCase):
+    def setUp(self):
+        self.file = os.path.join(BASE_PATH, 'model',
+                                 'GFS_Global_0p25deg_20161219_0600.nc')
+        self.grid = os.path.join(BASE_PATH, 'grids', 'lon_lat')
+        self.var_name = 'Maximum_temperature_height_above_ground_Mixed_' \
+                        'intervals_Maximum'
+
+    @unittest.skipIf(da is None, 'dask is not installed')
+    def test_lazy_select_returns_dask_array(self):
+        eager_ds = SpatialDataset(NetCDFHandler(self.file), grid=self.grid)
+        lazy_ds = SpatialDataset(NetCDFHandler(self.file), grid=self.grid,
+                                 lazy=True)
+        eager_array = eager_ds.select(self.var_name)
+        lazy_array = lazy_ds.select(self.var_name)
+        self.assertIsInstance(lazy_array.data, da.Array)
+        self.assertNotIsInstance(eager_array.data, da.Array)
+        self.assertEqual(lazy_array.dims, eager_array.dims)
+        self.assertEqual(lazy_array.pp.grid, eager_array.pp.grid)
+        lazy_ds.close()
+        self.assertIsNone(lazy_ds.file_handlers[0].ds)
+        np.testing.assert_array_equal(lazy_array.values, eager_array.values)
+
+    @unittest.skipIf(da is None, 'dask is not installed')
+    def test_lazy_select_releases_file_handler(self):
+        lazy_ds = SpatialDataset(NetCDFHandler(self.file), grid=self.grid,
+                                 lazy=True)
+        lazy_ds.select(self.var_name)
+        file_handler = lazy_ds.file_handlers[0]
+        self.assertEqual(file_pool._entries[file_handler].references, 0)
+        lazy_ds.close()
+
+    def test_iter_select_yields_runtime_chunks(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            file_handlers = []
+            for run in ('20161219_1200', '20161219_0600'):
+                run_file = os.path.join(tmp_dir, '{0:s}.nc'.format(run))
+                shutil.copy(self.file, run_file)
+                file_handlers.append(NetCDFHandler(run_file))
+            ds = SpatialDataset(file_handlers, grid=self.grid)
+            grouped = ds.group_file_handlers(self.var_name, by='runtime')
+            self.assertEqual(list(grouped.values()),
+                             [[file_handlers[1]], [file_handlers[0]]])
+            selected = ds.select(self.var_name)
+            runtimes = []
+            for runtime, chunk in ds.iter_select(self.var_name):
+                runtimes.append(runtime)
+                self.assertEqual(chunk.pp.grid, selected.pp.grid)
+                np.testing.assert_array_equal(
+                    chunk.values,
+                    selected.sel(runtime=chunk['runtime'],
+                                 validtime=chunk['validtime']).values)
+            self.assertEqual(runtimes, [datetime.datetime(2016, 12, 19, 6),
+                                        datetime.datetime(2016, 12, 19, 12)])
+            with self.assertRaises(ValueError):
+                next(ds.iter_select(self.var_name, by='height'))
+            with self.assertRaises(ValueError):
+                next(ds.iter_select('test'))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_saved_grid_is_decoded_once_per_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            tmp_file = os.path.join(tmp_dir, 'unstructured.nc')
+            grid = GridBuilder({
+                'gridtype': 'unstructured',
+                'gridsize': 20,
+                'xvals': np.random.uniform(0, 20, size=20),
+                'yvals': np.random.uniform(40, 60, size=20),
+            }).build_grid()
+            array = xr.DataArray(np.random.normal(size=grid.shape),
+                                 dims=('ncells', ), name='T')
+            array.pp.grid = grid
+            array.pp.save(tmp_file)
+            for lazy in (False, True):
+                file_handler = NetCDFHandler(tmp_file)
+                spatial_ds = SpatialDataset(file_handler, lazy=lazy)
+                selected = spatial_ds.select('T')
+                self.assertEqual(selected.pp.grid, grid)
+                self.assertIn('T', file_handler._grids)
+                file_handler.acquire()
+                message = file_handler.get_messages('T', lazy=lazy)
+                file_handler.release()
+                self.assertFalse(any(
+                    isinstance(value, np.ndarray)
+                    for value in message.attrs.values()))
+                spatial_ds.close()
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_iter_select_warns_for_multiple_validtimes(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            tmp_file = os.path.join(tmp_dir, 'multi_validtime.nc')
+            ds = xr.Dataset(
+                {'t2m': (('time', 'lat', 'lon'), np.zeros((2, 3, 4)))},
+                coords={
+                    'time': pd.date_range('2016-12-19 06:00', periods=2,
+                                          freq='3H'),
+                    'lat': np.arange(3.), 'lon': np.arange(4.)})
+            ds.to_netcdf(tmp_file)
+            grid = 'gridtype=lonlat\nxsize=4\nysize=3\nxfirst=0\n' \
+                   'xinc=1\nyfirst=0\nyinc=1'
+            spatial_ds = SpatialDataset(NetCDFHandler(tmp_file), grid=grid)
+            with self.assertLogs(
+                    'pymepps.loader.datasets.metdataset',
+                    level=logging.WARNING):
+                chunks = list(spatial_ds.iter_select('t2m', by='validtime'))
+            self.assertEqual(len(chunks), 1)
+            self.assertIsNone(chunks[0][0])
+            self.assertEqual(chunks[0][1]['validtime'].size, 2)
+            spatial_ds.close()
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()